@@ -0,0 +1,104 @@
+"""
+Network-free throughput and parse benchmark of every supported method
+
+    python -m benchmarks.replay --requests 1000 --latency 0.01
+
+Responses are served by ReplayTransport from the archive, by default the archive is recorded
+from the local mock server first. Archives recorded from eBay with RecordingTransport can be
+passed with --archive, they must contain the requests from PARAMS.
+The mock server is test code from browseapi.tests.server, which is not part of the installed
+package, so the benchmark runs from a source checkout.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from base64 import b64encode
+
+from browseapi import BrowseAPI
+from browseapi.containers import BrowseAPIResponse
+from browseapi.limiter import AdaptiveLimiter
+from browseapi.replay import RecordingTransport, ReplayTransport
+from browseapi.tests.server import MockServer
+from browseapi.transport import AiohttpTransport
+
+PARAMS = {
+    'search': {'q': 'drone', 'limit': 50},
+    'search_by_image': {'image': b64encode(b'image').decode('ascii')},
+    'get_item': {'item_id': 'v1|110439224832|0'},
+    'get_item_by_legacy_id': {'legacy_item_id': '110439224832'},
+    'get_items_by_item_group': {'item_group_id': '110439224832'},
+    'check_compatibility': {
+        'item_id': 'v1|110439224832|0',
+        'compatibility_properties': [{'name': 'Year', 'value': '2016'}, {'name': 'Make', 'value': 'Honda'}]
+    }
+}
+
+
+def record(path: str) -> None:
+    with MockServer() as server:
+        api = server.client(transport=RecordingTransport(AiohttpTransport(), path))
+
+        for method in BrowseAPI.supported_methods:
+            api.execute(method, [PARAMS[method]])
+
+
+class KeepingReplayTransport(ReplayTransport):
+    """ Replay transport keeping the last served response for the parse benchmark """
+
+    last = None
+
+    async def request(self, *args, **kwargs) -> dict:
+        self.last = await super().request(*args, **kwargs)
+        return self.last
+
+
+def parse_time(response: dict, method: str, repeat: int) -> float:
+    """ Seconds per BrowseAPIResponse of the response """
+
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        BrowseAPIResponse(response, method, False)
+
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000, help='requests per method')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0., help='injected latency in seconds')
+    parser.add_argument('--archive', help='recorded archive path, recorded from the mock server by default')
+    args = parser.parse_args()
+
+    path = args.archive
+
+    if path is None:
+        file, path = tempfile.mkstemp(suffix='.bapirec')
+        os.close(file)
+        record(path)
+
+    try:
+        for method in BrowseAPI.supported_methods:
+            limiter = AdaptiveLimiter(initial_limit=args.concurrency, max_limit=args.concurrency)
+            transport = KeepingReplayTransport(path, latency=args.latency)
+            api = BrowseAPI('app_id', 'cert_id', limiter=limiter, transport=transport)
+
+            started = time.perf_counter()
+            api.execute(method, [PARAMS[method]] * args.requests)
+            elapsed = time.perf_counter() - started
+
+            print('{0:<25} {1:>10.1f} req/s {2:>8.1f} us/parse'.format(
+                method, args.requests / elapsed, parse_time(transport.last, method, args.requests) * 1e6
+            ))
+
+    finally:
+        if args.archive is None:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Serialization of large item trees
+
+    python -m benchmarks.serialization --pages 50
+
+Search pages with 200 item summaries each are serialized with every available serializer
+and pickle, which reduces containers to their raw json.
+"""
+
+import argparse
+import pickle
+import time
+
+from browseapi.containers import BrowseAPIResponse
+from browseapi.exceptions import BrowseAPIParamError
+from browseapi.serialization import get_serializer, serializers
+
+
+def summary(number: int) -> dict:
+    return {
+        'itemId': 'v1|{}|0'.format(number),
+        'title': 'Item {} with a reasonably long listing title'.format(number),
+        'itemWebUrl': 'https://www.ebay.com/itm/{}'.format(number),
+        'price': {'value': '{}.99'.format(number % 500), 'currency': 'USD'},
+        'seller': {'username': 'seller{}'.format(number % 100), 'feedbackPercentage': '99.1', 'feedbackScore': 1500},
+        'condition': 'New',
+        'conditionId': '1000',
+        'categories': [{'categoryId': '179697'}, {'categoryId': '625'}],
+        'image': {'imageUrl': 'https://i.ebayimg.com/images/g/{}/s-l225.jpg'.format(number)},
+        'itemLocation': {'postalCode': '941**', 'country': 'US'},
+        'shippingOptions': [{'shippingCostType': 'FIXED', 'shippingCost': {'value': '0.00', 'currency': 'USD'}}],
+        'buyingOptions': ['FIXED_PRICE', 'BEST_OFFER']
+    }
+
+
+def page(number: int) -> BrowseAPIResponse:
+    return BrowseAPIResponse({
+        'href': 'https://api.ebay.com/buy/browse/v1/item_summary/search?q=drone&offset={}'.format(number * 200),
+        'limit': 200,
+        'offset': number * 200,
+        'total': 1000000,
+        'itemSummaries': [summary(number * 200 + i) for i in range(200)]
+    }, 'search', False)
+
+
+def measure(function, *args) -> tuple:
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=50)
+    args = parser.parse_args()
+
+    pages, elapsed = measure(lambda: [page(number) for number in range(args.pages)])
+    print('{0} items built in {1:.3f} s'.format(args.pages * 200, elapsed))
+
+    dicts, elapsed = measure(lambda: [response.to_dict() for response in pages])
+    print('{0:<10} {1:>8.3f} s'.format('to_dict', elapsed))
+
+    for name in serializers:
+        try:
+            serializer = get_serializer(name)
+        except BrowseAPIParamError as e:
+            print('{0:<10} skipped: {1}'.format(name, e))
+            continue
+
+        data, dump_time = measure(lambda: [serializer.dumps(response.to_dict()) for response in pages])
+        _, load_time = measure(lambda: [BrowseAPIResponse.from_dict(serializer.loads(part)) for part in data])
+        report(name, dump_time, load_time, sum(len(part) for part in data))
+
+    data, dump_time = measure(pickle.dumps, pages, pickle.HIGHEST_PROTOCOL)
+    _, load_time = measure(pickle.loads, data)
+    report('pickle', dump_time, load_time, len(data))
+
+
+def report(name: str, dump_time: float, load_time: float, size: int) -> None:
+    print('{0:<10} dump {1:>8.3f} s  load {2:>8.3f} s  {3:>10.1f} KiB'.format(name, dump_time, load_time, size / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Throughput and socket count of the transports against the local mock server
+
+    python -m benchmarks.transport --requests 2000 --concurrency 100
+
+httpx-h2 runs against the HTTP/2 mock server (h2c with prior knowledge), which forwards every stream
+to the HTTP/1.1 mock over a local connection pool, so its throughput includes one extra local hop.
+Socket count is measured on the client facing side of the server. h2 is required for the HTTP/2 row.
+The mock server is test code from browseapi.tests.server, which is not part of the installed
+package, so the benchmark runs from a source checkout.
+"""
+
+import argparse
+import time
+
+from browseapi import BrowseAPI
+from browseapi.limiter import AdaptiveLimiter
+from browseapi.tests.server import MockServer
+from browseapi.transport import AiohttpTransport, HttpxTransport
+from browseapi.exceptions import BrowseAPIParamError
+
+
+def transports() -> dict:
+    """ Transport factory and whether the mock server speaks HTTP/2, by transport name """
+
+    result = {'aiohttp': (AiohttpTransport, False)}
+
+    for name, http2 in ('httpx', False), ('httpx-h2', True):
+        try:
+            HttpxTransport(http2=http2, http1=not http2)
+        except BrowseAPIParamError as e:
+            print('{0} skipped: {1}'.format(name, e))
+        else:
+            result[name] = (lambda http2=http2: HttpxTransport(http2=http2, http1=not http2)), http2
+
+    return result
+
+
+def run(name: str, factory, http2: bool, requests: int, concurrency: int, latency: float) -> None:
+    with MockServer(latency=latency, http2=http2) as server:
+        limiter = AdaptiveLimiter(initial_limit=concurrency, min_limit=concurrency, max_limit=concurrency)
+        api = server.point(BrowseAPI('app_id', 'cert_id', limiter=limiter, transport=factory()))
+
+        params = [{'item_id': 'v1|{}|0'.format(number)} for number in range(requests)]
+        started = time.perf_counter()
+        api.execute('get_item', params, pass_errors=True)
+        elapsed = time.perf_counter() - started
+
+    print('{0:<10} {1:>10.1f} req/s {2:>6} sockets'.format(name, requests / elapsed, len(server.connections)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.02, help='mock server latency in seconds')
+    args = parser.parse_args()
+
+    for name, (factory, http2) in transports().items():
+        run(name, factory, http2, args.requests, args.concurrency, args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
 from .client import BrowseAPI
+from .sync import SyncBrowseAPI
 
 __version__ = '0.12.2'
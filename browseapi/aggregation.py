@@ -0,0 +1,151 @@
+from array import array
+from heapq import nlargest
+
+from . import exceptions
+
+
+class _Counter(object):
+    """ Compact counter: keys are mapped to positions in the array of counts """
+
+    def __init__(self):
+        self.positions = {}
+        self.counts = array('q')
+
+    def add(self, key, value: int) -> None:
+        position = self.positions.get(key)
+
+        if position is None:
+            self.positions[key] = len(self.counts)
+            self.counts.append(value)
+        else:
+            self.counts[position] += value
+
+    def get(self, key) -> int:
+        position = self.positions.get(key)
+        return 0 if position is None else self.counts[position]
+
+    def top(self, k: int, keys=None) -> list:
+        counts = self.counts
+        positions = self.positions if keys is None else {key: self.positions[key] for key in keys}
+        return [(key, counts[position]) for key, position in
+                nlargest(k, positions.items(), key=lambda pair: counts[pair[1]])]
+
+
+class RefinementAggregator(object):
+    """
+    Merges matchCount of search refinements across many responses into compact counters.
+    Responses are not kept, so aggregator can consume a stream of any length
+    """
+
+    dimensions = ('aspect', 'buying_option', 'category', 'condition')
+
+    def __init__(self):
+        self.responses = 0
+        self.category_names = {}
+        self.condition_names = {}
+        self._counters = {dimension: _Counter() for dimension in self.dimensions}
+
+    def update(self, response) -> None:
+        """
+        Add refinements of the search response
+
+        :param response: BrowseAPIResponse of search or search_by_image method
+        """
+
+        self.responses += 1
+        refinement = getattr(response, 'refinement', None)
+
+        if refinement is None:
+            return
+
+        counter = self._counters['aspect']
+
+        for distribution in getattr(refinement, 'aspectDistributions', ()):
+            for value in getattr(distribution, 'aspectValueDistributions', ()):
+                counter.add((distribution.localizedAspectName, value.localizedAspectValue), value.matchCount or 0)
+
+        counter = self._counters['buying_option']
+
+        for distribution in getattr(refinement, 'buyingOptionDistributions', ()):
+            counter.add(distribution.buyingOption, distribution.matchCount or 0)
+
+        counter = self._counters['category']
+
+        for distribution in getattr(refinement, 'categoryDistributions', ()):
+            counter.add(distribution.categoryId, distribution.matchCount or 0)
+            self.category_names[distribution.categoryId] = distribution.categoryName
+
+        counter = self._counters['condition']
+
+        for distribution in getattr(refinement, 'conditionDistributions', ()):
+            counter.add(distribution.conditionId, distribution.matchCount or 0)
+            self.condition_names[distribution.conditionId] = distribution.condition
+
+    def consume(self, responses):
+        """
+        Add refinements of all responses from iterable, exceptions passed with pass_errors are skipped
+
+        :param responses: iterable with BrowseAPIResponse instances
+        :return: aggregator itself
+        """
+
+        for response in responses:
+            if not isinstance(response, Exception):
+                self.update(response)
+
+        return self
+
+    def count(self, dimension: str, key) -> int:
+        """
+        Merged matchCount
+
+        :param dimension: one of the aggregator dimensions
+        :param key: (aspect name, aspect value) tuple for aspects, buying option, category or condition id
+        :return: count
+        """
+
+        return self._counter(dimension).get(key)
+
+    def counts(self, dimension: str) -> dict:
+        """ All merged counts of the dimension """
+
+        counter = self._counter(dimension)
+        return {key: counter.counts[position] for key, position in counter.positions.items()}
+
+    def top(self, dimension: str, k: int = 10, aspect: str = None) -> list:
+        """
+        Keys with the largest counts
+
+        :param dimension: one of the aggregator dimensions
+        :param k: number of keys
+        :param aspect: aspect name, limits 'aspect' dimension to the values of this aspect
+        :return: list of (key, count) tuples in descending order of counts
+        """
+
+        counter = self._counter(dimension)
+        keys = None
+
+        if aspect is not None:
+            keys = [key for key in counter.positions if key[0] == aspect]
+
+        return counter.top(k, keys)
+
+    def merge(self, other: 'RefinementAggregator') -> None:
+        """ Add counts of another aggregator, for example one filled in a different process """
+
+        self.responses += other.responses
+        self.category_names.update(other.category_names)
+        self.condition_names.update(other.condition_names)
+
+        for dimension in self.dimensions:
+            counter = self._counters[dimension]
+            other_counter = other._counters[dimension]
+
+            for key, position in other_counter.positions.items():
+                counter.add(key, other_counter.counts[position])
+
+    def _counter(self, dimension: str) -> _Counter:
+        if dimension not in self._counters:
+            raise exceptions.BrowseAPIParamError('dimension. Available: {}'.format(', '.join(self.dimensions)))
+
+        return self._counters[dimension]
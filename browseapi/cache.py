@@ -0,0 +1,148 @@
+import sqlite3
+import time
+
+from hashlib import sha1
+from json import dumps
+
+from . import exceptions
+
+
+def properties_key(compatibility_properties: list) -> str:
+    """
+    Canonical hash of the compatibility properties, independent of the properties order
+
+    :param compatibility_properties: list of {'name': name, 'value': value} dictionaries
+    :return: hex digest
+    """
+
+    pairs = sorted((str(prop['name']), str(prop['value'])) for prop in compatibility_properties)
+    return sha1(dumps(pairs, separators=(',', ':')).encode('utf8')).hexdigest()
+
+
+def compatibility_params(item_ids: list, vehicles: list) -> list:
+    """
+    Params for checking every vehicle against every item, like one vehicle against many items
+
+    :param item_ids: list of item ids
+    :param vehicles: list of compatibility properties lists
+    :return: list of check_compatibility params dictionaries, vehicles vary first
+    """
+
+    return [{'item_id': item_id, 'compatibility_properties': vehicle} for item_id in item_ids for vehicle in vehicles]
+
+
+class MemoryBackend(object):
+    """ Cache storage in a dictionary """
+
+    def __init__(self):
+        self._data = {}
+
+    def get_many(self, keys: list) -> dict:
+        return {key: self._data[key] for key in keys if key in self._data}
+
+    def set_many(self, entries: dict) -> None:
+        self._data.update(entries)
+
+    def delete_expired(self, now: float) -> None:
+        self._data = {key: entry for key, entry in self._data.items() if entry[1] > now}
+
+
+class SQLiteBackend(object):
+    """ Persistent cache storage in a SQLite database """
+
+    def __init__(self, path: str):
+        """
+        Backend initialization
+
+        :param path: database file path
+        """
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS compatibility (key TEXT PRIMARY KEY, status TEXT, expires REAL)'
+        )
+
+    def get_many(self, keys: list) -> dict:
+        entries = {}
+
+        # stay below the SQLite variables limit
+
+        for i in range(0, len(keys), 500):
+            part = keys[i:i + 500]
+
+            rows = self._connection.execute(
+                'SELECT key, status, expires FROM compatibility WHERE key IN ({})'.format(','.join('?' * len(part))),
+                part
+            )
+
+            entries.update({key: (status, expires) for key, status, expires in rows})
+
+        return entries
+
+    def set_many(self, entries: dict) -> None:
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO compatibility VALUES (?, ?, ?)',
+                [(key, status, expires) for key, (status, expires) in entries.items()]
+            )
+
+    def delete_expired(self, now: float) -> None:
+        with self._connection:
+            self._connection.execute('DELETE FROM compatibility WHERE expires <= ?', (now,))
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class CompatibilityCache(object):
+    """ Cache of check_compatibility statuses keyed by item id and canonical hash of the compatibility properties """
+
+    def __init__(self, ttl: float = 86400, backend=None):
+        """
+        Cache initialization
+
+        :param ttl: time to live of the cached status in seconds
+        :param backend: MemoryBackend, SQLiteBackend or object with the same methods, MemoryBackend by default
+        """
+
+        if ttl <= 0:
+            raise exceptions.BrowseAPIParamError('ttl')
+
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(item_id: str, compatibility_properties: list) -> str:
+        return item_id + ':' + properties_key(compatibility_properties)
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Cached statuses
+
+        :param keys: list of cache keys
+        :return: dictionary with keys and compatibility statuses, expired and missing keys are omitted
+        """
+
+        now = time.time()
+        statuses = {key: status for key, (status, expires) in self.backend.get_many(keys).items() if expires > now}
+        self.hits += len(statuses)
+        self.misses += len(keys) - len(statuses)
+        return statuses
+
+    def set_many(self, statuses: dict) -> None:
+        """ Save compatibility statuses with the cache keys """
+
+        expires = time.time() + self.ttl
+        self.backend.set_many({key: (status, expires) for key, status in statuses.items()})
+
+    def get(self, item_id: str, compatibility_properties: list):
+        """ Cached status or None """
+
+        key = self.key(item_id, compatibility_properties)
+        return self.get_many([key]).get(key)
+
+    def delete_expired(self) -> None:
+        self.backend.delete_expired(time.time())
@@ -0,0 +1,429 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+from . import exceptions
+from .client import BrowseAPI
+from .containers import ErrorRecord
+from .credentials import Credential, CredentialPool
+from .limiter import AdaptiveLimiter
+from .metrics import percentile
+
+# number of latencies kept for the percentiles, a uniform sample of all requests
+LATENCY_SAMPLES = 10000
+
+# exceptions worth sending the request again
+RETRY_EXCEPTIONS = (exceptions.BrowseAPITimeoutError, exceptions.BrowseAPIConnectionError)
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m browseapi', description='eBay Browse API bulk runner')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run = commands.add_parser('run', help='read params as json lines, write responses as json lines')
+    run.add_argument('method', choices=BrowseAPI.supported_methods, help='Browse API method name')
+    run.add_argument('-i', '--input', default='-', help='params file, stdin by default')
+    run.add_argument('-o', '--output', default='-', help='responses file, stdout by default')
+    run.add_argument('--app-id', default=os.environ.get('BROWSEAPI_APP_ID'),
+                     help='eBay client id, BROWSEAPI_APP_ID environment variable by default')
+    run.add_argument('--cert-id', default=os.environ.get('BROWSEAPI_CERT_ID'),
+                     help='eBay client secret, BROWSEAPI_CERT_ID environment variable by default')
+    run.add_argument('--marketplace', default='EBAY_US', choices=BrowseAPI.marketplaces, help='marketplace id')
+    run.add_argument('-c', '--concurrency', type=int, default=10, help='maximal number of requests in flight')
+    run.add_argument('--rate', type=float, help='maximal number of requests per second')
+    run.add_argument('--retry', type=int, default=0,
+                     help='number of retries of timeouts, connection errors and throttled requests')
+    run.add_argument('--cache', help='SQLite file with successful responses, cached params are not sent again')
+    run.add_argument('--checkpoint', help='file with completed input lines, a restarted run skips them')
+    run.add_argument('--fields', help='comma separated dotted paths of the item fields to keep')
+
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error('--concurrency must be positive')
+
+    if args.retry < 0:
+        parser.error('--retry must not be negative')
+
+    if not args.app_id or not args.cert_id:
+        parser.error('--app-id and --cert-id are required')
+
+    return args
+
+
+def build_client(args: argparse.Namespace) -> BrowseAPI:
+    """ Client with the concurrency limit and the rate of the arguments """
+
+    limiter = AdaptiveLimiter(initial_limit=min(10, args.concurrency), max_limit=args.concurrency)
+    credentials = CredentialPool([Credential(args.app_id, args.cert_id, rate=args.rate)])
+
+    return BrowseAPI(
+        marketplace_id=args.marketplace, limiter=limiter, error_records=True, credentials=credentials
+    )
+
+
+class ResponseCache(object):
+    """ Successful responses by method and params in a SQLite table """
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT)')
+
+    def get(self, key: str):
+        row = self._connection.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, response: dict) -> None:
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?)',
+                                     (key, json.dumps(response, separators=(',', ':'), ensure_ascii=False)))
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class Checkpoint(object):
+    """
+    Completed input lines: all lines up to the watermark and the lines completed after it.
+    A slow line holds the watermark back, so the set of completed lines grows until it is finished.
+    Saved atomically after the output is flushed, so lines are written at least once
+    """
+
+    def __init__(self, path: str, interval: float = 1.):
+        """
+        Checkpoint initialization
+
+        :param path: checkpoint file, loaded if exists
+        :param interval: minimal number of seconds between saves
+        """
+
+        self.path = path
+        self.interval = interval
+        self.watermark = 0
+        self.done = set()
+        self._saved = time.monotonic()
+
+        if os.path.exists(path):
+            with open(path, encoding='utf8') as file:
+                data = json.load(file)
+
+            self.watermark = data['watermark']
+            self.done = set(data['done'])
+
+    def skip(self, line: int) -> bool:
+        return line <= self.watermark or line in self.done
+
+    def complete(self, line: int) -> None:
+        self.done.add(line)
+
+        while self.watermark + 1 in self.done:
+            self.watermark += 1
+            self.done.remove(self.watermark)
+
+    def due(self) -> bool:
+        return time.monotonic() - self._saved >= self.interval
+
+    def save(self) -> None:
+        temporary = self.path + '.tmp'
+
+        with open(temporary, 'w', encoding='utf8') as file:
+            json.dump({'watermark': self.watermark, 'done': sorted(self.done)}, file)
+
+        os.replace(temporary, self.path)
+        self._saved = time.monotonic()
+
+
+class Runner(object):
+    """
+    Streams params from the input to the client and responses to the output, the number of requests
+    in flight is bounded by the concurrency, so memory does not depend on the input size, except for
+    the checkpoint: it keeps the numbers of the lines completed after the oldest unfinished one.
+    Responses are written in the order of completion with the input line number
+    """
+
+    def __init__(self,
+                 api: BrowseAPI,
+                 method: str,
+                 concurrency: int = 10,
+                 retries: int = 0,
+                 backoff: float = 0.5,
+                 cache: ResponseCache = None,
+                 checkpoint: Checkpoint = None,
+                 fields: list = None):
+        """
+        Runner initialization
+
+        :param api: BrowseAPI instance, opened by the runner
+        :param method: Browse API method name in lowercase
+        :param concurrency: maximal number of requests in flight
+        :param retries: number of retries of timeouts, connection errors and throttled requests
+        :param backoff: delay in seconds before the first retry, doubled for every next one
+        :param cache: ResponseCache instance
+        :param checkpoint: Checkpoint instance
+        :param fields: item fields projection, see BrowseAPI.execute
+        """
+
+        self.api = api
+        self.method = method
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.fields = fields
+
+        self.requests = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cached = 0
+        self.skipped = 0
+        self.retried = 0
+        self.elapsed = 0.
+        self.latencies = []
+        self._latency_count = 0
+
+    async def run(self, input_file, output_file) -> dict:
+        """
+        Process all lines of the input
+
+        :param input_file: text file with params json lines
+        :param output_file: text file for the result json lines
+        :return: summary, see summary method
+        """
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        pending = set()
+        number = 0
+
+        async with self.api:
+            try:
+                while True:
+                    line = await loop.run_in_executor(None, input_file.readline)
+
+                    if not line:
+                        break
+
+                    number += 1
+
+                    if self.checkpoint is not None and self.checkpoint.skip(number):
+                        self.skipped += 1
+                        continue
+
+                    if not line.strip():
+                        self.skipped += 1
+
+                        if self.checkpoint is not None:
+                            self.checkpoint.complete(number)
+
+                        continue
+
+                    pending.add(asyncio.ensure_future(self._process(number, line)))
+
+                    if len(pending) >= self.concurrency:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        self._write(done, output_file)
+
+                while len(pending):
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    self._write(done, output_file)
+
+            finally:
+                for task in pending:
+                    task.cancel()
+
+                output_file.flush()
+
+                if self.checkpoint is not None:
+                    self.checkpoint.save()
+
+        self.elapsed = time.monotonic() - started
+        return self.summary()
+
+    def summary(self) -> dict:
+        """
+        Run statistics
+
+        :return: dictionary with numbers of requests, successful, failed, cached, skipped and retried lines,
+            elapsed time, throughput in lines per second and latency percentiles in seconds
+        """
+
+        completed = self.succeeded + self.failed
+
+        return {
+            'requests': self.requests,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'cached': self.cached,
+            'skipped': self.skipped,
+            'retried': self.retried,
+            'elapsed': self.elapsed,
+            'throughput': completed / self.elapsed if self.elapsed else 0.,
+            'latency': {'p{}'.format(p): percentile(self.latencies, p) for p in (50, 90, 95, 99)}
+        }
+
+    async def _process(self, number: int, line: str) -> tuple:
+        """ Result record of the input line and whether it succeeded """
+
+        try:
+            params = json.loads(line)
+
+            if not isinstance(params, dict):
+                raise ValueError('params must be a json object')
+
+        except ValueError as e:
+            return number, {'line': number, 'error': {'type': 'ParamsError', 'message': str(e)}}, False
+
+        key = None
+
+        if self.cache is not None:
+            key = self._cache_key(params)
+            response = self.cache.get(key)
+
+            if response is not None:
+                self.cached += 1
+                return number, {'line': number, 'params': params, 'response': response}, True
+
+        response = await self._request(params)
+
+        if isinstance(response, Exception):
+            error = {'type': response.__class__.__name__, 'message': str(response)}
+            return number, {'line': number, 'params': params, 'error': error}, False
+
+        data = response.to_dict()
+        succeeded = not hasattr(response, 'errors')
+
+        if succeeded and key is not None:
+            self.cache.set(key, data)
+
+        return number, {'line': number, 'params': params, 'response': data}, succeeded
+
+    async def _request(self, params: dict):
+        """ Response or exception, retryable failures are sent again with exponential backoff """
+
+        for attempt in range(self.retries + 1):
+            started = time.monotonic()
+            response = (await self.api.execute_async(self.method, [params], pass_errors=True, fields=self.fields))[0]
+
+            self.requests += 1
+            self._observe(time.monotonic() - started)
+
+            if attempt == self.retries or not self._retryable(response):
+                return response
+
+            self.retried += 1
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    def _cache_key(self, params: dict) -> str:
+        """ Method, params and projected fields, responses with different fields are cached separately """
+
+        fields = getattr(self.fields, 'fields', self.fields)
+        key = {'params': params, 'fields': sorted(fields) if fields is not None else None}
+
+        return self.method + ' ' + json.dumps(key, sort_keys=True, separators=(',', ':'))
+
+    def _write(self, done: set, output_file) -> None:
+        for task in done:
+            number, record, succeeded = task.result()
+
+            self.succeeded += succeeded
+            self.failed += not succeeded
+            output_file.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n')
+
+            if self.checkpoint is not None:
+                self.checkpoint.complete(number)
+
+        if self.checkpoint is not None and self.checkpoint.due():
+            output_file.flush()
+            self.checkpoint.save()
+
+    def _observe(self, latency: float) -> None:
+        """ Reservoir sampling of the latencies """
+
+        self._latency_count += 1
+
+        if len(self.latencies) < LATENCY_SAMPLES:
+            self.latencies.append(latency)
+            return
+
+        position = random.randrange(self._latency_count)
+
+        if position < LATENCY_SAMPLES:
+            self.latencies[position] = latency
+
+    @staticmethod
+    def _retryable(response) -> bool:
+        if isinstance(response, Exception):
+            return isinstance(response, RETRY_EXCEPTIONS)
+
+        return any(error_id(error) in BrowseAPI._backoff_error_ids for error in getattr(response, 'errors', ()))
+
+
+def error_id(error):
+    """ errorId of the passed error, ErrorRecord or exception with the error details """
+
+    if isinstance(error, ErrorRecord):
+        return error.errorId
+
+    return getattr(getattr(error, 'error', None), 'errorId', None)
+
+
+def format_summary(summary: dict) -> str:
+    latency = ', '.join('{} {:.3f}s'.format(name, value) for name, value in summary['latency'].items()
+                        if value is not None)
+
+    return '\n'.join((
+        'requests: {requests}, succeeded: {succeeded}, failed: {failed}, cached: {cached}, '
+        'skipped: {skipped}, retried: {retried}'.format(**summary),
+        'elapsed: {elapsed:.2f}s, throughput: {throughput:.1f} lines/s'.format(**summary),
+        'latency: {}'.format(latency or '-')
+    ))
+
+
+def main(argv: list = None, api: BrowseAPI = None) -> int:
+    """
+    Command line entry point
+
+    :param argv: command line arguments without the program name
+    :param api: client to use instead of the one built by build_client
+    :return: exit code, 1 if any line failed
+    """
+
+    args = parse_args(argv)
+    api = api if api is not None else build_client(args)
+    cache = ResponseCache(args.cache) if args.cache else None
+    checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+    fields = args.fields.split(',') if args.fields else None
+
+    runner = Runner(api, args.method, args.concurrency, args.retry, cache=cache, checkpoint=checkpoint,
+                    fields=fields)
+
+    input_file = open(args.input, encoding='utf8') if args.input != '-' else sys.stdin
+    # a restarted run appends to the output of the previous one
+
+    mode = 'a' if checkpoint is not None else 'w'
+    output_file = open(args.output, mode, encoding='utf8') if args.output != '-' else sys.stdout
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    try:
+        summary = loop.run_until_complete(runner.run(input_file, output_file))
+
+    finally:
+        loop.close()
+
+        for file in (input_file, output_file):
+            if file not in (sys.stdin, sys.stdout):
+                file.close()
+
+        if cache is not None:
+            cache.close()
+
+    print(format_summary(summary), file=sys.stderr)
+    return 1 if summary['failed'] else 0
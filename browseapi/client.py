@@ -1,14 +1,37 @@
 import asyncio
+import time
 
-from aiohttp import client_exceptions, ClientSession, ClientTimeout
+from aiohttp import ClientTimeout
 
-from base64 import b64encode
+from contextvars import ContextVar
+from itertools import compress
 from urllib.parse import urlencode
 
 from . import exceptions
+from .cache import CompatibilityCache
 from .containers import BrowseAPIResponse
+from .credentials import Credential, CredentialPool
+from .descriptions import DescriptionStore
+from .expansion import GroupExpander
+from .images import image_body
+from .limiter import AdaptiveLimiter
+from .metrics import Metrics
+from .policy import FailurePolicy
+from .profiling import Profiler, ProfiledResponses
+from .projection import Projection
+from .scheduler import Scheduler
+from .sinks import Sink
+from .sweep import Sweep
+from .transport import AiohttpTransport
 
 TIMEOUT = 60
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+TOKEN_EXPIRY_MARGIN = 60
+HEDGE_MIN_SAMPLES = 20
+
+# keyset chosen for the request in _call, every request runs in its own task
+_credential = ContextVar('credential', default=None)
 
 
 class BrowseAPI(object):
@@ -37,6 +60,14 @@ class BrowseAPI(object):
         'check_compatibility'
     )
 
+    # errors that signal throttling or server overload: too many requests and internal errors
+
+    _backoff_error_ids = (2001, 11000, 12000)
+
+    # methods that can be safely sent twice
+
+    _idempotent_methods = ('search', 'get_item', 'get_item_by_legacy_id', 'get_items_by_item_group')
+
     marketplaces = (
         'EBAY_US',
         'EBAY_AT',
@@ -64,13 +95,25 @@ class BrowseAPI(object):
     )
 
     def __init__(self,
-                 app_id: str,
-                 cert_id: str,
+                 app_id: str = None,
+                 cert_id: str = None,
                  marketplace_id: str = 'EBAY_US',
                  partner_id: str = None,
                  reference_id: str = None,
                  country: str = None,
-                 zip_code: str = None):
+                 zip_code: str = None,
+                 limiter: AdaptiveLimiter = None,
+                 scheduler: Scheduler = None,
+                 timeout: ClientTimeout = None,
+                 method_timeouts: dict = None,
+                 hedge_percentile: float = None,
+                 image_max_side: int = None,
+                 compatibility_cache: CompatibilityCache = None,
+                 error_records: bool = False,
+                 warm_up_connections: int = 0,
+                 transport=None,
+                 credentials: CredentialPool = None,
+                 descriptions: DescriptionStore = None):
         """
         Client initialization
 
@@ -81,8 +124,26 @@ class BrowseAPI(object):
         :param reference_id: any value to identify item or purchase order can be used only with partner_id
         :param country: country code, needed for the calculated shipping information
         :param zip_code: used only with a country for getting shipping information
+        :param limiter: concurrency limiter, AdaptiveLimiter with default settings if not specified
+        :param scheduler: priority scheduler, can be shared between clients running in the same event loop
+        :param timeout: aiohttp ClientTimeout with total, connect and sock_read timeouts for all requests
+        :param method_timeouts: dictionary with method names as keys and ClientTimeout instances as values
+        :param hedge_percentile: latency percentile of the method, after which a duplicate of an idempotent
+            request is sent and the first response is used, None to disable hedging
+        :param image_max_side: images for search_by_image are downscaled to this size in pixels, Pillow is required
+        :param compatibility_cache: cache of check_compatibility statuses, repeated checks are not sent
+        :param error_records: with pass_errors errors are returned as lightweight ErrorRecord tuples
+            with errorId, category and message instead of exception objects
+        :param warm_up_connections: number of keep-alive connections opened when the client is opened,
+            see warm_up
+        :param transport: AiohttpTransport (default), HttpxTransport for HTTP/2 or object with the same methods
+        :param credentials: CredentialPool with several keysets instead of app_id and cert_id
+        :param descriptions: DescriptionStore, item descriptions are skipped, truncated or kept compressed
         """
 
+        if (credentials is None) == (app_id is None or cert_id is None):
+            raise exceptions.BrowseAPIParamError('credentials. Pass either app_id and cert_id or CredentialPool')
+
         if marketplace_id not in self.marketplaces:
             raise exceptions.BrowseAPIParamError('marketplace_id')
 
@@ -92,22 +153,42 @@ class BrowseAPI(object):
         if (country is None and zip_code is not None) or (zip_code is None and country is not None):
             raise exceptions.BrowseAPIParamError('country or zip_code. These parameters can only both None or filled')
 
-        self._session = None
-        self._oauth_session = None
-        self._possible_requests = None
+        if limiter is not None and scheduler is not None:
+            raise exceptions.BrowseAPIParamError('limiter. Pass the limiter to the scheduler instead')
 
-        self._responses = []
-        self._timeout = ClientTimeout(total=TIMEOUT)
+        if method_timeouts is not None and not set(method_timeouts).issubset(self.supported_methods):
+            raise exceptions.BrowseAPIParamError('method_timeouts. Keys must be supported method names')
 
-        self._oauth_headers = {
-            'Authorization': 'Basic {}'.format(str(b64encode((app_id + ':' + cert_id).encode('utf8')))[2:-1]),
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise exceptions.BrowseAPIParamError('hedge_percentile. It must be between 0 and 100')
+
+        if warm_up_connections < 0:
+            raise exceptions.BrowseAPIParamError('warm_up_connections')
+
+        self._transport = transport if transport is not None else AiohttpTransport()
+        self._opened = False
+        self._credentials = credentials if credentials is not None else CredentialPool([Credential(app_id, cert_id)])
+
+        self._timeout = timeout if timeout is not None else ClientTimeout(
+            total=TIMEOUT, connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+        )
+
+        self._method_timeouts = method_timeouts if method_timeouts is not None else {}
+        self._hedge_percentile = hedge_percentile
+        self._image_max_side = image_max_side
+        self._compatibility_cache = compatibility_cache
+        self._error_records = error_records
+        self._descriptions = descriptions
+        self._warm_up_connections = warm_up_connections
+        self._scheduler = scheduler if scheduler is not None else Scheduler(limiter)
+
+        self.metrics = Metrics()
+        self.metrics.gauge('concurrency_limit', lambda: self._scheduler.limiter.limit)
+        self.metrics.gauge('in_flight', lambda: self._scheduler.limiter.in_flight)
 
         self._headers = {
             'Accept': 'application/json',
             'Accept-Charset': 'utf-8',
-            'Authorization': 'Bearer {}',
             'X-EBAY-C-MARKETPLACE-ID': marketplace_id
         }
 
@@ -132,26 +213,20 @@ class BrowseAPI(object):
         if len(ctx_header):
             self._headers['X-EBAY-C-ENDUSERCTX'] = ctx_header
 
-    async def _create_session(self):
-        """ Create requests session """
-
-        if self._session is not None:
-            await self._session.close()
-
-        self._session = ClientSession(headers=self._headers, timeout=self._timeout)
-
-    async def _oauth(self):
+    async def _oauth(self, credential: Credential):
         """
         OAuth request
 
+        :param credential: keyset of the application
         :return: json response
         """
 
         return await self._request(
             self._auth_uri,
-            self._oauth_session,
+            credential.oauth_headers,
             request_type='POST',
-            data=urlencode({'grant_type': self._credentials_grant_type, 'scope': self._scope_public_data})
+            data=urlencode({'grant_type': self._credentials_grant_type, 'scope': self._scope_public_data}),
+            auth=False
         )
 
     async def _search(self,
@@ -187,12 +262,13 @@ class BrowseAPI(object):
 
         return await self._request(
             self._search_uri,
-            self._session,
-            params=self._prepare_params(locals(), ('self',))
+            self._headers,
+            params=self._prepare_params(locals(), ('self',)),
+            timeout=self._method_timeouts.get('search')
         )
 
     async def _search_by_image(self,
-                               image: str,
+                               image,
                                category_ids: str = None,
                                filter: str = None,
                                sort: str = None,
@@ -203,7 +279,7 @@ class BrowseAPI(object):
         """
         Browse API searchByImage method
 
-        :param image: base64 encoded image
+        :param image: base64 encoded image, path to the image file, bytes, bytearray or memoryview
         :param category_ids: the category ID is used to limit the results
         :param filter: multiple field filters that can be used to limit/customize the result set
         :param sort: specifies the order and the field name to use to sort the items
@@ -214,12 +290,20 @@ class BrowseAPI(object):
         :return: json response
         """
 
+        params = self._prepare_params(locals(), ('self', 'image'))
+
+        # reading, encoding and serialization of large images do not block the event loop
+
+        body = await asyncio.get_event_loop().run_in_executor(None, image_body, image, self._image_max_side)
+
         return await self._request(
             self._search_by_image_uri,
-            self._session,
+            self._headers,
             request_type='POST',
-            params=self._prepare_params(locals(), ('self', 'image')),
-            json_data={'image': image}
+            params=params,
+            data=body,
+            content_type='application/json',
+            timeout=self._method_timeouts.get('search_by_image')
         )
 
     async def _get_item(self, item_id: str, fieldgroups: str = None) -> dict:
@@ -233,8 +317,9 @@ class BrowseAPI(object):
 
         return await self._request(
             self._get_item_uri.format(item_id=item_id),
-            self._session,
-            params=self._prepare_params(locals(), ('self', 'item_id'))
+            self._headers,
+            params=self._prepare_params(locals(), ('self', 'item_id')),
+            timeout=self._method_timeouts.get('get_item')
         )
 
     async def _get_item_by_legacy_id(self,
@@ -254,8 +339,9 @@ class BrowseAPI(object):
 
         return await self._request(
             self._get_item_by_legacy_id_uri,
-            self._session,
-            params=self._prepare_params(locals(), ('self',))
+            self._headers,
+            params=self._prepare_params(locals(), ('self',)),
+            timeout=self._method_timeouts.get('get_item_by_legacy_id')
         )
 
     async def _get_items_by_item_group(self, item_group_id: str) -> dict:
@@ -268,8 +354,9 @@ class BrowseAPI(object):
 
         return await self._request(
             self._get_items_by_item_group_uri,
-            self._session,
-            params=self._prepare_params(locals(), ('self',))
+            self._headers,
+            params=self._prepare_params(locals(), ('self',)),
+            timeout=self._method_timeouts.get('get_items_by_item_group')
         )
 
     async def _check_compatibility(self,
@@ -286,15 +373,16 @@ class BrowseAPI(object):
 
         return await self._request(
             self._check_compatibility_uri.format(item_id=item_id),
-            self._session,
+            self._headers,
             request_type='POST',
-            json_data={'compatibilityProperties': compatibility_properties}
+            json_data={'compatibilityProperties': compatibility_properties},
+            timeout=self._method_timeouts.get('check_compatibility')
         )
 
-    async def _send_oauth_request(self):
-        """ Send OAuth request for getting application token """
+    async def _send_oauth_request(self, credential: Credential):
+        """ Send OAuth request for getting application token of the keyset """
 
-        oauth_response = await self._oauth()
+        oauth_response = await self._oauth(credential)
 
         try:
             app_token = oauth_response['access_token']
@@ -303,127 +391,719 @@ class BrowseAPI(object):
         except KeyError:
             raise exceptions.BrowseAPIOAuthError(oauth_response)
 
-        self._possible_requests = expires_in // TIMEOUT
-        self._headers['Authorization'] = self._headers['Authorization'].format(app_token)
+        credential.token = app_token
+        credential.token_expires = time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN
 
-    async def _send_requests(self, method: str, params: list, pass_errors: bool) -> None:
+    async def _authorization(self) -> str:
         """
-        Send async requests
+        Authorization header value with the token of the keyset chosen for the request,
+        the application token is refreshed when it is about to expire
+
+        :return: header value
+        """
+
+        credential = _credential.get() or self._credentials.credentials[0]
+
+        if time.monotonic() >= credential.token_expires:
+            async with credential.token_lock:
+                if time.monotonic() >= credential.token_expires:
+                    await self._send_oauth_request(credential)
+
+        return 'Bearer ' + credential.token
+
+    async def _authorize(self) -> None:
+        """ Get tokens of all keysets, keysets failing with OAuth errors are suspended if others succeed """
+
+        credentials = self._credentials.credentials
+        results = await asyncio.gather(*[self._send_oauth_request(credential) for credential in credentials],
+                                       return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, exceptions.BrowseAPIError):
+                raise result
+
+        if all(result is not None for result in results):
+            raise results[0]
+
+        for credential, result in zip(credentials, results):
+            if result is not None:
+                self._credentials.report(credential, result.__class__)
+                self.metrics.increment('oauth_errors')
+
+    async def _call(self,
+                    method: str,
+                    params: dict,
+                    priority: str,
+                    deadline: float = None,
+                    profiler: Profiler = None) -> dict:
+        """
+        Call Browse API method when the scheduler admits it with the keyset chosen by the credential pool,
+        report the outcome to the limiter and the pool
 
         :param method: Browse API method name in lowercase
-        :param params: list of params dictionaries for every request
-        :param pass_errors: exceptions in the tasks are treated the same as successful results, bool
+        :param params: method params dictionary
+        :param priority: scheduler priority class
+        :param deadline: time.monotonic() value after which the request is dropped without sending
+        :param profiler: Profiler instance for queue and network time
+        :return: json response
         """
 
-        self._responses = []
+        queued = time.monotonic()
+        await self._scheduler.acquire(priority, deadline)
+        started = time.monotonic()
+
+        if profiler is not None:
+            profiler.add('queue', started - queued)
+        failed = cancelled = False
+
+        credential = self._credentials.choose()
+        _credential.set(credential)
+        self.metrics.increment('credentials.' + credential.name)
+
+        try:
+            if credential.limiter is not None:
+                await credential.limiter.acquire()
+                started = time.monotonic()
 
-        # load specified api method
+            if self._hedge_percentile is not None and method in self._idempotent_methods:
+                response = await self._hedged_call(method, params, credential)
+            else:
+                response = await self._load_method(method)(**params)
+
+            failed = self._is_throttled(response)
+
+            error_class = None
+
+            for error in response.get('errors', ()):
+                self.metrics.increment('errors.{}'.format(error.get('errorId')))
+
+                if error_class is None and error.get('errorId') is not None:
+                    error_class = exceptions.classify_error(error['errorId'])[0]
+
+            self._credentials.report(credential, error_class)
+            return response
+
+        except exceptions.BrowseAPIOAuthError:
+            self._credentials.report(credential, exceptions.BrowseAPIOAuthError)
+            raise
+
+        except (exceptions.BrowseAPITimeoutError,
+                exceptions.BrowseAPIConnectionError,
+                exceptions.BrowseAPIMimeTypeError):
+            failed = True
+            raise
+
+        except asyncio.CancelledError:
+            # cancelled requests say nothing about the server health
+
+            cancelled = True
+            raise
+
+        finally:
+            if cancelled:
+                self._scheduler.discard()
+                self.metrics.increment('cancelled')
+
+            else:
+                latency = time.monotonic() - started
+                self._scheduler.release(latency, failed)
+                self.metrics.increment('requests')
+                self.metrics.observe('latency', latency)
+                self.metrics.observe('latency.' + method, latency)
+
+                if profiler is not None:
+                    profiler.add('network', latency)
+
+                if failed:
+                    self.metrics.increment('backoffs')
+
+    async def _hedged_call(self, method: str, params: dict, credential: Credential) -> dict:
+        """
+        Send a duplicate request if the first one is slower than the hedge percentile of the method latency.
+        Duplicates are sent outside the concurrency limit, but not while the limiter is backing off,
+        and they are counted against the rate and the daily quota of the keyset
+
+        :param method: Browse API method name in lowercase
+        :param params: method params dictionary
+        :param credential: keyset of the request
+        :return: json response of the first successful request
+        """
+
+        series = 'latency.' + method
+        method = self._load_method(method)
+        delay = None
+
+        if len(self.metrics.samples(series)) >= HEDGE_MIN_SAMPLES:
+            delay = self.metrics.percentile(series, self._hedge_percentile)
+
+        primary = asyncio.ensure_future(method(**params))
+        tasks = [primary]
+
+        # the primary request and the duplicate are cancelled together with the call
+
+        try:
+            if delay is None:
+                return await primary
+
+            pending = (await asyncio.wait((primary,), timeout=delay))[1]
+
+            if not pending:
+                return primary.result()
+
+            if not self._can_hedge(credential):
+                self.metrics.increment('hedges_skipped')
+                return await primary
+
+            if credential.limiter is not None:
+                await credential.limiter.acquire()
+
+            credential.use()
+            self.metrics.increment('credentials.' + credential.name)
+            self.metrics.increment('hedged')
+            tasks.append(asyncio.ensure_future(method(**params)))
+            pending = set(tasks)
+
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                # exceptions of all completed tasks are retrieved, a success is preferred
+
+                succeeded = [task for task in done if task.exception() is None]
+
+                if len(succeeded):
+                    task = primary if primary in succeeded else succeeded[0]
+
+                    if task is not primary:
+                        self.metrics.increment('hedge_wins')
+
+                    return task.result()
+
+                if not pending:
+                    return (primary if primary in done else done.pop()).result()
+
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _can_hedge(self, credential: Credential) -> bool:
+        """ Whether a duplicate request can be sent now without waiting for the keyset rate or exceeding its quota """
+
+        if self._scheduler.limiter.backing_off:
+            return False
+
+        if credential.limiter is not None and credential.limiter.tokens < 1:
+            return False
+
+        return credential.remaining() > 0
+
+    def _load_method(self, method: str):
+        """
+        Get Browse API method by name
+
+        :param method: Browse API method name in lowercase
+        :return: bound method
+        """
 
         if method not in self.supported_methods:
             raise exceptions.BrowseAPIMethodError('This method is not supported: {}'.format(method))
 
-        method_name = method
-        method = getattr(self, '_' + method)
+        return getattr(self, '_' + method)
+
+    async def _send_requests(self,
+                             method: str,
+                             params: list,
+                             pass_errors: bool,
+                             priority: str = 'bulk',
+                             timeout: float = None,
+                             sweep: Sweep = None,
+                             expander: GroupExpander = None,
+                             policy: FailurePolicy = None,
+                             sink: Sink = None,
+                             fields=None,
+                             profile=False) -> list:
+        """
+        Send async requests
+
+        :param method: Browse API method name in lowercase
+        :param params: list of params dictionaries for every request
+        :param pass_errors: exceptions in the tasks are treated the same as successful results, bool
+        :param priority: scheduler priority class
+        :param timeout: seconds for the requests to be sent, requests not sent in time are dropped
+        :param sweep: Sweep instance for deduplication of items across calls
+        :param expander: GroupExpander instance for fetching item groups of the returned items
+        :param policy: FailurePolicy instance for stopping the batch early
+        :param sink: Sink instance, responses are written as they complete instead of being returned
+        :param fields: list of dotted paths of the item fields to parse or Projection instance
+        :param profile: True or Profiler instance, responses are returned as ProfiledResponses
+        :return: list of responses
+        """
+
+        if not profile:
+            return await self._dispatch(method, params, pass_errors, priority, timeout, sweep, expander, policy,
+                                        sink, fields)
+
+        profiler = profile if isinstance(profile, Profiler) else Profiler()
+        profiler.start()
 
         try:
-            # get oauth token
+            responses = await self._dispatch(method, params, pass_errors, priority, timeout, sweep, expander,
+                                             policy, sink, fields, profiler)
+
+        finally:
+            await profiler.stop()
 
-            self._oauth_session = ClientSession(headers=self._oauth_headers, timeout=self._timeout)
-            await self._send_oauth_request()
-            await self._create_session()
+        return ProfiledResponses(responses, profiler)
 
-            # send requests
+    async def _dispatch(self,
+                        method: str,
+                        params: list,
+                        pass_errors: bool,
+                        priority: str,
+                        timeout: float,
+                        sweep: Sweep,
+                        expander: GroupExpander,
+                        policy: FailurePolicy,
+                        sink: Sink,
+                        fields,
+                        profiler: Profiler = None) -> list:
+        """ Send async requests, arguments are the same as for _send_requests """
 
-            params = self._split_list(params, self._possible_requests)
+        self._load_method(method)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        projection = self._projection(method, fields)
 
-            for part_number, param_part in enumerate(params):
-                responses = await asyncio.gather(
-                    *[method(**param) for param in param_part],
-                    return_exceptions=pass_errors
-                )
+        if sweep is not None:
+            params = sweep.filter_params(method, params)
 
-                self._responses += [BrowseAPIResponse(response, method_name, pass_errors)
-                                    if isinstance(response, dict) else response for response in responses]
+        if projection is not None:
+            params = [projection.prepare(method, param) if param is not None else None for param in params]
 
-                if part_number != len(params):
-                    await self._send_oauth_request()
-                    await self._create_session()
+        # concurrency is controlled by the scheduler
+
+        if method == 'check_compatibility' and self._compatibility_cache is not None:
+            responses = await self._send_compatibility_requests(params, pass_errors, priority, deadline, policy,
+                                                                profiler)
+
+            responses = [BrowseAPIResponse(response, method, pass_errors, error_records=self._error_records)
+                         if isinstance(response, dict) else response for response in responses]
+
+            if sink is None:
+                return responses
+
+            written = [isinstance(response, BrowseAPIResponse) and not hasattr(response, 'errors')
+                       for response in responses]
+
+            for response in compress(responses, written):
+                await sink.send(response)
+
+            return [None if is_written else response for response, is_written in zip(responses, written)]
+
+        responses = iter(await self._gather(
+            [self._process(method, param, pass_errors, priority, deadline, sweep, expander, sink, projection,
+                           profiler) for param in params if param is not None],
+            pass_errors, policy
+        ))
+
+        # requests skipped by the sweep keep their places in the result as None
+
+        return [next(responses) if param is not None else None for param in params]
+
+    async def _gather(self, coroutines: list, pass_errors: bool, policy: FailurePolicy = None) -> list:
+        """
+        Run coroutines concurrently, remaining tasks are cancelled on the first exception
+        if errors are not passed or when the failure policy stops the batch
+
+        :param coroutines: list of coroutines
+        :param pass_errors: exceptions in the tasks are treated the same as successful results, bool
+        :param policy: FailurePolicy instance
+        :return: list of results in the order of coroutines
+        """
+
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        errors = 0
+
+        try:
+            for completed, future in enumerate(asyncio.as_completed(tasks), 1):
+                try:
+                    result = await future
+
+                except Exception as e:
+                    if not pass_errors:
+                        raise
+
+                    result = e
+
+                if policy is None:
+                    continue
+
+                error_class = policy.error_class(result)
+                errors += error_class is not None
+                reason = policy.abort_reason(error_class, errors, completed, policy.error_id(result))
+
+                if reason is not None:
+                    raise exceptions.BrowseAPIAbortError(reason, result, [
+                        (task.exception() or task.result()) if task.done() else None for task in tasks
+                    ])
 
         finally:
-            await self._oauth_session.close()
+            pending = [task for task in tasks if not task.done()]
+
+            for task in pending:
+                task.cancel()
+
+            # wait for cancelled requests to release their connections
+
+            if len(pending):
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            # exceptions of the tasks completed before the stop are retrieved to avoid warnings
 
-            if self._session is not None:
-                await self._session.close()
+            for task in tasks:
+                if not task.cancelled():
+                    task.exception()
 
-    def execute(self, method: str, params: list, pass_errors: bool = False) -> list:
+        return [task.exception() or task.result() for task in tasks]
+
+    async def _process(self,
+                       method: str,
+                       params: dict,
+                       pass_errors: bool,
+                       priority: str,
+                       deadline: float = None,
+                       sweep: Sweep = None,
+                       expander: GroupExpander = None,
+                       sink: Sink = None,
+                       projection: Projection = None,
+                       profiler: Profiler = None) -> BrowseAPIResponse:
+        """
+        Make one request and parse the response as soon as it arrives
+
+        :param method: Browse API method name in lowercase
+        :param params: method params dictionary
+        :param pass_errors: exceptions in the response are treated the same as successful results
+        :param priority: scheduler priority class
+        :param deadline: time.monotonic() value after which the request is dropped without sending
+        :param sweep: Sweep instance for deduplication of items across calls
+        :param expander: GroupExpander instance for fetching item groups of the returned items
+        :param sink: Sink instance, the response is written to the sink and not returned
+        :param projection: Projection instance, only the requested fields of the items are parsed
+        :param profiler: Profiler instance for phase times
+        :return: parsed response or None if it was written to the sink
+        """
+
+        response = await self._call(method, params, priority, deadline, profiler)
+
+        if profiler is not None:
+            started, cpu_started = time.perf_counter(), time.thread_time()
+
+        response = BrowseAPIResponse(response, method, pass_errors, sweep, self._error_records, projection,
+                                     self._descriptions)
+
+        if sweep is not None and not hasattr(response, 'errors'):
+            item_id = sweep.detail_id(method, params)
+
+            if item_id is not None:
+                sweep.add_detail(item_id)
+
+        if profiler is not None:
+            profiler.add('parse', time.perf_counter() - started, time.thread_time() - cpu_started)
+            started = time.perf_counter()
+
+        if expander is not None:
+            await expander.expand_response(self, response, pass_errors)
+
+        # responses with passed errors are returned to the caller
+
+        if sink is not None and not hasattr(response, 'errors'):
+            await sink.send(response)
+            response = None
+
+        if profiler is not None and (expander is not None or sink is not None):
+            profiler.add('callbacks', time.perf_counter() - started)
+
+        return response
+
+    async def _send_compatibility_requests(self,
+                                           params: list,
+                                           pass_errors: bool,
+                                           priority: str,
+                                           deadline: float = None,
+                                           policy: FailurePolicy = None,
+                                           profiler: Profiler = None) -> list:
+        """
+        Send check_compatibility requests only for unique checks missing in the cache
+
+        :param params: list of params dictionaries for every request
+        :param pass_errors: exceptions in the tasks are treated the same as successful results, bool
+        :param priority: scheduler priority class
+        :param deadline: time.monotonic() value after which the requests are dropped without sending
+        :param policy: FailurePolicy instance for stopping the batch early
+        :param profiler: Profiler instance for queue and network time
+        :return: list of json responses
+        """
+
+        cache = self._compatibility_cache
+        keys = [cache.key(param['item_id'], param['compatibility_properties']) for param in params]
+        results = {key: {'compatibilityStatus': status} for key, status in cache.get_many(list(set(keys))).items()}
+        to_send = {key: param for key, param in zip(keys, params) if key not in results}
+
+        responses = await self._gather(
+            [self._call('check_compatibility', param, priority, deadline, profiler) for param in to_send.values()],
+            pass_errors, policy
+        )
+
+        results.update(zip(to_send, responses))
+
+        cache.set_many({
+            key: response['compatibilityStatus'] for key, response in zip(to_send, responses)
+            if isinstance(response, dict) and 'errors' not in response and 'compatibilityStatus' in response
+        })
+
+        self.metrics.increment('compatibility_deduplicated', len(params) - len(results))
+        return [results[key] for key in keys]
+
+    async def open(self) -> None:
+        """ Create sessions and get application token, connections are warmed up if warm_up_connections is set """
+
+        await self._open(self._warm_up_connections)
+
+    async def warm_up(self, connections: int = 10) -> None:
+        """
+        Open the client with DNS resolved once, keep-alive connections opened and application token
+        fetched concurrently, so the first requests do not pay for the handshakes all at once.
+        Connections of the opened client are just opened
+
+        :param connections: number of keep-alive connections
+        """
+
+        if connections < 1:
+            raise exceptions.BrowseAPIParamError('connections')
+
+        if not self._opened:
+            await self._open(connections)
+
+        else:
+            await self._warm_connections(connections)
+
+    async def close(self) -> None:
+        """ Close transport """
+
+        await self._transport.close()
+
+        self._opened = False
+
+        for credential in self._credentials:
+            credential.reset_token()
+
+    async def _open(self, connections: int) -> None:
+        """
+        Open transport and get application token
+
+        :param connections: number of keep-alive connections opened concurrently with the token request
+        """
+
+        if self._opened:
+            return
+
+        started = time.monotonic()
+
+        for credential in self._credentials:
+            credential.token_lock = asyncio.Lock()
+
+        try:
+            await self._transport.open()
+
+            if connections:
+                # the first connection resolves the host, the rest use the dns cache
+
+                await self._warm_connections(1)
+                await asyncio.gather(self._authorize(), self._warm_connections(connections - 1))
+
+            else:
+                await self._authorize()
+
+        except Exception:
+            await self.close()
+            raise
+
+        self._opened = True
+        self.metrics.observe('startup', time.monotonic() - started)
+
+    async def _warm_connections(self, connections: int) -> None:
+        """ Open keep-alive connections, failures are only counted """
+
+        if connections:
+            errors = await self._transport.warm_up(self._uri, connections)
+
+            if errors:
+                self.metrics.increment('warm_up_errors', errors)
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def execute_async(self,
+                            method: str,
+                            params: list,
+                            pass_errors: bool = False,
+                            priority: str = 'bulk',
+                            timeout: float = None,
+                            sweep: Sweep = None,
+                            expander: GroupExpander = None,
+                            policy: FailurePolicy = None,
+                            sink: Sink = None,
+                            fields=None,
+                            profile=False) -> list:
+        """
+        Make requests in the running event loop, the client must be opened by open() or "async with"
+
+        :param method: Browse API method name in lowercase
+        :param params: list of params dictionaries for every request
+        :param pass_errors: exceptions in the tasks are treated the same as successful results, bool
+        :param priority: scheduler priority class, 'interactive' requests are sent before 'bulk' ones
+        :param timeout: seconds for the requests to be sent, requests not sent in time are dropped
+        :param sweep: Sweep instance, duplicate item summaries are dropped and repeated detail requests
+            are not sent, the result contains None instead of them
+        :param expander: GroupExpander instance, item groups of the returned items are fetched once per group
+            and attached to the items as groupItems
+        :param policy: FailurePolicy instance, when it stops the batch remaining requests are cancelled
+            and BrowseAPIAbortError is raised
+        :param sink: Sink instance, responses are written in a background thread as they complete
+            and not kept in the result, which contains None instead of them. Exceptions and responses
+            with errors passed with pass_errors are returned as usual
+        :param fields: list of dotted paths of the item fields like 'price.value' or Projection instance,
+            only these fields of the items are parsed and the smallest fieldgroups returning them are requested
+        :param profile: True or Profiler instance, responses are returned as ProfiledResponses list
+            with the profiler as profile attribute, see Profiler.report and Profiler.dump
+        :return: list of responses
+        """
+
+        if not self._opened:
+            raise exceptions.BrowseAPIError('Client is not opened, use "async with" or open()')
+
+        return await self._send_requests(
+            method, params, pass_errors,
+            priority=priority, timeout=timeout, sweep=sweep, expander=expander, policy=policy, sink=sink,
+            fields=fields, profile=profile
+        )
+
+    def execute(self,
+                method: str,
+                params: list,
+                pass_errors: bool = False,
+                priority: str = 'bulk',
+                timeout: float = None,
+                sweep: Sweep = None,
+                expander: GroupExpander = None,
+                policy: FailurePolicy = None,
+                sink: Sink = None,
+                fields=None,
+                profile=False) -> list:
         """
         Start event loop and make requests
 
         :param method: Browse API method name in lowercase
         :param params: list of params dictionaries for every request
         :param pass_errors: exceptions in the tasks are treated the same as successful results, bool
+        :param priority: scheduler priority class
+        :param timeout: seconds for the requests to be sent, requests not sent in time are dropped
+        :param sweep: Sweep instance for deduplication of items across calls
+        :param expander: GroupExpander instance for fetching item groups of the returned items
+        :param policy: FailurePolicy instance for stopping the batch early
+        :param sink: Sink instance, responses are written as they complete instead of being returned
+        :param fields: list of dotted paths of the item fields to parse or Projection instance
+        :param profile: True or Profiler instance, responses are returned as ProfiledResponses
         :return: list of responses
         """
 
+        self._load_method(method)
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
         try:
-            loop.run_until_complete(self._send_requests(method, params, pass_errors))
+            return loop.run_until_complete(self._execute(
+                method, params, pass_errors,
+                priority=priority, timeout=timeout, sweep=sweep, expander=expander, policy=policy, sink=sink,
+                fields=fields, profile=profile
+            ))
 
         finally:
             loop.close()
 
-        return self._responses
+    async def _execute(self, *args, **kwargs) -> list:
+        """ Open the client for one execute call """
 
-    @staticmethod
-    async def _request(uri: str,
-                       session: ClientSession,
+        async with self:
+            return await self._send_requests(*args, **kwargs)
+
+    async def _request(self,
+                       uri: str,
+                       headers: dict,
                        request_type: str = 'GET',
                        params: dict = None,
                        data: str = None,
-                       json_data: dict = None) -> dict:
+                       json_data: dict = None,
+                       content_type: str = None,
+                       auth: bool = True,
+                       timeout: ClientTimeout = None) -> dict:
         """
         Make async request
 
         :param uri: request uri
-        :param session: Client session instance
+        :param headers: common headers of the request, API or OAuth ones
         :param request_type: GET or POST
         :param params: request parameters dictionary
-        :param data: str with request payload
+        :param data: str or bytes with request payload
         :param json_data: dictionary with request payload
+        :param content_type: content type of the data payload
+        :param auth: add application token to the request headers
+        :param timeout: request timeout, the client timeout is used if not specified
         :return: json response
         """
 
-        try:
-            if request_type == 'GET':
-                async with session.get(uri, params=params) as response:
-                    return await response.json()
+        if request_type not in ('GET', 'POST'):
+            raise exceptions.BrowseAPIParamError('request_type')
 
-            elif request_type == 'POST':
-                async with session.post(uri, params=params, data=data, json=json_data) as response:
-                    return await response.json()
+        if auth or content_type is not None:
+            headers = dict(headers)
 
-            else:
-                raise exceptions.BrowseAPIParamError('request_type')
+            if auth:
+                headers['Authorization'] = await self._authorization()
 
-        except client_exceptions.InvalidURL:
-            raise exceptions.BrowseAPIInvalidUri('Invalid uri', uri)
+            if content_type is not None:
+                headers['Content-Type'] = content_type
 
-        except client_exceptions.ServerTimeoutError:
-            raise exceptions.BrowseAPITimeoutError('Timeout occurred', uri)
+        return await self._transport.request(request_type,
+                                             uri,
+                                             headers,
+                                             params=params,
+                                             data=data,
+                                             json_data=json_data,
+                                             timeout=timeout if timeout is not None else self._timeout)
 
-        except client_exceptions.ClientConnectorError:
-            raise exceptions.BrowseAPIConnectionError('Connection error', uri)
+    @staticmethod
+    def _projection(method: str, fields):
+        """
+        Compile the field projection once for all requests of the call
+
+        :param method: Browse API method name in lowercase
+        :param fields: list of dotted paths, Projection instance or None
+        :return: Projection instance or None
+        """
 
-        except client_exceptions.ClientOSError:
-            raise exceptions.BrowseAPIConnectionError('Connection reset', uri)
+        if fields is None or isinstance(fields, Projection):
+            projection = fields
+        else:
+            projection = Projection(fields)
 
-        except client_exceptions.ServerDisconnectedError:
-            raise exceptions.BrowseAPIConnectionError('Server refused the request', uri)
+        if projection is not None and method == 'check_compatibility':
+            raise exceptions.BrowseAPIParamError('fields. Projection is not supported for check_compatibility')
 
-        except client_exceptions.ClientResponseError:
-            raise exceptions.BrowseAPIMimeTypeError('Response has unexpected mime type', uri)
+        return projection
 
     @staticmethod
     def _prepare_params(params: dict, to_delete: tuple = ('',)) -> dict:
@@ -439,8 +1119,8 @@ class BrowseAPI(object):
             param: str(params[param]) for param in params if params[param] is not None and param not in to_delete
         }
 
-    @staticmethod
-    def _split_list(array: list, n: int):
-        """ Split list into parts with n elements """
+    @classmethod
+    def _is_throttled(cls, response: dict) -> bool:
+        """ Check whether the response contains throttling or server overload errors """
 
-        return [array[i:i + n] for i in range(0, len(array), n)]
+        return any(error.get('errorId') in cls._backoff_error_ids for error in response.get('errors', ()))
@@ -1,4 +1,99 @@
+from array import array
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+
 from . import exceptions
+from .descriptions import StoredText
+
+# lightweight error representation for noisy bulk jobs, category is the error class from exceptions.classify_error
+
+ErrorRecord = namedtuple('ErrorRecord', ('errorId', 'category', 'message'))
+
+
+class cached_attribute(object):
+    """ Attribute computed on the first access, the value is saved to the instance dictionary """
+
+    def __init__(self, function):
+        self.function = function
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = instance.__dict__[self.function.__name__] = self.function(instance)
+        return value
+
+
+class stored_attribute(object):
+    """
+    Text attribute saved as StoredText under the underscored name, decompressed on every access and not cached.
+    Plain values set to the attribute itself take precedence
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = '_' + name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        try:
+            return instance.__dict__[self.key].text()
+
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+def set_text(container, name: str, value) -> None:
+    """ Set the text attribute, StoredText values of unpickled containers are kept compressed """
+
+    if isinstance(value, StoredText):
+        container.__dict__['_' + name] = value
+    else:
+        setattr(container, name, value)
+
+
+def to_decimal(value: str):
+    return Decimal(value) if value is not None else None
+
+
+def cached_attributes(cls) -> frozenset:
+    """ Names of the cached attributes of the container class """
+
+    names = _cached_attributes.get(cls)
+
+    if names is None:
+        names = _cached_attributes[cls] = frozenset(
+            name for klass in cls.__mro__ for name, value in vars(klass).items() if isinstance(value, cached_attribute)
+        )
+
+    return names
+
+
+_cached_attributes = {}
+
+
+def to_raw(value, decompress: bool = True):
+    """ Raw json representation of the container attribute value """
+
+    if isinstance(value, BrowseAPIBaseContainer):
+        return value.to_dict(decompress)
+
+    if isinstance(value, ErrorRecord):
+        return {'errorId': value.errorId, 'message': value.message}
+
+    if isinstance(value, StoredText):
+        return value.text() if decompress else value
+
+    if isinstance(value, list):
+        return [to_raw(element, decompress) for element in value]
+
+    if isinstance(value, exceptions.BrowseAPIError):
+        return value.error.to_dict() if hasattr(value, 'error') else {'message': value.msg}
+
+    return value
 
 
 class BrowseAPIBaseContainer(object):
@@ -7,22 +102,61 @@ class BrowseAPIBaseContainer(object):
     def __str__(self):
         return str(self.__dict__)
 
+    def __reduce__(self):
+        # pickled as raw json, containers are built again on unpickling, stored texts stay compressed
+
+        return self.__class__, (self.to_dict(decompress=False),)
+
+    def to_dict(self, decompress: bool = True) -> dict:
+        """
+        Raw json representation of the container, None fields and cached typed values are skipped
+
+        :param decompress: stored texts are decompressed, False to keep StoredText objects for pickling
+        :return: dictionary in the same format as the API response
+        """
+
+        cached = cached_attributes(self.__class__)
+
+        return {key[1:] if isinstance(value, StoredText) else key: to_raw(value, decompress)
+                for key, value in self.__dict__.items() if value is not None and key not in cached}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ Build the container from the raw json or to_dict result """
+
+        return cls(data)
+
 
 class BrowseAPIResponse(BrowseAPIBaseContainer):
     """ Browse API parsed response data container """
 
-    def __init__(self, response: dict, method: str, pass_errors: bool):
+    # get_item description moved out of line by DescriptionStore
+
+    description = stored_attribute('description')
+
+    def __init__(self,
+                 response: dict,
+                 method: str,
+                 pass_errors: bool,
+                 sweep=None,
+                 error_records: bool = False,
+                 projection=None,
+                 descriptions=None):
         """
         Response container initialization
 
         :param response: parsed json response
         :param method: called method name
         :param pass_errors: exceptions in the response are treated the same as successful results
+        :param sweep: Sweep instance, item summaries seen before are dropped without parsing
+        :param error_records: passed errors are saved as ErrorRecord tuples instead of exceptions
+        :param projection: Projection instance, only the requested fields of the items are parsed
+        :param descriptions: DescriptionStore instance, item descriptions are skipped, truncated or compressed
         """
 
         if 'errors' in response:
             self.errors = []
-            self.parse_errors(response, pass_errors)
+            self.parse_errors(response, pass_errors, error_records)
             return
 
         if 'warnings' in response:
@@ -43,17 +177,25 @@ class BrowseAPIResponse(BrowseAPIBaseContainer):
                 self.refinement = Refinement(response['refinement'])
 
             if 'itemSummaries' in response:
-                self.itemSummaries = [ItemSummary(item) for item in response['itemSummaries']]
+                summary = ItemSummary if projection is None else projection.summary
+                self.itemSummaries = [summary(item) for item in response['itemSummaries']
+                                      if sweep is None or sweep.add_summary(item.get('itemId'))]
 
         # item methods
 
+        elif method in ('get_item', 'get_item_by_legacy_id') and projection is not None:
+            projection.apply(self, response)
+
+            if descriptions is not None:
+                descriptions.store(self)
+
         elif method in ('get_item', 'get_item_by_legacy_id'):
             self.adultOnly = response.get('adultOnly')
             self.categoryId = response.get('categoryId')
             self.categoryPath = response.get('categoryPath')
             self.condition = response.get('condition')
             self.conditionId = response.get('conditionId')
-            self.description = response.get('description')
+            set_text(self, 'description', response.get('description'))
             self.enabledForGuestCheckout = response.get('enabledForGuestCheckout')
             self.itemWebUrl = response.get('itemWebUrl')
             self.title = response.get('title')
@@ -144,48 +286,99 @@ class BrowseAPIResponse(BrowseAPIBaseContainer):
             if 'unitPrice' in response:
                 self.unitPrice = ConvertedAmount(response['unitPrice'])
 
+            if 'groupItems' in response:
+                self.groupItems = [Item(item) for item in response['groupItems']]
+
+            if descriptions is not None:
+                descriptions.store(self)
+
         elif method == 'get_items_by_item_group':
             if 'commonDescriptions' in response:
                 self.commonDescriptions = [CommonDescriptions(description)
                                            for description in response['commonDescriptions']]
 
             if 'items' in response:
-                self.items = [Item(item) for item in response['items']]
+                item = Item if projection is None else projection.item
+                self.items = [item(item_json) for item_json in response['items']]
+
+                if descriptions is not None:
+                    for item in self.items:
+                        descriptions.store(item)
 
         else:
             self.compatibilityStatus = response.get('compatibilityStatus')
 
-    def parse_errors(self, response: dict, pass_errors: bool) -> None:
+    def __reduce__(self):
+        errors = getattr(self, 'errors', None)
+        error_records = bool(errors) and isinstance(errors[0], ErrorRecord)
+        data = self.to_dict(decompress=False)
+        return self.__class__, (data, self.response_method(data), True, None, error_records)
+
+    @classmethod
+    def from_dict(cls, data: dict, method: str = None, error_records: bool = False):
         """
-        Handle all Browse API errors,
-        for more information visit https://developer.ebay.com/api-docs/static/handling-error-messages.html
+        Build the response from the raw json or to_dict result, errors are passed
+
+        :param data: response dictionary
+        :param method: called method name, detected by the response fields if not specified
+        :param error_records: errors are saved as ErrorRecord tuples instead of exceptions
+        :return: BrowseAPIResponse instance
         """
 
-        for error in response['errors']:
-            if error['errorId'] in (11000, 12000):
-                exception = exceptions.BrowseAPIInternalError(error)
+        return cls(data, method or cls.response_method(data), True, error_records=error_records)
+
+    @staticmethod
+    def response_method(data: dict) -> str:
+        """ Method name with the same parsing as for the response, search and get_item variants are parsed alike """
 
-            elif error['errorId'] in (1001, 1002, 1003, 1004, 1100):
-                exception = exceptions.BrowseAPIRequestOAuthError(error)
+        if 'href' in data and 'total' in data:
+            return 'search'
 
-            elif error['errorId'] in (2001, 2002, 2003, 2004):
-                exception = exceptions.BrowseAPIAccessError(error)
+        if 'items' in data or 'commonDescriptions' in data:
+            return 'get_items_by_item_group'
 
-            elif error['errorId'] in (3001, 3002, 3003, 3004, 3005):
-                exception = exceptions.BrowseAPIRoutingError(error)
+        if 'compatibilityStatus' in data:
+            return 'check_compatibility'
 
-            elif 11001 <= error['errorId'] <= 11507 or 12001 <= error['errorId'] <= 12007 \
-                    or 12023 <= error['errorId'] <= 12506:
-                exception = exceptions.BrowseAPIRequestParamError(error)
+        return 'get_item'
 
-            elif error['errorId'] in (12013, 12019):
-                exception = exceptions.BrowseAPIBusinessError(error)
+    def prices(self, field: str = 'price') -> array:
+        """
+        Amounts of all items of the response converted in one pass, without typed values caching
+
+        :param field: amount field of the items, like price, currentBidPrice or unitPrice
+        :return: float64 array aligned with itemSummaries or items, nan for items without the amount
+        """
+
+        items = getattr(self, 'itemSummaries', None) or getattr(self, 'items', None) or ()
+        nan = float('nan')
+        amounts = (getattr(item, field, None) for item in items)
+        return array('d', [float(amount.value) if amount is not None and amount.value is not None else nan
+                           for amount in amounts])
+
+    def parse_errors(self, response: dict, pass_errors: bool, error_records: bool = False) -> None:
+        """
+        Handle all Browse API errors,
+        for more information visit https://developer.ebay.com/api-docs/static/handling-error-messages.html
+        """
+
+        for error in response['errors']:
+            exception_class, category = exceptions.classify_error(error['errorId'])
+
+            if pass_errors and error_records:
+                self.errors.append(ErrorRecord(error['errorId'], category, error.get('message')))
+                continue
+
+            if exception_class is not None:
+                exception = exception_class(error)
 
             else:
                 exception = exceptions.BrowseAPIError('Unhandled error, code: {0}, message: {1}'.format(
                     error['errorId'], error['message'])
                 )
 
+                exception.error = ErrorDetailV3(error)
+
             if not pass_errors:
                 raise exception
 
@@ -198,6 +391,8 @@ class Item(BrowseAPIBaseContainer):
     https://developer.ebay.com/api-docs/buy/browse/types/gct:Item
     """
 
+    description = stored_attribute('description')
+
     def __init__(self, item: dict):
         if 'warnings' in item:
             self.warnings = [ErrorDetailV3(warning) for warning in item['warnings']]
@@ -207,7 +402,7 @@ class Item(BrowseAPIBaseContainer):
         self.categoryPath = item.get('categoryPath')
         self.condition = item.get('condition')
         self.conditionId = item.get('conditionId')
-        self.description = item.get('description')
+        set_text(self, 'description', item.get('description'))
         self.enabledForGuestCheckout = item.get('enabledForGuestCheckout')
         self.itemWebUrl = item.get('itemWebUrl')
         self.title = item.get('title')
@@ -298,6 +493,9 @@ class Item(BrowseAPIBaseContainer):
         if 'unitPrice' in item:
             self.unitPrice = ConvertedAmount(item['unitPrice'])
 
+        if 'groupItems' in item:
+            self.groupItems = [Item(item) for item in item['groupItems']]
+
 
 class ItemSummary(BrowseAPIBaseContainer):
     """
@@ -345,8 +543,8 @@ class ItemSummary(BrowseAPIBaseContainer):
             self.categories = [Category(category) for category in item_summary['categories']]
 
         if 'compatibilityProperties' in item_summary:
-            self.categories = [CompatibilityProperty(compatibility_property)
-                               for compatibility_property in item_summary['compatibilityProperties']]
+            self.compatibilityProperties = [CompatibilityProperty(compatibility_property)
+                                            for compatibility_property in item_summary['compatibilityProperties']]
 
         if 'currentBidPrice' in item_summary:
             self.currentBidPrice = ConvertedAmount(item_summary['currentBidPrice'])
@@ -369,6 +567,9 @@ class ItemSummary(BrowseAPIBaseContainer):
         if 'unitPrice' in item_summary:
             self.unitPrice = ConvertedAmount(item_summary['unitPrice'])
 
+        if 'groupItems' in item_summary:
+            self.groupItems = [Item(item) for item in item_summary['groupItems']]
+
 
 class CommonDescriptions(BrowseAPIBaseContainer):
     """
@@ -426,6 +627,29 @@ class ConvertedAmount(BrowseAPIBaseContainer):
         for key in 'convertedFromCurrency', 'convertedFromValue':
             setattr(self, key, current_price.get(key))
 
+    # typed values are parsed on the first access
+
+    @cached_attribute
+    def decimal_value(self):
+        """ Value as Decimal """
+
+        return to_decimal(self.value)
+
+    @cached_attribute
+    def float_value(self):
+        """ Value as float """
+
+        return float(self.value) if self.value is not None else None
+
+    @cached_attribute
+    def cents(self):
+        """ Value in integer cents (hundredths of the currency unit) """
+
+        if self.value is None:
+            return None
+
+        return int((self.decimal_value * 100).to_integral_value(ROUND_HALF_UP))
+
 
 class TargetLocation(BrowseAPIBaseContainer):
     """
@@ -465,6 +689,12 @@ class MarketingPrice(BrowseAPIBaseContainer):
         if 'originalPrice' in price:
             self.originalPrice = ConvertedAmount(price['originalPrice'])
 
+    @cached_attribute
+    def discount_percentage_value(self):
+        """ Discount percentage as Decimal """
+
+        return to_decimal(self.discountPercentage)
+
 
 class PickupOptionSummary(BrowseAPIBaseContainer):
     """
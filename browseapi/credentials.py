@@ -0,0 +1,192 @@
+import time
+
+from base64 import b64encode
+
+from . import exceptions
+from .limiter import RateLimiter
+
+DAY = 86400
+
+
+class Credential(object):
+    """ eBay application keyset with its own application token, daily quota and request rate """
+
+    def __init__(self,
+                 app_id: str,
+                 cert_id: str,
+                 daily_quota: int = 5000,
+                 rate: float = None,
+                 burst: int = None,
+                 name: str = None):
+        """
+        Credential initialization
+
+        :param app_id: eBay developer client id
+        :param cert_id: ebay developer client secret
+        :param daily_quota: number of Browse API calls allowed per day for the application
+        :param rate: maximal number of requests per second, None for no limit
+        :param burst: maximal number of requests sent at once, see RateLimiter
+        :param name: keyset name in the statistics, app_id by default
+        """
+
+        if not app_id or not cert_id:
+            raise exceptions.BrowseAPIParamError('app_id or cert_id')
+
+        if daily_quota < 1:
+            raise exceptions.BrowseAPIParamError('daily_quota')
+
+        self.name = name or app_id
+        self.daily_quota = daily_quota
+        self.limiter = RateLimiter(rate, burst) if rate is not None else None
+
+        self.oauth_headers = {
+            'Authorization': 'Basic {}'.format(str(b64encode((app_id + ':' + cert_id).encode('utf8')))[2:-1]),
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+
+        self.token = None
+        self.token_expires = 0
+        self.token_lock = None
+
+        self.used = 0
+        self.failures = 0
+        self.suspensions = 0
+        self.suspended_until = 0
+        self._window_start = None
+
+    def remaining(self, now: float = None) -> int:
+        """ Number of calls left in the current day window """
+
+        now = time.monotonic() if now is None else now
+
+        if self._window_start is not None and now - self._window_start >= DAY:
+            self._window_start = None
+            self.used = 0
+
+        return self.daily_quota - self.used
+
+    def suspended(self, now: float = None) -> bool:
+        return (time.monotonic() if now is None else now) < self.suspended_until
+
+    def use(self, now: float = None) -> None:
+        """ Count a call, the day window starts with the first call """
+
+        now = time.monotonic() if now is None else now
+
+        if self._window_start is None:
+            self._window_start = now
+
+        self.used += 1
+
+    def reset_token(self) -> None:
+        self.token = None
+        self.token_expires = 0
+
+
+class CredentialPool(object):
+    """
+    Keysets shared by one client. Every request is sent with the available keyset with the most remaining
+    daily quota, keysets failing with access or OAuth errors are taken out of rotation for a while
+    """
+
+    # errors that take the keyset out of rotation
+
+    errors = (exceptions.BrowseAPIAccessError, exceptions.BrowseAPIRequestOAuthError, exceptions.BrowseAPIOAuthError)
+
+    def __init__(self, credentials: list, suspend_time: float = 60., max_suspend_time: float = 3600.):
+        """
+        Pool initialization
+
+        :param credentials: list of Credential instances
+        :param suspend_time: seconds the keyset is out of rotation after the first error,
+            doubled after every next error until a successful call
+        :param max_suspend_time: maximal suspension in seconds
+        """
+
+        self.credentials = list(credentials)
+
+        if not len(self.credentials):
+            raise exceptions.BrowseAPIParamError('credentials. At least one credential is required')
+
+        if len({credential.name for credential in self.credentials}) != len(self.credentials):
+            raise exceptions.BrowseAPIParamError('credentials. Credential names must be unique')
+
+        if not 0 < suspend_time <= max_suspend_time:
+            raise exceptions.BrowseAPIParamError('suspend_time or max_suspend_time')
+
+        self.suspend_time = suspend_time
+        self.max_suspend_time = max_suspend_time
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def __iter__(self):
+        return iter(self.credentials)
+
+    def choose(self) -> Credential:
+        """
+        Keyset for the next call, the call is counted in its quota. When all keysets are suspended
+        the one with the nearest end of suspension is used, the pool never stops sending requests
+
+        :return: Credential instance
+        """
+
+        now = time.monotonic()
+        available = [credential for credential in self.credentials if not credential.suspended(now)]
+
+        if len(available):
+            credential = max(available, key=lambda candidate: (
+                candidate.remaining(now), candidate.limiter.tokens if candidate.limiter is not None else 0
+            ))
+        else:
+            credential = min(self.credentials, key=lambda candidate: candidate.suspended_until)
+
+        credential.use(now)
+        return credential
+
+    def report(self, credential: Credential, error_class=None) -> None:
+        """
+        Register the outcome of the call
+
+        :param credential: keyset used for the call
+        :param error_class: exception class of the response error, None for successful calls
+        """
+
+        if error_class is None:
+            credential.failures = 0
+            return
+
+        if not issubclass(error_class, self.errors):
+            return
+
+        credential.failures += 1
+
+        # a single keyset stays in rotation, there is nothing to switch to
+
+        if len(self.credentials) > 1:
+            credential.suspensions += 1
+            credential.suspended_until = time.monotonic() + min(
+                self.max_suspend_time, self.suspend_time * 2 ** (credential.failures - 1)
+            )
+
+        # the token may be revoked
+
+        if issubclass(error_class, (exceptions.BrowseAPIRequestOAuthError, exceptions.BrowseAPIOAuthError)):
+            credential.reset_token()
+
+    def stats(self) -> dict:
+        """
+        Keyset statistics by name
+
+        :return: dictionary with used and remaining quota, failures, suspensions and suspension flag
+        """
+
+        now = time.monotonic()
+
+        return {credential.name: {
+            'used': credential.used,
+            'remaining': credential.remaining(now),
+            'failures': credential.failures,
+            'suspensions': credential.suspensions,
+            'suspended': credential.suspended(now)
+        } for credential in self.credentials}
@@ -0,0 +1,151 @@
+import zlib
+
+from . import exceptions
+
+MODES = ('inline', 'skip', 'zlib', 'zstd')
+
+
+class StoredText(object):
+    """ Compressed text kept out of the container fields, pickled in the compressed form """
+
+    __slots__ = ('data', 'codec')
+
+    def __init__(self, data: bytes, codec: str):
+        self.data = data
+        self.codec = codec
+
+    def __reduce__(self):
+        return self.__class__, (self.data, self.codec)
+
+    def text(self) -> str:
+        return decompress(self.codec, self.data).decode('utf8')
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    """
+    Decompress stored text
+
+    :param codec: 'zlib' or 'zstd'
+    :param data: compressed bytes
+    :return: raw bytes
+    """
+
+    if codec == 'zlib':
+        return zlib.decompress(data)
+
+    # decompressors are not thread-safe, items can be read from any thread
+
+    return _zstandard().ZstdDecompressor().decompress(data)
+
+
+def _zstandard():
+    try:
+        import zstandard
+
+    except ImportError:
+        raise exceptions.BrowseAPIParamError('mode. zstandard is required for zstd compression')
+
+    return zstandard
+
+
+class DescriptionStore(object):
+    """
+    Seller descriptions of the items kept out of the containers: dropped, truncated or compressed.
+    Compressed descriptions stay with their items and are freed with them, the description attribute
+    decompresses them on every access, to_dict restores the full text, pickled items keep them compressed
+    """
+
+    def __init__(self, mode: str = 'zlib', truncate: int = None, level: int = None, min_size: int = 1024):
+        """
+        Store initialization
+
+        :param mode: 'zlib', 'zstd' (pip install zstandard) to compress, 'skip' to drop descriptions
+            or 'inline' to keep them as plain text, only truncated
+        :param truncate: maximal number of characters kept, HTML markup may be cut in the middle
+        :param level: compression level, 6 for zlib and 3 for zstd by default
+        :param min_size: descriptions shorter than this number of bytes are kept as plain text
+        """
+
+        if mode not in MODES:
+            raise exceptions.BrowseAPIParamError('mode. Expected one of {}'.format(', '.join(MODES)))
+
+        if truncate is not None and truncate < 0:
+            raise exceptions.BrowseAPIParamError('truncate. It must not be negative')
+
+        self.mode = mode
+        self.truncate = truncate
+        self.min_size = min_size
+
+        self.count = 0
+        self.skipped = 0
+        self.truncated = 0
+        self.compressed = 0
+        self.raw_size = 0
+        self.stored_size = 0
+
+        if mode == 'zlib':
+            level = level if level is not None else 6
+            self._compress = lambda data: zlib.compress(data, level)
+
+        elif mode == 'zstd':
+            self._compress = _zstandard().ZstdCompressor(level=level if level is not None else 3).compress
+
+    def store(self, container) -> None:
+        """
+        Move the description of the item or get_item response out of line
+
+        :param container: Item or BrowseAPIResponse instance
+        """
+
+        attributes = container.__dict__
+        text = attributes.get('description')
+
+        if text is None:
+            return
+
+        data = text.encode('utf8')
+        self.count += 1
+        self.raw_size += len(data)
+
+        if self.mode == 'skip':
+            attributes['description'] = None
+            self.skipped += 1
+            return
+
+        if self.truncate is not None and len(text) > self.truncate:
+            text = text[:self.truncate]
+            data = text.encode('utf8')
+            self.truncated += 1
+
+        if self.mode != 'inline' and len(data) >= self.min_size:
+            compressed = self._compress(data)
+
+            # incompressible descriptions are kept as they are
+
+            if len(compressed) < len(data):
+                del attributes['description']
+                attributes['_description'] = StoredText(compressed, self.mode)
+                self.compressed += 1
+                self.stored_size += len(compressed)
+                return
+
+        attributes['description'] = text
+        self.stored_size += len(data)
+
+    def stats(self) -> dict:
+        """
+        Stored descriptions statistics
+
+        :return: dictionary with counts of descriptions, skipped, truncated and compressed ones,
+            raw and stored UTF-8 size in bytes and their ratio
+        """
+
+        return {
+            'descriptions': self.count,
+            'skipped': self.skipped,
+            'truncated': self.truncated,
+            'compressed': self.compressed,
+            'raw_size': self.raw_size,
+            'stored_size': self.stored_size,
+            'ratio': self.stored_size / self.raw_size if self.raw_size else None
+        }
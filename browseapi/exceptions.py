@@ -1,3 +1,5 @@
+from bisect import bisect_right
+
 from .containers import ErrorDetailV3
 
 
@@ -57,6 +59,11 @@ class BrowseAPIMethodError(BrowseAPIError):
     pass
 
 
+class BrowseAPIDeadlineError(BrowseAPIError):
+    def __init__(self, msg='Request deadline expired before sending'):
+        super().__init__(msg)
+
+
 class BrowseAPIInvalidUri(BrowseAPIRequestError):
     pass
 
@@ -95,3 +102,53 @@ class BrowseAPIRequestParamError(BrowseAPIResponseError):
 
 class BrowseAPIBusinessError(BrowseAPIResponseError):
     pass
+
+
+class BrowseAPIAbortError(BrowseAPIError):
+    """ Batch was stopped by the failure policy, remaining requests were cancelled """
+
+    def __init__(self, reason: str, error, results: list, msg='Requests aborted'):
+        super().__init__(msg)
+        self.reason = reason
+        self.error = error
+        self.results = results
+
+    def __str__(self):
+        return '{0}: {1}, error: {2}'.format(self.msg, self.reason, self.error)
+
+
+# errorId intervals with exception classes and categories, ids outside the intervals are unhandled,
+# for more information visit https://developer.ebay.com/api-docs/static/handling-error-messages.html
+
+ERROR_INTERVALS = (
+    (1001, 1004, BrowseAPIRequestOAuthError, 'oauth'),
+    (1100, 1100, BrowseAPIRequestOAuthError, 'oauth'),
+    (2001, 2004, BrowseAPIAccessError, 'access'),
+    (3001, 3005, BrowseAPIRoutingError, 'routing'),
+    (11000, 11000, BrowseAPIInternalError, 'internal'),
+    (11001, 11507, BrowseAPIRequestParamError, 'request_param'),
+    (12000, 12000, BrowseAPIInternalError, 'internal'),
+    (12001, 12007, BrowseAPIRequestParamError, 'request_param'),
+    (12013, 12013, BrowseAPIBusinessError, 'business'),
+    (12019, 12019, BrowseAPIBusinessError, 'business'),
+    (12023, 12506, BrowseAPIRequestParamError, 'request_param')
+)
+
+_interval_starts = [interval[0] for interval in ERROR_INTERVALS]
+
+
+def classify_error(error_id: int) -> tuple:
+    """
+    Exception class and category of the Browse API error
+
+    :param error_id: errorId from the response
+    :return: tuple with exception class or None for unhandled errors and category name
+    """
+
+    i = bisect_right(_interval_starts, error_id) - 1
+
+    if i >= 0 and error_id <= ERROR_INTERVALS[i][1]:
+        return ERROR_INTERVALS[i][2:]
+
+    return None, 'unhandled'
+
@@ -0,0 +1,173 @@
+import asyncio
+
+from urllib.parse import parse_qs, urlsplit
+
+from . import exceptions
+
+
+def item_group_id(item):
+    """
+    Item group id of the multi-variation listing
+
+    :param item: ItemSummary, Item or BrowseAPIResponse of get_item methods
+    :return: group id or None
+    """
+
+    group = getattr(item, 'primaryItemGroup', None)
+
+    if group is not None and group.itemGroupId is not None:
+        return group.itemGroupId
+
+    href = getattr(item, 'itemGroupHref', None)
+
+    if href is None:
+        return None
+
+    return parse_qs(urlsplit(href).query).get('item_group_id', (None,))[0]
+
+
+class GroupExpander(object):
+    """
+    Fetches item groups of multi-variation listings once per group with bounded concurrency
+    and attaches group items to the parent items as groupItems attribute
+    """
+
+    def __init__(self, concurrency: int = 10):
+        """
+        Expander initialization
+
+        :param concurrency: maximal number of group requests sent at the same time
+        """
+
+        if concurrency < 1:
+            raise exceptions.BrowseAPIParamError('concurrency')
+
+        self.concurrency = concurrency
+        self.errors = {}
+        self.requested = 0
+        self.reused = 0
+
+        self._groups = {}
+        self._semaphore = None
+        self._loop = None
+
+    def __len__(self):
+        return len(self._groups)
+
+    async def expand_response(self, api, response, pass_errors: bool = False):
+        """
+        Attach group items to all items of the response, groups are fetched concurrently
+
+        :param api: opened BrowseAPI instance
+        :param response: BrowseAPIResponse of any method returning items
+        :param pass_errors: failed group requests are saved to errors instead of raising
+        :return: response
+        """
+
+        if isinstance(response, Exception):
+            return response
+
+        items = getattr(response, 'itemSummaries', None) or getattr(response, 'items', None) or (response,)
+        items = [item for item in items if item_group_id(item) is not None]
+
+        await asyncio.gather(*[self.expand(api, item, pass_errors) for item in items])
+        return response
+
+    async def expand(self, api, item, pass_errors: bool = False) -> None:
+        """
+        Attach group items to the item
+
+        :param api: opened BrowseAPI instance
+        :param item: ItemSummary, Item or BrowseAPIResponse of get_item methods
+        :param pass_errors: failed group requests are saved to errors instead of raising
+        """
+
+        group_id = item_group_id(item)
+
+        if group_id is None:
+            return
+
+        try:
+            item.groupItems = await self._get_group(api, group_id)
+
+        except exceptions.BrowseAPIError as e:
+            if not pass_errors:
+                raise
+
+            self.errors[group_id] = e
+
+    async def expand_stream(self, api, responses, pass_errors: bool = False):
+        """
+        Expand responses from the iterable or async iterable as they arrive
+
+        :param api: opened BrowseAPI instance
+        :param responses: iterable or async iterable with BrowseAPIResponse instances
+        :param pass_errors: failed group requests are saved to errors instead of raising
+        :return: async generator of expanded responses in the order of completion
+        """
+
+        pending = set()
+
+        if hasattr(responses, '__aiter__'):
+            async for response in responses:
+                pending.add(asyncio.ensure_future(self.expand_response(api, response, pass_errors)))
+
+                for task in [task for task in pending if task.done()]:
+                    pending.remove(task)
+                    yield task.result()
+
+        else:
+            pending.update(asyncio.ensure_future(self.expand_response(api, response, pass_errors))
+                           for response in responses)
+
+        while len(pending):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                yield task.result()
+
+    async def _get_group(self, api, group_id: str) -> list:
+        """ Group items, every group is requested once, concurrent calls wait for the same request """
+
+        loop = asyncio.get_event_loop()
+        group = self._groups.get(group_id)
+
+        if isinstance(group, list):
+            self.reused += 1
+            return group
+
+        if group is not None and group.get_loop() is loop:
+            self.reused += 1
+            return await asyncio.shield(group)
+
+        future = loop.create_future()
+        self._groups[group_id] = future
+
+        try:
+            items = await self._fetch(api, group_id)
+
+        except BaseException as e:
+            del self._groups[group_id]
+
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()
+
+            raise
+
+        self._groups[group_id] = items
+        future.set_result(items)
+        return items
+
+    async def _fetch(self, api, group_id: str) -> list:
+        if self._loop is not asyncio.get_event_loop():
+            self._loop = asyncio.get_event_loop()
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            self.requested += 1
+            response = (await api.execute_async('get_items_by_item_group', [{'item_group_id': group_id}]))[0]
+
+        return getattr(response, 'items', [])
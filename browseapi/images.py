@@ -0,0 +1,95 @@
+import os
+import re
+
+from base64 import b64encode
+from io import BytesIO
+
+from . import exceptions
+
+MAX_PATH_LENGTH = 4096
+BASE64 = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+
+def is_path(image) -> bool:
+    """ Check whether the image argument is a path to the file """
+
+    if isinstance(image, os.PathLike):
+        return True
+
+    return isinstance(image, str) and len(image) < MAX_PATH_LENGTH and os.path.isfile(image)
+
+
+def read_image(image):
+    """
+    Get raw image data
+
+    :param image: path to the file, bytes, bytearray or memoryview
+    :return: bytes-like object
+    """
+
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return image
+
+    if is_path(image):
+        with open(image, 'rb') as file:
+            return file.read()
+
+    raise exceptions.BrowseAPIParamError('image. Expected base64 string, path, bytes or memoryview')
+
+
+def downscale(data, max_side: int) -> bytes:
+    """
+    Resize image so that its largest side is not greater than max_side, Pillow is required
+
+    :param data: raw image data
+    :param max_side: maximal side size in pixels
+    :return: raw image data
+    """
+
+    try:
+        from PIL import Image
+
+    except ImportError:
+        raise exceptions.BrowseAPIParamError('image_max_side. Pillow is required for image downscaling')
+
+    image = Image.open(BytesIO(data))
+
+    if max(image.size) <= max_side:
+        return data
+
+    image_format = image.format or 'JPEG'
+    image.thumbnail((max_side, max_side))
+    output = BytesIO()
+    image.save(output, format=image_format)
+    return output.getvalue()
+
+
+def image_body(image, max_side: int = None) -> bytes:
+    """
+    Build serialized json body for searchByImage request, base64 data is not escaped by json,
+    so the body is joined from parts without a json encoder
+
+    :param image: base64 encoded string, path to the file, bytes, bytearray or memoryview
+    :param max_side: maximal side size in pixels, None to send the image as is
+    :return: json body
+    """
+
+    if isinstance(image, str) and not is_path(image):
+        # wrapped base64 is joined, everything else would break the body
+
+        image = ''.join(image.split())
+
+        if not BASE64.fullmatch(image):
+            raise exceptions.BrowseAPIParamError('image. String is neither a path nor base64 encoded data')
+
+        encoded = image.encode('ascii')
+
+    else:
+        data = read_image(image)
+
+        if max_side is not None:
+            data = downscale(data, max_side)
+
+        encoded = b64encode(data)
+
+    return b''.join((b'{"image":"', encoded, b'"}'))
@@ -0,0 +1,315 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from . import exceptions
+
+
+class ItemIndex(object):
+    """
+    In-memory store of fetched items with hash indexes by item id, category, seller, condition, country
+    and a sorted price array for range queries. Can be updated incrementally as new pages arrive,
+    prices of new items are buffered and merged into the sorted array on the next price query
+    """
+
+    indexed_fields = ('category_id', 'seller', 'condition_id', 'country')
+
+    def __init__(self):
+        self._items = []
+        self._ids = {}
+        self._indexes = {field: {} for field in self.indexed_fields}
+        self._prices = array('d')
+        self._price_positions = array('q')
+        self._item_prices = {}
+        self._pending_prices = {}
+        self._stale_prices = {}
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, item_id: str):
+        return item_id in self._ids
+
+    def add(self, item) -> None:
+        """
+        Add item or replace the item with the same itemId
+
+        :param item: ItemSummary or Item container, or BrowseAPIResponse of get_item methods
+        """
+
+        item_id = getattr(item, 'itemId', None)
+
+        if item_id is None:
+            raise exceptions.BrowseAPIParamError('item. Item must have itemId')
+
+        position = self._ids.get(item_id)
+
+        if position is None:
+            position = len(self._items)
+            self._items.append(item)
+            self._ids[item_id] = position
+        else:
+            self._unindex(position)
+            self._items[position] = item
+
+        keys = self._item_keys(item)
+        self._keys[position] = keys
+
+        for field, values in keys.items():
+            index = self._indexes[field]
+
+            for value in values:
+                index.setdefault(value, set()).add(position)
+
+        price = self._item_price(item)
+
+        if price is not None:
+            self._pending_prices[position] = price
+            self._item_prices[position] = price
+
+    def add_response(self, response) -> None:
+        """
+        Add all items of the response, exceptions passed with pass_errors are skipped
+
+        :param response: BrowseAPIResponse of any method returning items
+        """
+
+        if isinstance(response, Exception):
+            return
+
+        if hasattr(response, 'itemSummaries'):
+            items = response.itemSummaries
+        elif hasattr(response, 'items'):
+            items = response.items
+        elif getattr(response, 'itemId', None) is not None:
+            items = (response,)
+        else:
+            items = ()
+
+        for item in items:
+            self.add(item)
+
+    def get(self, item_id: str):
+        """ Item by itemId or None """
+
+        position = self._ids.get(item_id)
+        return None if position is None else self._items[position]
+
+    def filter(self,
+               category_id: str = None,
+               seller: str = None,
+               condition_id: str = None,
+               country: str = None,
+               min_price: float = None,
+               max_price: float = None,
+               sort: str = None,
+               limit: int = None) -> list:
+        """
+        Find items by the indexed fields
+
+        :param category_id: category id, for item summaries any of the item categories
+        :param seller: seller username
+        :param condition_id: condition id
+        :param country: item location country code
+        :param min_price: minimal price value, inclusive
+        :param max_price: maximal price value, inclusive
+        :param sort: 'price' or '-price' for descending order, None to keep the order of addition
+        :param limit: maximal number of items to return
+        :return: list of items
+        """
+
+        if sort not in (None, 'price', '-price'):
+            raise exceptions.BrowseAPIParamError('sort. Only price and -price are supported')
+
+        # intersect hash index lookups starting from the smallest set
+
+        lookups = []
+
+        for field, value in zip(self.indexed_fields, (category_id, seller, condition_id, country)):
+            if value is not None:
+                lookups.append(self._indexes[field].get(str(value), set()))
+
+        candidates = None
+
+        for positions in sorted(lookups, key=len):
+            candidates = set(positions) if candidates is None else candidates & positions
+
+            if not len(candidates):
+                return []
+
+        price_range = min_price is not None or max_price is not None
+
+        if not price_range and sort is None:
+            positions = sorted(candidates) if candidates is not None else sorted(self._ids.values())
+            return [self._items[position] for position in positions[:limit]]
+
+        # walk the price range in the required order, stop at limit
+
+        start, end = self._price_slice(min_price, max_price)
+
+        if candidates is not None and len(candidates) < end - start:
+            positions = [position for position in candidates if position in self._item_prices
+                         and self._in_range(self._item_prices[position], min_price, max_price)]
+
+            if sort is None:
+                positions.sort()
+            else:
+                positions.sort(key=self._item_prices.__getitem__, reverse=sort == '-price')
+
+            return [self._items[position] for position in positions[:limit]]
+
+        order = range(end - 1, start - 1, -1) if sort == '-price' else range(start, end)
+        positions = []
+
+        for i in order:
+            position = self._price_positions[i]
+
+            if candidates is None or position in candidates:
+                positions.append(position)
+
+                if sort is not None and limit is not None and len(positions) == limit:
+                    break
+
+        if sort is None:
+            positions.sort()
+
+        return [self._items[position] for position in positions[:limit]]
+
+    def cheapest(self, n: int = 10) -> list:
+        """ N items with the lowest price """
+
+        self._merge_prices()
+        return [self._items[position] for position in self._price_positions[:n]]
+
+    def most_expensive(self, n: int = 10) -> list:
+        """ N items with the highest price """
+
+        self._merge_prices()
+        return [self._items[position] for position in reversed(self._price_positions[-n:])] if n else []
+
+    def values(self, field: str) -> list:
+        """ Distinct values of the indexed field """
+
+        if field not in self._indexes:
+            raise exceptions.BrowseAPIParamError('field. Available: {}'.format(', '.join(self.indexed_fields)))
+
+        return [value for value, positions in self._indexes[field].items() if len(positions)]
+
+    def _price_slice(self, min_price: float, max_price: float) -> tuple:
+        self._merge_prices()
+        start = 0 if min_price is None else bisect_left(self._prices, min_price)
+        end = len(self._prices) if max_price is None else bisect_right(self._prices, max_price)
+        return start, max(start, end)
+
+    def _unindex(self, position: int) -> None:
+        for field, values in self._keys.pop(position).items():
+            index = self._indexes[field]
+
+            for value in values:
+                index[value].discard(position)
+
+        # the price is dropped from the sorted array on the next merge
+
+        price = self._item_prices.pop(position, None)
+
+        if price is not None and self._pending_prices.pop(position, None) is None:
+            self._stale_prices[position] = price
+
+    def _merge_prices(self) -> None:
+        """
+        Apply buffered price changes to the sorted array in one pass. The array is copied in slices
+        between the changed places, so a merge costs one copy of the array and a binary search per change
+        """
+
+        if not len(self._pending_prices) and not len(self._stale_prices):
+            return
+
+        prices, positions = self._prices, self._price_positions
+
+        if len(self._stale_prices):
+            removed = []
+
+            for position, price in self._stale_prices.items():
+                i = bisect_left(prices, price)
+
+                while positions[i] != position:
+                    i += 1
+
+                removed.append(i)
+
+            prices, positions = self._copy_slices(prices, positions, sorted(removed))
+
+        if len(self._pending_prices):
+            added = sorted((price, position) for position, price in self._pending_prices.items())
+            places = [bisect_right(prices, price) for price, _ in added]
+            prices, positions = self._copy_slices(prices, positions, places, added)
+
+        self._prices, self._price_positions = prices, positions
+        self._pending_prices = {}
+        self._stale_prices = {}
+
+    @staticmethod
+    def _copy_slices(prices: array, positions: array, places: list, added: list = None) -> tuple:
+        """
+        Copy of the sorted arrays with the entries at the places removed
+        or with the added entries inserted before the places
+
+        :param prices: sorted prices
+        :param positions: item positions of the prices
+        :param places: ascending indexes in the arrays
+        :param added: sorted (price, position) tuples, one per place, None to remove the entries
+        :return: new prices and positions arrays
+        """
+
+        new_prices, new_positions = array('d'), array('q')
+        start = 0
+
+        for j, i in enumerate(places):
+            new_prices.extend(prices[start:i])
+            new_positions.extend(positions[start:i])
+
+            if added is None:
+                start = i + 1
+                continue
+
+            new_prices.append(added[j][0])
+            new_positions.append(added[j][1])
+            start = i
+
+        new_prices.extend(prices[start:])
+        new_positions.extend(positions[start:])
+        return new_prices, new_positions
+
+    @staticmethod
+    def _in_range(price: float, min_price: float, max_price: float) -> bool:
+        return (min_price is None or price >= min_price) and (max_price is None or price <= max_price)
+
+    @staticmethod
+    def _item_keys(item) -> dict:
+        """ Values of the indexed fields, every field can have many values """
+
+        if getattr(item, 'categoryId', None) is not None:
+            categories = (item.categoryId,)
+        else:
+            categories = tuple(category.categoryId for category in getattr(item, 'categories', ()))
+
+        seller = getattr(item, 'seller', None)
+        location = getattr(item, 'itemLocation', None)
+
+        keys = {
+            'category_id': categories,
+            'seller': (seller.username,) if seller is not None and seller.username is not None else (),
+            'condition_id': (item.conditionId,) if getattr(item, 'conditionId', None) is not None else (),
+            'country': (location.country,) if location is not None and location.country is not None else ()
+        }
+
+        return {field: tuple(str(value) for value in values) for field, values in keys.items()}
+
+    @staticmethod
+    def _item_price(item):
+        price = getattr(item, 'price', None)
+
+        if price is None:
+            return None
+
+        return price.float_value
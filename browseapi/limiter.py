@@ -0,0 +1,247 @@
+import asyncio
+import time
+
+from collections import deque
+
+from . import exceptions
+from .metrics import percentile
+
+
+class AdaptiveLimiter(object):
+    """
+    Concurrency limiter with additive increase / multiplicative decrease (AIMD) of the limit.
+    The limit grows while latency and error rate stay healthy and drops on timeouts and throttling
+    """
+
+    def __init__(self,
+                 initial_limit: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 100,
+                 increase: int = 1,
+                 backoff: float = 0.5,
+                 latency_target: float = 2.0,
+                 max_error_rate: float = 0.05,
+                 window: int = 100):
+        """
+        Limiter initialization
+
+        :param initial_limit: number of concurrent requests at start
+        :param min_limit: the limit never goes below this value
+        :param max_limit: the limit never goes above this value
+        :param increase: value added to the limit after every healthy round of requests
+        :param backoff: multiplier applied to the limit on failure, between 0 and 1
+        :param latency_target: p95 latency in seconds considered healthy, None to ignore latency
+        :param max_error_rate: share of failed requests in the window considered healthy
+        :param window: number of the latest requests used for latency and error rate estimation
+        """
+
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise exceptions.BrowseAPIParamError('initial_limit, min_limit or max_limit')
+
+        if not 0 < backoff < 1:
+            raise exceptions.BrowseAPIParamError('backoff. It must be between 0 and 1')
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+
+        self._limit = initial_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._cooldown = 0
+        self._saturated = False
+        self._waiters = deque()
+        self._latencies = deque(maxlen=window)
+        self._failures = deque(maxlen=window)
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def has_capacity(self) -> bool:
+        return self._in_flight < self._limit
+
+    @property
+    def backing_off(self) -> bool:
+        """ The limit was decreased recently or the error rate is above the healthy one """
+
+        return self._cooldown > 0 or self.error_rate() > self.max_error_rate
+
+    def try_acquire(self) -> bool:
+        """ Take a slot if the limit allows it """
+
+        if not self.has_capacity:
+            self._saturated = True
+            return False
+
+        self._in_flight += 1
+
+        if self._in_flight == self._limit:
+            self._saturated = True
+
+        return True
+
+    async def acquire(self) -> None:
+        """ Wait for a free slot, slots are given in the order of arrival """
+
+        if not self._waiters and self.try_acquire():
+            return
+
+        retry = False
+
+        while True:
+            waiter = asyncio.get_event_loop().create_future()
+
+            # a woken waiter that lost the slot keeps its place in the queue
+
+            if retry:
+                self._waiters.appendleft(waiter)
+            else:
+                self._waiters.append(waiter)
+
+            try:
+                await waiter
+
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    self._wake()
+
+                raise
+
+            if self.try_acquire():
+                return
+
+            retry = True
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        """
+        Return a slot and adjust the limit
+
+        :param latency: request duration in seconds
+        :param failed: request timed out or was throttled
+        """
+
+        self._in_flight -= 1
+        self._latencies.append(latency)
+        self._failures.append(failed)
+
+        if self._cooldown:
+            self._cooldown -= 1
+
+        if failed:
+            self._on_failure()
+        else:
+            self._on_success()
+
+        self._wake()
+
+    def discard(self) -> None:
+        """ Return an unused slot without affecting the limit """
+
+        self._in_flight -= 1
+        self._wake()
+
+    def error_rate(self) -> float:
+        """ Share of failed requests in the window """
+
+        return sum(self._failures) / len(self._failures) if len(self._failures) else 0.
+
+    def _on_failure(self) -> None:
+        # requests sent before the previous decrease do not decrease the limit again
+
+        if self._cooldown:
+            return
+
+        self._limit = max(self.min_limit, int(self._limit * self.backoff))
+        self._cooldown = self._in_flight
+        self._successes = 0
+        self._saturated = False
+
+    def _on_success(self) -> None:
+        self._successes += 1
+
+        if self._successes < self._limit:
+            return
+
+        self._successes = 0
+
+        if not self._saturated or self.error_rate() > self.max_error_rate:
+            return
+
+        if self.latency_target is not None and percentile(self._latencies, 95) > self.latency_target:
+            return
+
+        self._limit = min(self.max_limit, self._limit + self.increase)
+        self._saturated = False
+
+    def _wake(self) -> None:
+        """ Wake up as many waiters as there are free slots """
+
+        for _ in range(min(self._limit - self._in_flight, len(self._waiters))):
+            waiter = self._waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+class RateLimiter(object):
+    """ Token bucket limiting the number of requests per second """
+
+    def __init__(self, rate: float, burst: int = None):
+        """
+        Limiter initialization
+
+        :param rate: average number of requests per second
+        :param burst: maximal number of requests sent at once after a pause, rate rounded up by default
+        """
+
+        if rate <= 0:
+            raise exceptions.BrowseAPIParamError('rate. It must be positive')
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(-(-rate // 1)))
+
+        if self.burst < 1:
+            raise exceptions.BrowseAPIParamError('burst')
+
+        self._tokens = float(self.burst)
+        self._updated = None
+
+    @property
+    def tokens(self) -> float:
+        """ Number of requests that can be sent without waiting """
+
+        self._refill()
+        return self._tokens
+
+    async def acquire(self) -> None:
+        """ Wait for a token, tokens are reserved in the order of calls """
+
+        self._refill()
+        self._tokens -= 1
+
+        if self._tokens < 0:
+            try:
+                await asyncio.sleep(-self._tokens / self.rate)
+
+            except asyncio.CancelledError:
+                self._tokens += 1
+                raise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+
+        self._updated = now
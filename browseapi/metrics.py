@@ -0,0 +1,105 @@
+from collections import defaultdict, deque
+from math import ceil
+
+
+def percentile(values, percent: float):
+    """
+    Nearest-rank percentile
+
+    :param values: iterable with numbers
+    :param percent: percentile in range (0, 100]
+    :return: percentile value or None for empty values
+    """
+
+    values = sorted(values)
+
+    if not len(values):
+        return None
+
+    return values[max(int(ceil(percent / 100 * len(values))) - 1, 0)]
+
+
+class Metrics(object):
+    """ In-process metrics registry with counters, gauges and sample series """
+
+    def __init__(self, samples: int = 1000):
+        """
+        Metrics initialization
+
+        :param samples: number of the latest observations kept for every sample series
+        """
+
+        self._samples = samples
+        self._gauges = {}
+        self._series = {}
+        self.counters = defaultdict(int)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """ Increase counter by value """
+
+        self.counters[name] += value
+
+    def gauge(self, name: str, value) -> None:
+        """
+        Set gauge value
+
+        :param name: gauge name
+        :param value: number or callable without arguments, called on every read
+        """
+
+        self._gauges[name] = value
+
+    def read_gauge(self, name: str):
+        """ Current gauge value or None """
+
+        value = self._gauges.get(name)
+        return value() if callable(value) else value
+
+    def observe(self, name: str, value: float) -> None:
+        """ Add observation to the sample series """
+
+        if name not in self._series:
+            self._series[name] = deque(maxlen=self._samples)
+
+        self._series[name].append(value)
+
+    def samples(self, name: str) -> list:
+        """ Latest observations of the sample series """
+
+        return list(self._series.get(name, ()))
+
+    def percentile(self, name: str, percent: float):
+        """ Percentile of the sample series or None if there are no observations """
+
+        return percentile(self._series.get(name, ()), percent)
+
+    def group(self, prefix: str) -> dict:
+        """
+        Counters with the common prefix, like errors.<errorId>
+
+        :param prefix: counter name prefix without the trailing dot
+        :return: dictionary with name suffixes and values
+        """
+
+        prefix += '.'
+        return {name[len(prefix):]: value for name, value in self.counters.items() if name.startswith(prefix)}
+
+    def snapshot(self) -> dict:
+        """
+        Collect all metrics
+
+        :return: dictionary with counters, gauges and p50/p95/p99 of every sample series
+        """
+
+        return {
+            'counters': dict(self.counters),
+            'gauges': {name: self.read_gauge(name) for name in self._gauges},
+            'series': {
+                name: {
+                    'count': len(series),
+                    'p50': percentile(series, 50),
+                    'p95': percentile(series, 95),
+                    'p99': percentile(series, 99)
+                } for name, series in self._series.items()
+            }
+        }
@@ -0,0 +1,288 @@
+import asyncio
+
+from collections import namedtuple
+
+from . import exceptions
+from .sweep import Sweep
+
+# eBay returns at most 10000 items of one query, offset + limit must not exceed it
+MAX_RESULTS = 10000
+
+# leaf query of the plan, total is the number of matching items reported by eBay
+Partition = namedtuple('Partition', ('params', 'total'))
+
+
+def split_filter(value: str) -> dict:
+    """
+    Split search filter into fields, commas inside brackets and braces are kept
+
+    :param value: filter string like 'price:[10..50],priceCurrency:USD'
+    :return: dictionary of field values by field name in the original order
+    """
+
+    value = (value or '') + ','
+    fields = {}
+    depth = 0
+    start = 0
+
+    for i, char in enumerate(value):
+        if char in '[{':
+            depth += 1
+        elif char in ']}':
+            depth -= 1
+        elif char == ',' and not depth:
+            field = value[start:i].strip()
+            start = i + 1
+
+            if field:
+                name, _, field_value = field.partition(':')
+                fields[name.strip()] = field_value.strip()
+
+    return fields
+
+
+def join_filter(fields: dict) -> str:
+    """ Search filter string from the fields dictionary """
+
+    return ','.join('{}:{}'.format(name, value) for name, value in fields.items())
+
+
+class SearchPartitioner(object):
+    """
+    Splits search queries matching more items than eBay returns into disjoint sub-queries
+    by categories, conditions and price ranges, then fetches all pages of the sub-queries
+    concurrently. Items matching several sub-queries are dropped by itemId with Sweep
+    """
+
+    strategies = ('category', 'condition', 'price')
+
+    def __init__(self,
+                 cap: int = MAX_RESULTS,
+                 strategies: tuple = strategies,
+                 currency: str = 'USD',
+                 page_size: int = 200,
+                 max_depth: int = 30):
+        """
+        Partitioner initialization
+
+        :param cap: maximal number of items returned for one query
+        :param strategies: split methods in the order of preference, a distribution split is used only
+            when match counts of the categories or conditions cover the whole query
+        :param currency: currency of the price ranges
+        :param page_size: limit of the page requests
+        :param max_depth: maximal number of splits of one query
+        """
+
+        if cap < 1:
+            raise exceptions.BrowseAPIParamError('cap')
+
+        if not 1 <= page_size <= 200:
+            raise exceptions.BrowseAPIParamError('page_size. Must be from 1 to 200')
+
+        for strategy in strategies:
+            if strategy not in self.strategies:
+                raise exceptions.BrowseAPIParamError('strategies. Available: {}'.format(', '.join(self.strategies)))
+
+        self.cap = cap
+        self.strategies = tuple(strategies)
+        self.currency = currency
+        self.page_size = page_size
+        self.max_depth = max_depth
+
+        self.probes = 0
+        self.partitions = []
+        self.truncated = []
+
+    async def plan(self, api, params: dict, **kwargs) -> list:
+        """
+        Split the query until every part fits under the cap, queries of one level are probed concurrently
+
+        :param api: opened BrowseAPI instance
+        :param params: search params dictionary
+        :param kwargs: other keyword arguments of BrowseAPI.execute_async for the probe requests
+        :return: list of Partition tuples
+        """
+
+        return [partition async for partition in self._walk(api, params, kwargs)]
+
+    async def harvest(self, api, params: dict, sweep: Sweep = None, **kwargs) -> list:
+        """
+        Fetch all items of the query. Pages of the planned parts are requested as soon as the part is found,
+        while other parts are still being split
+
+        :param api: opened BrowseAPI instance
+        :param params: search params dictionary
+        :param sweep: Sweep instance for deduplication, new one by default
+        :param kwargs: other keyword arguments of BrowseAPI.execute_async, like priority, policy or sink
+        :return: list of unique ItemSummary containers, empty if responses are written to the sink
+        """
+
+        sweep = sweep if sweep is not None else Sweep(self.cap)
+        fetches = []
+
+        try:
+            async for partition in self._walk(api, params, kwargs):
+                fetches.append(asyncio.ensure_future(api.execute_async(
+                    'search', self.pages(partition), sweep=sweep, **kwargs
+                )))
+
+            pages = await asyncio.gather(*fetches)
+
+        except BaseException:
+            for fetch in fetches:
+                fetch.cancel()
+
+            await asyncio.gather(*fetches, return_exceptions=True)
+            raise
+
+        return [item for responses in pages for response in responses
+                for item in getattr(response, 'itemSummaries', ())]
+
+    def pages(self, partition: Partition) -> list:
+        """
+        Page params of the partition
+
+        :param partition: Partition tuple
+        :return: list of search params dictionaries
+        """
+
+        return [dict(partition.params, offset=offset, limit=min(self.page_size, self.cap - offset))
+                for offset in range(0, min(partition.total, self.cap), self.page_size)]
+
+    def stats(self) -> dict:
+        """
+        Planning statistics
+
+        :return: dictionary with numbers of probes, partitions, truncated partitions and planned items
+        """
+
+        return {
+            'probes': self.probes,
+            'partitions': len(self.partitions),
+            'truncated': len(self.truncated),
+            'planned': sum(min(partition.total, self.cap) for partition in self.partitions)
+        }
+
+    async def _walk(self, api, params: dict, kwargs: dict):
+        """ Breadth-first splitting, yields partitions as they are found """
+
+        # probe responses are not written to the sink
+
+        kwargs = {name: value for name, value in kwargs.items() if name != 'sink'}
+        level = [dict(params)]
+        depth = 0
+
+        while len(level):
+            responses = await api.execute_async('search', [self._probe(node) for node in level], **kwargs)
+            self.probes += len(level)
+            next_level = []
+
+            for node, response in zip(level, responses):
+                total = getattr(response, 'total', None) or 0
+
+                if total <= self.cap:
+                    yield self._add(node, total)
+                    continue
+
+                children = self._split(node, response, total) if depth < self.max_depth else None
+
+                if children is None:
+                    partition = self._add(node, total)
+                    self.truncated.append(partition)
+                    yield partition
+                    continue
+
+                for child, count in children:
+                    # children with the known match count are not probed again
+
+                    if count is not None and count <= self.cap:
+                        if count:
+                            yield self._add(child, count)
+                    else:
+                        next_level.append(child)
+
+            level = next_level
+            depth += 1
+
+    def _add(self, params: dict, total: int) -> Partition:
+        partition = Partition(params, total)
+        self.partitions.append(partition)
+        return partition
+
+    def _probe(self, params: dict) -> dict:
+        """ Search params returning only the total and the refinements needed for the split """
+
+        fieldgroups = ['MATCHING_ITEMS']
+
+        if 'category' in self.strategies and not params.get('category_ids'):
+            fieldgroups.append('CATEGORY_REFINEMENTS')
+
+        if 'condition' in self.strategies and 'conditionIds' not in split_filter(params.get('filter')):
+            fieldgroups.append('CONDITION_REFINEMENTS')
+
+        return dict(params, limit=1, offset=0, fieldgroups=','.join(fieldgroups))
+
+    def _split(self, params: dict, response, total: int):
+        """ Sub-queries with match counts if known, None if the query can not be split """
+
+        refinement = getattr(response, 'refinement', None)
+        fields = split_filter(params.get('filter'))
+
+        for strategy in self.strategies:
+            if strategy == 'category' and not params.get('category_ids'):
+                distributions = getattr(refinement, 'categoryDistributions', ())
+
+                if self._covers(distributions, total):
+                    return [(dict(params, category_ids=distribution.categoryId), distribution.matchCount)
+                            for distribution in distributions]
+
+            elif strategy == 'condition' and 'conditionIds' not in fields:
+                distributions = getattr(refinement, 'conditionDistributions', ())
+
+                if self._covers(distributions, total):
+                    return [(self._with_filter(params, fields, conditionIds='{%s}' % distribution.conditionId),
+                             distribution.matchCount) for distribution in distributions]
+
+            elif strategy == 'price':
+                children = self._split_price(params, fields)
+
+                if children is not None:
+                    return children
+
+        return None
+
+    def _split_price(self, params: dict, fields: dict):
+        """ Halves of the price range in cents, open range is split at ten times its lower bound """
+
+        low, high = 0, None
+
+        if 'price' in fields:
+            bounds = fields['price'].strip('[]').split('..')
+            low = round(float(bounds[0]) * 100) if bounds[0] else 0
+            high = round(float(bounds[1]) * 100) if len(bounds) > 1 and bounds[1] else None
+
+        if high is None:
+            middle = max(low * 10, 1000)
+        elif high - low >= 1:
+            middle = (low + high) // 2
+        else:
+            return None
+
+        return [
+            (self._with_price(params, fields, low, middle), None),
+            (self._with_price(params, fields, middle + 1, high), None)
+        ]
+
+    def _with_price(self, params: dict, fields: dict, low: int, high: int) -> dict:
+        price = '[{:.2f}..{}]'.format(low / 100, '' if high is None else '{:.2f}'.format(high / 100))
+        return self._with_filter(params, fields, price=price, priceCurrency=fields.get('priceCurrency', self.currency))
+
+    @staticmethod
+    def _with_filter(params: dict, fields: dict, **values) -> dict:
+        return dict(params, filter=join_filter(dict(fields, **values)))
+
+    @staticmethod
+    def _covers(distributions, total: int) -> bool:
+        """ Distribution has several values and their counts are not less than the total """
+
+        return len(distributions) > 1 and sum(distribution.matchCount or 0 for distribution in distributions) >= total
@@ -0,0 +1,250 @@
+import asyncio
+import time
+
+from . import exceptions
+from .metrics import Metrics
+
+_STOP = object()
+
+
+class Stage(object):
+    """ Pipeline stage calling one Browse API method with its own concurrency and input queue """
+
+    def __init__(self,
+                 method: str,
+                 params=None,
+                 concurrency: int = 10,
+                 queue_size: int = 100,
+                 pass_errors: bool = False,
+                 name: str = None,
+                 **kwargs):
+        """
+        Stage initialization
+
+        :param method: Browse API method name in lowercase
+        :param params: callable with the response of the previous stage argument,
+            returns list of params dictionaries for this stage, not used in the first stage
+        :param concurrency: number of requests of the stage sent at the same time
+        :param queue_size: maximal number of params dictionaries waiting in the stage queue
+        :param pass_errors: failed requests are counted and dropped instead of stopping the pipeline
+        :param name: stage name in the statistics, method name by default
+        :param kwargs: other keyword arguments of BrowseAPI.execute_async, like priority or sweep
+        """
+
+        if concurrency < 1:
+            raise exceptions.BrowseAPIParamError('concurrency')
+
+        self.method = method
+        self.params = params
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.pass_errors = pass_errors
+        self.name = name or method
+        self.kwargs = kwargs
+
+        self.processed = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.queue = None
+        self.started = None
+        self.finished = None
+
+    def stats(self) -> dict:
+        """
+        Stage statistics
+
+        :return: dictionary with processed and failed requests, requests in flight, queue depth and throughput
+        """
+
+        elapsed = ((self.finished or time.monotonic()) - self.started) if self.started is not None else 0.
+
+        return {
+            'processed': self.processed,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'depth': self.queue.qsize() if self.queue is not None else 0,
+            'throughput': self.processed / elapsed if elapsed else 0.
+        }
+
+
+class Pipeline(object):
+    """
+    Chain of Browse API methods connected by bounded queues. Responses of every stage are turned
+    into params of the next one as soon as they arrive, so all stages work at the same time
+    """
+
+    def __init__(self, api):
+        """
+        Pipeline initialization
+
+        :param api: opened BrowseAPI instance
+        """
+
+        self.api = api
+        self.stages = []
+        self.metrics = Metrics()
+
+    def stage(self, method: str, params=None, **kwargs):
+        """
+        Add stage, arguments are the same as for Stage
+
+        :return: pipeline
+        """
+
+        if method not in self.api.supported_methods:
+            raise exceptions.BrowseAPIMethodError('This method is not supported: {}'.format(method))
+
+        if len(self.stages) and params is None:
+            raise exceptions.BrowseAPIParamError('params. Stages after the first one require params callable')
+
+        stage = Stage(method, params, **kwargs)
+
+        if stage.name in [other.name for other in self.stages]:
+            raise exceptions.BrowseAPIParamError('name. Stage names must be unique')
+
+        self.stages.append(stage)
+        self.metrics.gauge('depth.' + stage.name, lambda: stage.queue.qsize() if stage.queue is not None else 0)
+        self.metrics.gauge('in_flight.' + stage.name, lambda: stage.in_flight)
+        return self
+
+    def stats(self) -> dict:
+        """ Statistics of all stages by stage name """
+
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    async def run(self, params):
+        """
+        Run the pipeline
+
+        :param params: iterable with params dictionaries of the first stage
+        :return: async generator of (params, response) tuples of the last stage in the order of completion
+        """
+
+        if not len(self.stages):
+            raise exceptions.BrowseAPIParamError('stages. Pipeline has no stages')
+
+        output = asyncio.Queue(maxsize=self.stages[-1].queue_size)
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+
+        for stage, stage_queue in zip(self.stages, queues):
+            stage.queue = stage_queue
+            stage.started = time.monotonic()
+            stage.finished = None
+
+        tasks = [asyncio.ensure_future(self._feed(params, queues[0], self.stages[0].concurrency))]
+
+        for i, stage in enumerate(self.stages):
+            next_queue = queues[i + 1] if i + 1 < len(self.stages) else output
+            next_stage = self.stages[i + 1] if i + 1 < len(self.stages) else None
+            tasks.append(asyncio.ensure_future(self._run_stage(stage, next_queue, next_stage)))
+
+        getter = None
+
+        try:
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(output.get())
+
+                running = [task for task in tasks if not task.done()]
+                done, _ = await asyncio.wait([getter] + running, return_when=asyncio.FIRST_COMPLETED)
+
+                # the first failed stage stops the pipeline
+
+                for task in done:
+                    if task is not getter and task.exception() is not None:
+                        raise task.exception()
+
+                if not getter.done():
+                    continue
+
+                result = getter.result()
+                getter = None
+
+                if result is _STOP:
+                    break
+
+                yield result
+
+        finally:
+            for task in tasks + ([getter] if getter is not None else []):
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def collect(self, params) -> list:
+        """
+        Run the pipeline and collect results
+
+        :param params: iterable with params dictionaries of the first stage
+        :return: list of (params, response) tuples of the last stage
+        """
+
+        return [result async for result in self.run(params)]
+
+    @staticmethod
+    async def _feed(params, queue: asyncio.Queue, workers: int) -> None:
+        for param in params:
+            await queue.put(param)
+
+        for _ in range(workers):
+            await queue.put(_STOP)
+
+    async def _run_stage(self, stage: Stage, next_queue: asyncio.Queue, next_stage: Stage) -> None:
+        workers = [asyncio.ensure_future(self._work(stage, next_queue, next_stage)) for _ in range(stage.concurrency)]
+
+        try:
+            await asyncio.gather(*workers)
+
+        finally:
+            # workers are stopped together with the failed one
+
+            for worker in workers:
+                worker.cancel()
+
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        stage.finished = time.monotonic()
+
+        for _ in range(next_stage.concurrency if next_stage is not None else 1):
+            await next_queue.put(_STOP)
+
+    async def _work(self, stage: Stage, next_queue: asyncio.Queue, next_stage: Stage) -> None:
+        while True:
+            param = await stage.queue.get()
+
+            if param is _STOP:
+                return
+
+            stage.in_flight += 1
+
+            try:
+                responses = await self.api.execute_async(stage.method, [param], stage.pass_errors, **stage.kwargs)
+
+            finally:
+                stage.in_flight -= 1
+
+            for response in responses:
+                # detail requests skipped by the sweep, written responses of sink stages are passed on
+
+                if response is None and stage.kwargs.get('sink') is None:
+                    continue
+
+                if isinstance(response, Exception) or hasattr(response, 'errors'):
+                    stage.errors += 1
+                    self.metrics.increment('errors.' + stage.name)
+                    continue
+
+                stage.processed += 1
+                self.metrics.increment('processed.' + stage.name)
+
+                if next_stage is None:
+                    await next_queue.put((param, response))
+                    continue
+
+                # written responses have nothing for the next stage
+
+                if response is None:
+                    continue
+
+                for next_param in next_stage.params(response):
+                    await next_queue.put(next_param)
@@ -0,0 +1,107 @@
+from . import exceptions
+
+
+class FailurePolicy(object):
+    """
+    Rules for stopping a batch of requests early, remaining requests are cancelled
+    as soon as one of the rules is triggered
+    """
+
+    def __init__(self,
+                 fatal: tuple = (exceptions.BrowseAPIRequestOAuthError, exceptions.BrowseAPIAccessError),
+                 transient: tuple = (2001,),
+                 max_errors: int = None,
+                 max_error_rate: float = None,
+                 min_requests: int = 20):
+        """
+        Policy initialization
+
+        :param fatal: exception classes after which the rest of the batch is cancelled immediately
+        :param transient: errorIds which are never fatal, like 2001 of the throttled requests,
+            they are still counted by the error limits
+        :param max_errors: number of failed requests after which the batch is stopped, None to disable
+        :param max_error_rate: share of failed requests in range (0, 1] after which the batch is stopped,
+            None to disable
+        :param min_requests: number of completed requests before the error rate is checked
+        """
+
+        if max_errors is not None and max_errors < 1:
+            raise exceptions.BrowseAPIParamError('max_errors')
+
+        if max_error_rate is not None and not 0 < max_error_rate <= 1:
+            raise exceptions.BrowseAPIParamError('max_error_rate. It must be in range (0, 1]')
+
+        self.fatal = tuple(fatal)
+        self.transient = tuple(transient)
+        self.max_errors = max_errors
+        self.max_error_rate = max_error_rate
+        self.min_requests = min_requests
+
+    @staticmethod
+    def error_class(result):
+        """
+        Error class of the request result
+
+        :param result: exception, json response or BrowseAPIResponse
+        :return: exception class of the first error or None for successful results
+        """
+
+        error = _first_error(result)
+
+        if error is None or isinstance(error, BaseException):
+            return type(error) if error is not None else None
+
+        error_id = error['errorId'] if isinstance(error, dict) else error.errorId
+        return exceptions.classify_error(error_id)[0] or exceptions.BrowseAPIError
+
+    @staticmethod
+    def error_id(result):
+        """
+        errorId of the request result
+
+        :param result: exception, json response or BrowseAPIResponse
+        :return: errorId of the first error, None for successful results and errors without it
+        """
+
+        error = _first_error(result)
+
+        if error is None or isinstance(error, BaseException):
+            return getattr(getattr(error, 'error', None), 'errorId', None)
+
+        return error['errorId'] if isinstance(error, dict) else error.errorId
+
+    def abort_reason(self, error_class, errors: int, completed: int, error_id: int = None):
+        """
+        Check the rules after a completed request
+
+        :param error_class: error class of the completed request or None
+        :param errors: number of failed requests including the completed one
+        :param completed: number of completed requests
+        :param error_id: errorId of the completed request, if known
+        :return: reason string if the batch must be stopped, None otherwise
+        """
+
+        if error_class is None:
+            return None
+
+        if issubclass(error_class, self.fatal) and error_id not in self.transient:
+            return 'fatal error'
+
+        if self.max_errors is not None and errors >= self.max_errors:
+            return 'error limit'
+
+        if self.max_error_rate is not None and completed >= self.min_requests \
+                and errors / completed > self.max_error_rate:
+            return 'error rate'
+
+        return None
+
+
+def _first_error(result):
+    """ The result itself if it is an exception, otherwise the first error of the response or None """
+
+    if isinstance(result, BaseException):
+        return result
+
+    errors = result.get('errors') if isinstance(result, dict) else getattr(result, 'errors', None)
+    return errors[0] if errors else None
@@ -0,0 +1,226 @@
+import asyncio
+import ast
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from collections import defaultdict
+
+from . import containers
+from .metrics import percentile
+
+PHASES = ('queue', 'network', 'parse', 'callbacks')
+
+
+class Profiler(object):
+    """
+    Low-overhead breakdown of one execute call: wall time of the request phases, CPU time of the event loop
+    thread, event loop lag, optional tracemalloc statistics of the containers and stack samples
+    of the event loop thread in the folded format of flamegraph.pl, speedscope and inferno
+    """
+
+    def __init__(self, memory: bool = False, sample_interval: float = 0.005, lag_interval: float = 0.01):
+        """
+        Profiler initialization
+
+        :param memory: trace allocations with tracemalloc, slows parsing down noticeably
+        :param sample_interval: seconds between stack samples, None to disable sampling
+        :param lag_interval: seconds between event loop lag probes, None to disable
+        """
+
+        self.memory = memory
+        self.sample_interval = sample_interval
+        self.lag_interval = lag_interval
+
+        self.wall = dict.fromkeys(PHASES, 0.)
+        self.cpu = dict.fromkeys(PHASES, 0.)
+        self.counts = dict.fromkeys(PHASES, 0)
+        self.lags = []
+        self.stacks = defaultdict(int)
+        self.allocations = {}
+        self.elapsed = 0.
+        self.loop_cpu = 0.
+        self.peak_memory = None
+
+        self._started = None
+        self._cpu_started = None
+        self._lag_task = None
+        self._sampler = None
+        self._stop = threading.Event()
+        self._tracing = False
+
+    def start(self) -> None:
+        """ Start measuring, must be called in the event loop thread """
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+        if self.sample_interval is not None:
+            self._sampler = threading.Thread(
+                target=self._sample, args=(threading.get_ident(),), name='browseapi-profiler', daemon=True
+            )
+
+            self._sampler.start()
+
+        if self.lag_interval is not None:
+            self._lag_task = asyncio.ensure_future(self._probe_lag())
+
+        self._started = time.perf_counter()
+        self._cpu_started = time.thread_time()
+
+    async def stop(self) -> None:
+        """ Stop measuring and collect memory statistics """
+
+        self.elapsed = time.perf_counter() - self._started
+        self.loop_cpu = time.thread_time() - self._cpu_started
+
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            await asyncio.gather(self._lag_task, return_exceptions=True)
+
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+
+        if self.memory:
+            self.allocations = container_allocations(tracemalloc.take_snapshot())
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+
+            if self._tracing:
+                tracemalloc.stop()
+
+    def add(self, phase: str, wall: float, cpu: float = 0.) -> None:
+        """
+        Add phase measurement of one request
+
+        :param phase: phase name: queue, network, parse or callbacks
+        :param wall: wall time in seconds
+        :param cpu: CPU time of the event loop thread in seconds, measured only for the synchronous parse phase
+        """
+
+        self.wall[phase] += wall
+        self.cpu[phase] += cpu
+        self.counts[phase] += 1
+
+    def report(self) -> dict:
+        """
+        Structured report. Wall time of the phases is summed over concurrent requests, so it can
+        exceed the elapsed time. CPU time is measured only for parsing, the rest of the loop CPU time
+        is response decoding, callbacks and event loop overhead, see stack samples for the details
+
+        :return: dictionary with elapsed and CPU times, phases, loop lag, memory and sample count
+        """
+
+        phases = {phase: {
+            'count': self.counts[phase],
+            'wall': self.wall[phase],
+            'mean': self.wall[phase] / self.counts[phase] if self.counts[phase] else 0.,
+            'cpu': self.cpu[phase]
+        } for phase in PHASES}
+
+        return {
+            'elapsed': self.elapsed,
+            'loop_cpu': self.loop_cpu,
+            'loop_cpu_other': max(0., self.loop_cpu - self.cpu['parse']),
+            'phases': phases,
+            'loop_lag': {
+                'samples': len(self.lags),
+                'p50': percentile(self.lags, 50),
+                'p95': percentile(self.lags, 95),
+                'max': max(self.lags) if len(self.lags) else None
+            },
+            'memory': {'peak': self.peak_memory, 'containers': self.allocations} if self.memory else None,
+            'stack_samples': sum(self.stacks.values())
+        }
+
+    def folded(self) -> list:
+        """ Stack samples as 'frame;frame;frame count' lines, from the outermost frame """
+
+        return ['{} {}'.format(stack, count) for stack, count in sorted(self.stacks.items())]
+
+    def dump(self, path: str) -> None:
+        """ Write folded stacks to the file for flamegraph tools """
+
+        with open(path, 'w', encoding='utf8') as file:
+            file.write('\n'.join(self.folded()) + '\n')
+
+    async def _probe_lag(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self.lags.append(max(0., time.perf_counter() - started - self.lag_interval))
+
+    def _sample(self, thread_id: int) -> None:
+        """ Sample the event loop thread stack from the background thread """
+
+        while not self._stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+
+            while frame is not None:
+                code = frame.f_code
+                stack.append('{} ({}:{})'.format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+
+            if len(stack):
+                self.stacks[';'.join(reversed(stack))] += 1
+
+
+class ProfiledResponses(list):
+    """ List of responses with the profiler of the call as profile attribute """
+
+    def __init__(self, responses: list, profile: Profiler):
+        super().__init__(responses)
+        self.profile = profile
+
+
+def container_allocations(snapshot) -> dict:
+    """
+    Memory allocated in the container constructors and still alive, by container class.
+    Allocations are counted to the class with the allocating line, so nested containers
+    are counted to the class that builds them
+
+    :param snapshot: tracemalloc snapshot
+    :return: dictionary with class names as keys and dictionaries with size in bytes and number of blocks as values
+    """
+
+    lines = _container_lines()
+    allocations = {}
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, containers.__file__)])
+
+    for statistic in snapshot.statistics('lineno'):
+        name = lines.get(statistic.traceback[0].lineno)
+
+        if name is None:
+            continue
+
+        allocation = allocations.setdefault(name, {'size': 0, 'count': 0})
+        allocation['size'] += statistic.size
+        allocation['count'] += statistic.count
+
+    return allocations
+
+
+def _container_lines() -> dict:
+    """ Container class name by line number of the containers module """
+
+    if not len(_lines):
+        with open(containers.__file__, encoding='utf8') as file:
+            source = file.read()
+
+        # end_lineno is not available before Python 3.8, a class ends before the next top-level statement
+
+        body = ast.parse(source).body
+        ends = [node.lineno for node in body[1:]] + [source.count('\n') + 1]
+
+        for node, end in zip(body, ends):
+            if isinstance(node, ast.ClassDef):
+                _lines.update(dict.fromkeys(range(node.lineno, end), node.name))
+
+    return _lines
+
+
+_lines = {}
@@ -0,0 +1,251 @@
+from . import exceptions
+from .containers import (
+    Address,
+    Category,
+    CompatibilityProperty,
+    ConvertedAmount,
+    ErrorDetailV3,
+    EstimatedAvailability,
+    Image,
+    Item,
+    ItemGroupSummary,
+    ItemLocationImpl,
+    ItemReturnTerms,
+    ItemSummary,
+    MarketingPrice,
+    PickupOptionSummary,
+    Product,
+    ReviewRating,
+    Seller,
+    SellerDetail,
+    ShippingOption,
+    ShippingOptionSummary,
+    ShipToLocations,
+    TargetLocation,
+    Taxes,
+    TypedNameValue
+)
+
+# container class of the nested item fields and whether the field is a list
+
+SUMMARY_CONTAINERS = {
+    'additionalImages': (Image, True),
+    'categories': (Category, True),
+    'compatibilityProperties': (CompatibilityProperty, True),
+    'currentBidPrice': (ConvertedAmount, False),
+    'distanceFromPickupLocation': (TargetLocation, False),
+    'image': (Image, False),
+    'itemLocation': (ItemLocationImpl, False),
+    'marketingPrice': (MarketingPrice, False),
+    'pickupOptions': (PickupOptionSummary, True),
+    'price': (ConvertedAmount, False),
+    'seller': (Seller, False),
+    'shippingOptions': (ShippingOptionSummary, True),
+    'thumbnailImages': (Image, True),
+    'unitPrice': (ConvertedAmount, False)
+}
+
+ITEM_CONTAINERS = {
+    'additionalImages': (Image, True),
+    'currentBidPrice': (ConvertedAmount, False),
+    'estimatedAvailabilities': (EstimatedAvailability, True),
+    'image': (Image, False),
+    'itemLocation': (Address, False),
+    'localizedAspects': (TypedNameValue, True),
+    'marketingPrice': (MarketingPrice, False),
+    'minimumPriceToBid': (ConvertedAmount, False),
+    'price': (ConvertedAmount, False),
+    'primaryItemGroup': (ItemGroupSummary, False),
+    'primaryProductReviewRating': (ReviewRating, False),
+    'product': (Product, False),
+    'returnTerms': (ItemReturnTerms, False),
+    'seller': (SellerDetail, False),
+    'shippingOptions': (ShippingOption, True),
+    'shipToLocations': (ShipToLocations, False),
+    'taxes': (Taxes, True),
+    'unitPrice': (ConvertedAmount, False),
+    'warnings': (ErrorDetailV3, True)
+}
+
+# fields returned by getItem with COMPACT fieldgroup
+
+COMPACT_FIELDS = frozenset((
+    'bidCount',
+    'currentBidPrice',
+    'estimatedAvailabilities',
+    'gtin',
+    'itemAffiliateWebUrl',
+    'itemId',
+    'itemWebUrl',
+    'minimumPriceToBid',
+    'price',
+    'reservePriceMet',
+    'sellerItemRevision',
+    'shippingOptions',
+    'taxes',
+    'topRatedBuyingExperience',
+    'uniqueBidderCount'
+))
+
+# fields returned by search only with EXTENDED fieldgroup
+
+EXTENDED_FIELDS = frozenset(('shortDescription', 'itemLocation'))
+
+
+class Projection(object):
+    """
+    Item fields to keep, as dotted paths like 'price.value'. Paths are compiled once into extractors
+    which set only the requested attributes of the item containers, nested containers are built
+    from the requested part of the field. Attributes of the fields that are not requested are not set
+    """
+
+    def __init__(self, fields):
+        """
+        Projection initialization
+
+        :param fields: iterable with dotted paths of the item fields
+        """
+
+        self.fields = tuple(fields)
+
+        if not len(self.fields):
+            raise exceptions.BrowseAPIParamError('fields. At least one field is required')
+
+        tree = {}
+
+        for path in self.fields:
+            keys = path.split('.') if isinstance(path, str) else ()
+
+            if not len(keys) or not all(keys):
+                raise exceptions.BrowseAPIParamError('fields. Invalid field path: {}'.format(path))
+
+            node = tree
+
+            for i, key in enumerate(keys):
+                # the whole field is requested
+
+                if i == len(keys) - 1 or (key in node and node[key] is None):
+                    node[key] = None
+                    break
+
+                node = node.setdefault(key, {})
+
+        self.keys = frozenset(tree)
+        self._summary = _compile(tree, SUMMARY_CONTAINERS)
+        self._item = _compile(tree, ITEM_CONTAINERS)
+
+    def summary(self, data: dict) -> ItemSummary:
+        """ ItemSummary with the requested fields """
+
+        return self._summary(ItemSummary.__new__(ItemSummary), data)
+
+    def item(self, data: dict) -> Item:
+        """ Item with the requested fields """
+
+        return self._item(Item.__new__(Item), data)
+
+    def apply(self, instance, data: dict):
+        """
+        Set the requested item fields as attributes of the instance
+
+        :param instance: container, like BrowseAPIResponse of get_item methods
+        :param data: item json
+        :return: instance
+        """
+
+        return self._item(instance, data)
+
+    def prepare(self, method: str, params: dict) -> dict:
+        """
+        Request the smallest fieldgroups returning all requested fields
+
+        :param method: Browse API method name in lowercase
+        :param params: method params dictionary
+        :return: params dictionary, a copy if fieldgroups were changed
+        """
+
+        if method == 'get_item':
+            if self.keys <= COMPACT_FIELDS:
+                return dict(params, fieldgroups='COMPACT')
+
+            drop = set() if 'product' in self.keys else {'PRODUCT'}
+
+        elif method == 'get_item_by_legacy_id':
+            drop = set() if 'product' in self.keys else {'PRODUCT'}
+
+        elif method in ('search', 'search_by_image'):
+            drop = set() if self.keys & EXTENDED_FIELDS else {'EXTENDED'}
+
+        else:
+            return params
+
+        if 'seller' not in self.keys:
+            drop.add('ADDITIONAL_SELLER_DETAILS')
+
+        fieldgroups = params.get('fieldgroups')
+
+        if not fieldgroups:
+            return params
+
+        groups = [group for group in fieldgroups.split(',') if group.strip() not in drop]
+
+        if len(groups) == len(fieldgroups.split(',')):
+            return params
+
+        # search returns no items without fieldgroups other than refinements
+
+        if not len(groups) and method == 'search':
+            groups = ['MATCHING_ITEMS']
+
+        return dict(params, fieldgroups=','.join(groups) or None)
+
+
+def _compile(tree: dict, containers: dict):
+    """ Extractor setting the fields of the tree as attributes of the instance """
+
+    fields = []
+
+    for key, subtree in tree.items():
+        container, many = containers.get(key, (None, False))
+        fields.append((key, _pruner(subtree) if subtree is not None else None, container, many))
+
+    fields = tuple(fields)
+
+    def extract(instance, data: dict):
+        attributes = instance.__dict__
+
+        for key, prune, container, many in fields:
+            value = data.get(key)
+
+            if value is None:
+                continue
+
+            if prune is not None:
+                value = prune(value)
+
+            if container is not None:
+                value = [container(element) for element in value] if many else container(value)
+
+            attributes[key] = value
+
+        return instance
+
+    return extract
+
+
+def _pruner(tree: dict):
+    """ Function keeping only the keys of the tree in the json value, lists are pruned element-wise """
+
+    keys = tuple((key, _pruner(subtree) if subtree is not None else None) for key, subtree in tree.items())
+
+    def prune(value):
+        if isinstance(value, list):
+            return [prune(element) for element in value]
+
+        if not isinstance(value, dict):
+            return value
+
+        return {key: subtree(value[key]) if subtree is not None else value[key]
+                for key, subtree in keys if value.get(key) is not None}
+
+    return prune
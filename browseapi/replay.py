@@ -0,0 +1,198 @@
+import asyncio
+import mmap
+import struct
+import zlib
+
+from hashlib import sha1
+from json import dumps, loads
+from urllib.parse import urlencode, urlsplit
+
+from . import exceptions
+
+MAGIC = b'BAPIREC1'
+FOOTER = struct.Struct('<Q')
+
+
+def request_key(request_type: str, uri: str, headers: dict, params: dict = None, data=None,
+                json_data: dict = None) -> str:
+    """
+    Archive key of the request: type, uri path, sorted params, marketplace and body hash,
+    host and authorization do not change the key
+
+    :return: key string
+    """
+
+    key = [request_type, urlsplit(uri).path]
+
+    if params:
+        key.append(urlencode(sorted((name, str(value)) for name, value in params.items())))
+
+    if 'X-EBAY-C-MARKETPLACE-ID' in headers:
+        key.append(headers['X-EBAY-C-MARKETPLACE-ID'])
+
+    if json_data is not None:
+        data = dumps(json_data, sort_keys=True, separators=(',', ':'))
+
+    if data is not None:
+        key.append(sha1(data.encode('utf8') if isinstance(data, str) else bytes(data)).hexdigest())
+
+    return ' '.join(key)
+
+
+class RecordingTransport(object):
+    """
+    Transport wrapper saving responses to the archive file, every distinct request is saved once.
+    Records are zlib compressed json appended to the file, the index is written on close
+    and the recording continues after it when the transport is opened again
+    """
+
+    def __init__(self, transport, path: str):
+        """
+        Recorder initialization
+
+        :param transport: transport sending real requests, like AiohttpTransport
+        :param path: archive file path, existing file is overwritten
+        """
+
+        self.transport = transport
+        self.path = path
+        self._file = None
+        self._index = None
+        self._end = 0
+
+    @property
+    def opened(self) -> bool:
+        return self.transport.opened
+
+    def __len__(self):
+        return len(self._index) if self._index is not None else 0
+
+    async def open(self) -> None:
+        if self._file is None and self._index is None:
+            self._file = open(self.path, 'wb')
+            self._file.write(MAGIC)
+            self._index = {}
+
+        elif self._file is None:
+            # drop the index written on close, records are appended after the previous ones
+
+            self._file = open(self.path, 'r+b')
+            self._file.seek(self._end)
+            self._file.truncate()
+
+        await self.transport.open()
+
+    async def close(self) -> None:
+        await self.transport.close()
+
+        if self._file is None:
+            return
+
+        index = dumps(self._index, separators=(',', ':')).encode('utf8')
+        self._end = self._file.tell()
+        self._file.write(index)
+        self._file.write(FOOTER.pack(self._end))
+        self._file.close()
+        self._file = None
+
+    async def request(self,
+                      request_type: str,
+                      uri: str,
+                      headers: dict,
+                      params: dict = None,
+                      data=None,
+                      json_data: dict = None,
+                      timeout=None) -> dict:
+        response = await self.transport.request(
+            request_type, uri, headers, params=params, data=data, json_data=json_data, timeout=timeout
+        )
+
+        key = request_key(request_type, uri, headers, params, data, json_data)
+
+        if key not in self._index:
+            # application token is not saved
+
+            record = dict(response, access_token='replay') if 'access_token' in response else response
+            record = zlib.compress(dumps(record, separators=(',', ':')).encode('utf8'))
+            self._index[key] = (self._file.tell(), len(record))
+            self._file.write(record)
+
+        return response
+
+    async def warm_up(self, uri: str, connections: int) -> int:
+        return await self.transport.warm_up(uri, connections)
+
+
+class ReplayTransport(object):
+    """ Transport serving recorded responses from the memory-mapped archive without network """
+
+    def __init__(self, path: str, latency=0.):
+        """
+        Replay initialization
+
+        :param path: archive file path written by RecordingTransport
+        :param latency: delay in seconds before every response or callable with request key argument
+        """
+
+        self.path = path
+        self.latency = latency
+        self.requests = 0
+        self._file = None
+        self._map = None
+        self._index = None
+
+    @property
+    def opened(self) -> bool:
+        return self._map is not None
+
+    def __len__(self):
+        return len(self._index) if self._index is not None else 0
+
+    async def open(self) -> None:
+        if self._map is not None:
+            return
+
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            await self.close()
+            raise exceptions.BrowseAPIParamError('path. File is not a recorded archive')
+
+        offset, = FOOTER.unpack(self._map[-FOOTER.size:])
+        self._index = loads(self._map[offset:-FOOTER.size].decode('utf8'))
+
+    async def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+
+        self._map = None
+        self._file = None
+
+    async def request(self,
+                      request_type: str,
+                      uri: str,
+                      headers: dict,
+                      params: dict = None,
+                      data=None,
+                      json_data: dict = None,
+                      timeout=None) -> dict:
+        key = request_key(request_type, uri, headers, params, data, json_data)
+
+        try:
+            offset, length = self._index[key]
+
+        except KeyError:
+            raise exceptions.BrowseAPIRequestError('Response is not recorded', uri)
+
+        latency = self.latency(key) if callable(self.latency) else self.latency
+
+        if latency:
+            await asyncio.sleep(latency)
+
+        self.requests += 1
+        return loads(zlib.decompress(self._map[offset:offset + length]))
+
+    async def warm_up(self, uri: str, connections: int) -> int:
+        return 0
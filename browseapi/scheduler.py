@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from heapq import heappop, heappush
+from itertools import count
+
+from . import exceptions
+from .limiter import AdaptiveLimiter
+from .metrics import Metrics
+
+
+class Scheduler(object):
+    """
+    Priority admission queue in front of the concurrency limiter.
+    Requests of a higher priority class are admitted first, requests with an expired deadline are dropped
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter = None, priorities: tuple = ('interactive', 'bulk')):
+        """
+        Scheduler initialization
+
+        :param limiter: concurrency limiter, AdaptiveLimiter with default settings if not specified
+        :param priorities: priority class names from the highest to the lowest
+        """
+
+        if not len(priorities):
+            raise exceptions.BrowseAPIParamError('priorities')
+
+        self.limiter = limiter if limiter is not None else AdaptiveLimiter()
+        self.priorities = tuple(priorities)
+        self.metrics = Metrics()
+
+        self._ranks = {priority: rank for rank, priority in enumerate(self.priorities)}
+        self._depth = {priority: 0 for priority in self.priorities}
+        self._queue = []
+        self._counter = count()
+
+        for priority in self.priorities:
+            self.metrics.gauge(priority + '.depth', lambda priority=priority: self._depth[priority])
+
+    async def acquire(self, priority: str, deadline: float = None) -> None:
+        """
+        Wait for a free slot
+
+        :param priority: priority class name
+        :param deadline: time.monotonic() value after which the request is dropped, None for no deadline
+        """
+
+        if priority not in self._ranks:
+            raise exceptions.BrowseAPIParamError('priority. Available classes: {}'.format(', '.join(self.priorities)))
+
+        enqueued = time.monotonic()
+
+        if deadline is not None and enqueued >= deadline:
+            self._drop(priority)
+
+        if not len(self._queue) and self.limiter.try_acquire():
+            self._admit(priority, enqueued)
+            return
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        heappush(self._queue, (self._ranks[priority], next(self._counter), priority, future))
+        self._depth[priority] += 1
+        timer = None
+
+        if deadline is not None:
+            timer = loop.call_later(deadline - enqueued, self._expire, priority, future)
+
+        try:
+            await future
+
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+                self._depth[priority] -= 1
+
+            elif not future.cancelled() and future.exception() is None:
+                # the slot was given right before cancellation
+
+                self.discard()
+
+            raise
+
+        except exceptions.BrowseAPIDeadlineError:
+            self._drop(priority)
+
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        self._admit(priority, enqueued)
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        """ Return a slot to the limiter and admit waiting requests """
+
+        self.limiter.release(latency, failed)
+        self._dispatch()
+
+    def discard(self) -> None:
+        """ Return an unused slot without affecting the limit """
+
+        self.limiter.discard()
+        self._dispatch()
+
+    def stats(self) -> dict:
+        """
+        Per-class queue statistics
+
+        :return: dictionary with queue depth, admitted and dropped requests count and wait time percentiles
+        """
+
+        return {
+            priority: {
+                'depth': self._depth[priority],
+                'admitted': self.metrics.counters[priority + '.admitted'],
+                'dropped': self.metrics.counters[priority + '.dropped'],
+                'wait_p50': self.metrics.percentile(priority + '.wait', 50),
+                'wait_p95': self.metrics.percentile(priority + '.wait', 95)
+            } for priority in self.priorities
+        }
+
+    def _dispatch(self) -> None:
+        while len(self._queue) and self.limiter.has_capacity:
+            _, _, priority, future = heappop(self._queue)
+
+            # expired and cancelled requests are already removed from the depth
+
+            if future.done():
+                continue
+
+            self.limiter.try_acquire()
+            self._depth[priority] -= 1
+            future.set_result(None)
+
+    def _expire(self, priority: str, future) -> None:
+        if not future.done():
+            self._depth[priority] -= 1
+            future.set_exception(exceptions.BrowseAPIDeadlineError())
+
+    def _admit(self, priority: str, enqueued: float) -> None:
+        self.metrics.increment(priority + '.admitted')
+        self.metrics.observe(priority + '.wait', time.monotonic() - enqueued)
+
+    def _drop(self, priority: str) -> None:
+        self.metrics.increment(priority + '.dropped')
+        raise exceptions.BrowseAPIDeadlineError()
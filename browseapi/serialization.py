@@ -0,0 +1,102 @@
+import json
+
+from . import exceptions
+from .containers import BrowseAPIResponse
+
+
+class JSONSerializer(object):
+    """ Compact json with the standard library encoder """
+
+    name = 'json'
+
+    def dumps(self, data: dict) -> bytes:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf8')
+
+    def loads(self, data: bytes) -> dict:
+        return json.loads(data)
+
+
+class OrjsonSerializer(object):
+    """ Json with orjson, pip install orjson """
+
+    name = 'orjson'
+
+    def __init__(self):
+        try:
+            import orjson
+
+        except ImportError:
+            raise exceptions.BrowseAPIParamError('serializer. orjson is required for OrjsonSerializer')
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class MsgpackSerializer(object):
+    """ Binary MessagePack, pip install msgpack """
+
+    name = 'msgpack'
+
+    def __init__(self):
+        try:
+            import msgpack
+
+        except ImportError:
+            raise exceptions.BrowseAPIParamError('serializer. msgpack is required for MsgpackSerializer')
+
+        self._packer = msgpack.Packer()
+        self._msgpack = msgpack
+
+    def dumps(self, data: dict) -> bytes:
+        return self._packer.pack(data)
+
+    def loads(self, data: bytes) -> dict:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+serializers = {serializer.name: serializer for serializer in (JSONSerializer, OrjsonSerializer, MsgpackSerializer)}
+
+
+def get_serializer(name: str = 'json'):
+    """
+    Serializer instance by name
+
+    :param name: json, orjson or msgpack
+    :return: object with dumps and loads methods
+    """
+
+    if name not in serializers:
+        raise exceptions.BrowseAPIParamError('serializer. Available: {}'.format(', '.join(serializers)))
+
+    return serializers[name]()
+
+
+def dumps(container, serializer='json') -> bytes:
+    """
+    Serialize container tree, None fields are skipped
+
+    :param container: BrowseAPIResponse or any other container
+    :param serializer: serializer name or instance
+    :return: serialized data
+    """
+
+    if isinstance(serializer, str):
+        serializer = get_serializer(serializer)
+
+    return serializer.dumps(container.to_dict())
+
+
+def loads(data: bytes, container_class=BrowseAPIResponse, serializer='json'):
+    """
+    Build container tree from the serialized data
+
+    :param data: serialized data
+    :param container_class: container class, BrowseAPIResponse by default
+    :param serializer: serializer name or instance
+    :return: container instance
+    """
+
+    if isinstance(serializer, str):
+        serializer = get_serializer(serializer)
+
+    return container_class.from_dict(serializer.loads(data))
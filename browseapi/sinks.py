@@ -0,0 +1,395 @@
+import asyncio
+import gzip
+import json
+import queue
+import sqlite3
+import threading
+
+from abc import ABC, abstractmethod
+from collections import deque
+
+from . import exceptions
+
+_STOP = object()
+
+
+def response_rows(response) -> list:
+    """
+    Rows of the response: item summaries or items, the response itself for other methods
+
+    :param response: BrowseAPIResponse, exceptions passed with pass_errors have no rows
+    :return: list of raw json dictionaries
+    """
+
+    if isinstance(response, Exception) or hasattr(response, 'errors'):
+        return []
+
+    items = getattr(response, 'itemSummaries', None)
+
+    if items is None:
+        items = getattr(response, 'items', None)
+
+    if items is None:
+        return [response.to_dict()]
+
+    return [item.to_dict() for item in items]
+
+
+class Sink(ABC):
+    """
+    Base class of the output sinks. Responses are put to a bounded queue as they complete,
+    rows are written in batches by a background thread. Subclasses implement write_batch and optionally
+    open_output and close_output, which are called in the writer thread.
+    Senders waiting for the full queue are suspended in their event loop, not in executor threads
+    """
+
+    def __init__(self, batch_size: int = 1000, queue_size: int = 100):
+        """
+        Sink initialization
+
+        :param batch_size: number of rows written at once
+        :param queue_size: maximal number of responses waiting for the writer, senders wait when it is full
+        """
+
+        if batch_size < 1:
+            raise exceptions.BrowseAPIParamError('batch_size')
+
+        self.batch_size = batch_size
+        self.rows = 0
+        self.responses = 0
+        self.skipped = 0
+
+        # the queue itself is unbounded, its size is limited by the senders
+
+        self._queue = queue.Queue()
+        self._queue_size = queue_size
+        self._queued = 0
+        self._space = threading.Condition()
+        self._waiters = deque()
+        self._thread = None
+        self._error = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    async def send(self, response) -> None:
+        """ Put the response to the queue, waits in the event loop until the writer frees a place if it is full """
+
+        self._check()
+
+        while True:
+            with self._space:
+                if self._error is not None:
+                    raise self._error
+
+                if self._queued < self._queue_size:
+                    self._queued += 1
+                    break
+
+                loop = asyncio.get_event_loop()
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+
+            try:
+                await waiter
+
+            except asyncio.CancelledError:
+                with self._space:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                    else:
+                        # the wake-up goes to the next sender
+
+                        self._wake(1)
+
+                raise
+
+        self._queue.put(response)
+
+    def put(self, response) -> None:
+        """ Put the response to the queue from the synchronous code, blocks if the queue is full """
+
+        self._check()
+
+        with self._space:
+            while self._error is None and self._queued >= self._queue_size:
+                self._space.wait()
+
+            if self._error is not None:
+                raise self._error
+
+            self._queued += 1
+
+        self._queue.put(response)
+
+    def close(self) -> None:
+        """ Write the remaining rows, close the output and stop the writer thread """
+
+        if self._closed:
+            return
+
+        self._closed = True
+
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def open_output(self) -> None:
+        pass
+
+    @abstractmethod
+    def write_batch(self, rows: list) -> None:
+        pass
+
+    def close_output(self) -> None:
+        pass
+
+    def _check(self) -> None:
+        if self._closed:
+            raise exceptions.BrowseAPIError('Sink is closed')
+
+        if self._error is not None:
+            raise self._error
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write, name='browseapi-sink', daemon=True)
+            self._thread.start()
+
+    def _write(self) -> None:
+        batch = []
+        stopped = False
+
+        try:
+            self.open_output()
+
+            while True:
+                response = self._queue.get()
+
+                if response is _STOP:
+                    stopped = True
+                    break
+
+                with self._space:
+                    self._queued -= 1
+                    self._space.notify()
+                    self._wake(1)
+
+                rows = response_rows(response)
+                self.responses += 1
+                self.skipped += not len(rows)
+                batch.extend(rows)
+
+                if len(batch) >= self.batch_size:
+                    self.write_batch(batch)
+                    self.rows += len(batch)
+                    batch = []
+
+            if len(batch):
+                self.write_batch(batch)
+                self.rows += len(batch)
+
+        except Exception as e:
+            with self._space:
+                self._error = e
+
+                # waiting senders raise the error
+
+                self._space.notify_all()
+                self._wake(len(self._waiters))
+
+            # the queue is drained until close, unless the last batch failed after it
+
+            while not stopped and self._queue.get() is not _STOP:
+                pass
+
+        finally:
+            try:
+                self.close_output()
+
+            except Exception as e:
+                self._error = self._error or e
+
+    def _wake(self, count: int) -> None:
+        """ Wake up waiting senders in their event loops, must be called with the space condition held """
+
+        while count and len(self._waiters):
+            loop, waiter = self._waiters.popleft()
+
+            try:
+                loop.call_soon_threadsafe(_set_waiter, waiter)
+
+            except RuntimeError:
+                # the loop of the sender is closed
+                continue
+
+            count -= 1
+
+
+def _set_waiter(waiter) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class JSONLSink(Sink):
+    """ Rows as json lines, gzip compressed by default """
+
+    def __init__(self, path: str, compress: bool = True, batch_size: int = 1000, queue_size: int = 100):
+        """
+        Sink initialization
+
+        :param path: output file path
+        :param compress: gzip the output
+        :param batch_size: number of rows written at once
+        :param queue_size: maximal number of responses waiting for the writer
+        """
+
+        super().__init__(batch_size, queue_size)
+        self.path = path
+        self.compress = compress
+        self._file = None
+
+    def open_output(self) -> None:
+        self._file = gzip.open(self.path, 'wt', encoding='utf8') if self.compress \
+            else open(self.path, 'w', encoding='utf8')
+
+    def write_batch(self, rows: list) -> None:
+        self._file.write(''.join(json.dumps(row, separators=(',', ':'), ensure_ascii=False) + '\n' for row in rows))
+
+    def close_output(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class SQLiteSink(Sink):
+    """ Rows in a SQLite table with item id and raw json columns """
+
+    def __init__(self, path: str, table: str = 'items', batch_size: int = 1000, queue_size: int = 100):
+        """
+        Sink initialization
+
+        :param path: database file path
+        :param table: table name, created if not exists
+        :param batch_size: number of rows written in one transaction
+        :param queue_size: maximal number of responses waiting for the writer
+        """
+
+        if not table.isidentifier():
+            raise exceptions.BrowseAPIParamError('table')
+
+        super().__init__(batch_size, queue_size)
+        self.path = path
+        self.table = table
+        self._connection = None
+
+    def open_output(self) -> None:
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS {} (item_id TEXT, data TEXT)'.format(self.table))
+
+    def write_batch(self, rows: list) -> None:
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO {} VALUES (?, ?)'.format(self.table),
+                [(row.get('itemId'), json.dumps(row, separators=(',', ':'), ensure_ascii=False)) for row in rows]
+            )
+
+    def close_output(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+
+
+class ArrowSink(Sink):
+    """
+    Rows in Parquet or Arrow IPC file with a flat schema of the common item fields and the raw json,
+    every batch is a row group (record batch). pyarrow is required
+    """
+
+    columns = ('itemId', 'title', 'price', 'currency', 'conditionId', 'categoryId', 'seller', 'json')
+
+    def __init__(self, path: str, file_format: str = 'parquet', batch_size: int = 10000, queue_size: int = 100):
+        """
+        Sink initialization
+
+        :param path: output file path
+        :param file_format: parquet or ipc, IPC files can be read with memory mapping, see read_arrow
+        :param batch_size: number of rows in a row group
+        :param queue_size: maximal number of responses waiting for the writer
+        """
+
+        if file_format not in ('parquet', 'ipc'):
+            raise exceptions.BrowseAPIParamError('file_format. Only parquet and ipc are supported')
+
+        try:
+            import pyarrow
+
+        except ImportError:
+            raise exceptions.BrowseAPIParamError('sink. pyarrow is required for ArrowSink')
+
+        super().__init__(batch_size, queue_size)
+        self.path = path
+        self.file_format = file_format
+        self._pa = pyarrow
+        self._writer = None
+
+        self.schema = pyarrow.schema([
+            (column, pyarrow.float64() if column == 'price' else pyarrow.string()) for column in self.columns
+        ])
+
+    def open_output(self) -> None:
+        if self.file_format == 'parquet':
+            import pyarrow.parquet
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+        else:
+            self._writer = self._pa.ipc.new_file(self.path, self.schema)
+
+    def write_batch(self, rows: list) -> None:
+        columns = {column: [] for column in self.columns}
+
+        for row in rows:
+            price = row.get('price') or {}
+            categories = row.get('categories')
+
+            columns['itemId'].append(row.get('itemId'))
+            columns['title'].append(row.get('title'))
+            columns['price'].append(float(price['value']) if 'value' in price else None)
+            columns['currency'].append(price.get('currency'))
+            columns['conditionId'].append(row.get('conditionId'))
+            columns['categoryId'].append(row.get('categoryId') or (categories[0].get('categoryId')
+                                                                   if categories else None))
+            columns['seller'].append((row.get('seller') or {}).get('username'))
+            columns['json'].append(json.dumps(row, separators=(',', ':'), ensure_ascii=False))
+
+        batch = self._pa.record_batch([columns[column] for column in self.columns], schema=self.schema)
+
+        if self.file_format == 'parquet':
+            self._writer.write_table(self._pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def close_output(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def read_arrow(path: str):
+    """
+    Read Arrow IPC file written by ArrowSink with memory mapping, columns are not copied
+
+    :param path: file path
+    :return: pyarrow Table
+    """
+
+    try:
+        import pyarrow
+
+    except ImportError:
+        raise exceptions.BrowseAPIParamError('path. pyarrow is required for reading Arrow files')
+
+    return pyarrow.ipc.open_file(pyarrow.memory_map(path, 'r')).read_all()
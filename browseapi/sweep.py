@@ -0,0 +1,195 @@
+from array import array
+from hashlib import blake2b
+
+MAX_LOAD = 0.5
+
+
+class ItemIdSet(object):
+    """
+    Compact set of item ids: 64-bit hashes of ids are stored in an open addressing table,
+    about 16 bytes per id instead of a full string object in a set
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Set initialization
+
+        :param capacity: expected number of ids, the table grows automatically
+        """
+
+        size = 8
+
+        while size * MAX_LOAD < capacity:
+            size *= 2
+
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, item_id: str):
+        return self._find(self._hash(item_id))[1]
+
+    def add(self, item_id: str) -> bool:
+        """
+        Add item id
+
+        :param item_id: item id
+        :return: True if the id was not in the set
+        """
+
+        key = self._hash(item_id)
+        slot, found = self._find(key)
+
+        if found:
+            return False
+
+        self._table[slot] = key
+        self._count += 1
+
+        if self._count > len(self._table) * MAX_LOAD:
+            self._grow()
+
+        return True
+
+    def _find(self, key: int) -> tuple:
+        """ Slot for the key and whether the key is already there, linear probing """
+
+        table = self._table
+        slot = key & self._mask
+
+        while table[slot]:
+            if table[slot] == key:
+                return slot, True
+
+            slot = (slot + 1) & self._mask
+
+        return slot, False
+
+    def _grow(self) -> None:
+        keys = [key for key in self._table if key]
+        self._table = array('Q', bytes(16 * len(self._table)))
+        self._mask = len(self._table) - 1
+
+        for key in keys:
+            self._table[self._find(key)[0]] = key
+
+    @staticmethod
+    def _hash(item_id: str) -> int:
+        # zero marks an empty slot
+
+        return int.from_bytes(blake2b(str(item_id).encode('utf8'), digest_size=8).digest(), 'little') or 1
+
+
+class Sweep(object):
+    """
+    Tracks item ids seen during a run of overlapping queries. Duplicate item summaries are dropped
+    before containers are built, detail requests for already fetched items are not sent
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Sweep initialization
+
+        :param capacity: expected number of distinct items
+        """
+
+        self.items = ItemIdSet(capacity)
+        self.details = ItemIdSet(capacity)
+        self.summaries = 0
+        self.duplicates = 0
+        self.detail_requests = 0
+        self.details_skipped = 0
+
+    def add_summary(self, item_id: str) -> bool:
+        """
+        Register item summary from the search results
+
+        :param item_id: item id
+        :return: True if the item was not seen before
+        """
+
+        self.summaries += 1
+
+        if item_id is None or self.items.add(item_id):
+            return True
+
+        self.duplicates += 1
+        return False
+
+    def add_detail(self, item_id: str) -> bool:
+        """
+        Register successfully fetched item details, later detail requests for the item are not sent
+
+        :param item_id: item id
+        :return: True if details of the item were not fetched before
+        """
+
+        return self.details.add(item_id)
+
+    @staticmethod
+    def detail_id(method: str, params: dict):
+        """
+        Item id of the detail request
+
+        :param method: Browse API method name in lowercase
+        :param params: method params dictionary
+        :return: item id or None for other methods
+        """
+
+        if method == 'get_item':
+            return params['item_id']
+
+        if method == 'get_item_by_legacy_id':
+            return 'v1|{0}|{1}'.format(params['legacy_item_id'], params.get('legacy_variation_id') or 0)
+
+        return None
+
+    def filter_params(self, method: str, params: list) -> list:
+        """
+        Replace detail requests for items already fetched in this sweep or repeated in the params with None.
+        Items are registered only after a successful response, failed requests are sent again by later calls
+
+        :param method: Browse API method name in lowercase
+        :param params: list of params dictionaries
+        :return: list of params dictionaries to send and None for the skipped ones, in the order of params
+        """
+
+        if method not in ('get_item', 'get_item_by_legacy_id'):
+            return params
+
+        filtered = []
+        pending = set()
+
+        for param in params:
+            item_id = self.detail_id(method, param)
+            self.detail_requests += 1
+
+            if item_id in pending or item_id in self.details:
+                self.details_skipped += 1
+                filtered.append(None)
+                continue
+
+            pending.add(item_id)
+            filtered.append(param)
+
+        return filtered
+
+    def stats(self) -> dict:
+        """
+        Deduplication statistics
+
+        :return: dictionary with counts of summaries, unique items, duplicates, skipped detail requests and rates
+        """
+
+        return {
+            'summaries': self.summaries,
+            'unique': len(self.items),
+            'duplicates': self.duplicates,
+            'duplicate_rate': self.duplicates / self.summaries if self.summaries else 0.,
+            'detail_requests': self.detail_requests,
+            'details_skipped': self.details_skipped,
+            'details_skip_rate': self.details_skipped / self.detail_requests if self.detail_requests else 0.
+        }
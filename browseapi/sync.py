@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+from . import exceptions
+from .client import BrowseAPI
+
+
+class SyncBrowseAPI(object):
+    """
+    Thread-safe synchronous client. Owns one event loop running in a background thread,
+    sessions, token and connection pool are kept between calls and shared by all calling threads
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Client initialization, arguments are the same as for BrowseAPI
+        """
+
+        self.api = BrowseAPI(*args, **kwargs)
+
+        self._loop = asyncio.new_event_loop()
+        self._open_lock = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run_loop, name='browseapi-loop', daemon=True)
+        self._thread.start()
+
+    @property
+    def metrics(self):
+        return self.api.metrics
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def execute(self, method: str, params: list, pass_errors: bool = False, **kwargs) -> list:
+        """
+        Make requests in the background event loop, can be called from any thread
+
+        :param method: Browse API method name in lowercase
+        :param params: list of params dictionaries for every request
+        :param pass_errors: exceptions in the tasks are treated the same as successful results, bool
+        :param kwargs: other keyword arguments of BrowseAPI.execute
+        :return: list of responses
+        """
+
+        self.api._load_method(method)
+        return self._submit(self._execute(method, params, pass_errors, **kwargs))
+
+    def warm_up(self, connections: int = 10) -> None:
+        """
+        Open the client with warmed up connections before the first requests, see BrowseAPI.warm_up
+
+        :param connections: number of keep-alive connections
+        """
+
+        self._submit(self._locked(self.api.warm_up(connections)))
+
+    def close(self) -> None:
+        """ Close sessions and stop the background event loop """
+
+        if self._closed:
+            return
+
+        self._closed = True
+
+        try:
+            self._submit(self.api.close(), check_closed=False)
+
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coroutine, check_closed: bool = True):
+        """ Run coroutine in the background loop and wait for the result """
+
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise exceptions.BrowseAPIError('SyncBrowseAPI can not be called from its own event loop')
+
+        if check_closed and self._closed:
+            coroutine.close()
+            raise exceptions.BrowseAPIError('Client is closed')
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _locked(self, coroutine):
+        # the lock is created in the background loop, concurrent first calls open the client once
+
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+
+        async with self._open_lock:
+            return await coroutine
+
+    async def _execute(self, *args, **kwargs) -> list:
+        await self._locked(self.api.open())
+        return await self.api.execute_async(*args, **kwargs)
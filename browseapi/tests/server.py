@@ -0,0 +1,399 @@
+import asyncio
+import threading
+
+from base64 import b64decode
+
+from aiohttp import ClientSession, TCPConnector, web
+
+from ..client import BrowseAPI
+
+EBAY_HOST = 'https://api.ebay.com'
+GROUP_PATH = '/buy/browse/v1/item/get_items_by_item_group'
+
+
+class MockServer(object):
+    """ Local Browse API imitation running in a background thread, with latency and error injection """
+
+    def __init__(self,
+                 latency: float = 0.,
+                 fail=None,
+                 error_id: int = 2001,
+                 catalog: list = None,
+                 denied: tuple = (),
+                 description: str = None,
+                 http2: bool = False):
+        """
+        Server initialization
+
+        :param latency: delay in seconds before every API response or callable with request number argument
+        :param fail: callable with request number argument, returns True for failed requests
+        :param error_id: errorId of the failed requests, 2001 is answered with 429, other ids with 403
+        :param catalog: list of item summaries searched by category_ids, price and conditionIds filters
+        :param denied: application ids with rejected token requests
+        :param description: description of the items and the items of the groups
+        :param http2: serve HTTP/2 without TLS (h2c with prior knowledge) in front of the HTTP/1.1 server,
+            h2 is required, connections are counted on the HTTP/2 side
+        """
+
+        self.latency = latency
+        self.fail = fail
+        self.error_id = error_id
+        self.catalog = catalog
+        self.denied = denied
+        self.description = description
+        self.http2 = http2
+
+        if http2:
+            import h2  # noqa: F401
+
+        self.requests = 0
+        self.token_requests = 0
+        self.concurrency = 0
+        self.max_concurrency = 0
+        self.paths = []
+        self.bodies = []
+        self.connections = set()
+        self.head_requests = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner = None
+        self._h2_server = None
+        self._h2_session = None
+        self.base_url = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def client(self, **kwargs) -> BrowseAPI:
+        """ BrowseAPI instance that sends requests to this server """
+
+        if 'credentials' in kwargs:
+            return self.point(BrowseAPI(**kwargs))
+
+        return self.point(BrowseAPI('app_id', 'cert_id', **kwargs))
+
+    def point(self, api):
+        """ Redirect client uris to this server """
+
+        target = getattr(api, 'api', api)
+
+        for name in dir(BrowseAPI):
+            if name.endswith('_uri'):
+                setattr(target, name, getattr(BrowseAPI, name).replace(EBAY_HOST, self.base_url))
+
+        return api
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_post('/identity/v1/oauth2/token', self._token)
+        app.router.add_route('HEAD', '/buy/browse/v1', self._head)
+        app.router.add_get('/buy/browse/v1/item_summary/search', self._search)
+        app.router.add_post('/buy/browse/v1/item_summary/search_by_image', self._search_by_image)
+        app.router.add_get('/buy/browse/v1/item/get_item_by_legacy_id', self._item)
+        app.router.add_get(GROUP_PATH, self._item_group)
+        app.router.add_get('/buy/browse/v1/item/{item_id}', self._item)
+        app.router.add_post('/buy/browse/v1/item/{item_id}/check_compatibility', self._compatibility)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+
+        port = self._runner.addresses[0][1]
+        self.base_url = 'http://127.0.0.1:{}'.format(port)
+
+        if self.http2:
+            origin = self.base_url
+            self._h2_session = ClientSession(connector=TCPConnector(limit=0))
+            self._h2_server = await self._loop.create_server(
+                lambda: H2Protocol(self._h2_session, origin), '127.0.0.1', 0
+            )
+
+            self.base_url = 'http://127.0.0.1:{}'.format(self._h2_server.sockets[0].getsockname()[1])
+
+    async def _stop(self) -> None:
+        if self._h2_server is not None:
+            self._h2_server.close()
+            await self._h2_session.close()
+
+        await self._runner.cleanup()
+
+    @staticmethod
+    def _peer(request):
+        """ Client address, for requests forwarded from the HTTP/2 side the address of the HTTP/2 client """
+
+        return request.headers.get('X-Peer') or request.transport.get_extra_info('peername')
+
+    async def _head(self, request):
+        self.head_requests += 1
+        self.connections.add(self._peer(request))
+        return web.Response(status=404, headers={'Content-Length': '0'})
+
+    async def _token(self, request):
+        self.token_requests += 1
+        self.connections.add(self._peer(request))
+        app_id = b64decode(request.headers['Authorization'].split()[1]).decode('utf8').split(':')[0]
+
+        if app_id in self.denied:
+            return web.json_response({'error': 'invalid_client', 'error_description': 'client authentication failed'},
+                                     status=401)
+
+        return web.json_response({
+            'access_token': 'token',
+            'expires_in': 7200,
+            'token_type': 'Application Access Token'
+        })
+
+    async def _respond(self, request, body: dict):
+        self.requests += 1
+        self.concurrency += 1
+        self.max_concurrency = max(self.max_concurrency, self.concurrency)
+        self.paths.append(request.path_qs)
+        self.connections.add(self._peer(request))
+        number = self.requests
+
+        try:
+            latency = self.latency(number) if callable(self.latency) else self.latency
+
+            if latency:
+                await asyncio.sleep(latency)
+
+            if request.headers.get('Authorization') != 'Bearer token':
+                return web.json_response({'errors': [{'errorId': 1001, 'message': 'Invalid access token'}]},
+                                         status=401)
+
+            if self.fail is not None and self.fail(number):
+                if self.error_id == 2001:
+                    return web.json_response({'errors': [{'errorId': 2001, 'message': 'Too many requests'}]},
+                                             status=429)
+
+                return web.json_response({'errors': [{'errorId': self.error_id, 'message': 'Access denied'}]},
+                                         status=403)
+
+            return web.json_response(body)
+
+        finally:
+            self.concurrency -= 1
+
+    async def _search(self, request):
+        offset = int(request.query.get('offset', 0))
+        limit = int(request.query.get('limit', 200))
+
+        if self.catalog is not None:
+            return await self._search_catalog(request, offset, limit)
+
+        return await self._respond(request, {
+            'href': str(request.url),
+            'limit': limit,
+            'offset': offset,
+            'total': 2,
+            'itemSummaries': [
+                {'itemId': 'v1|1|0', 'title': 'Drone', 'price': {'value': '10.50', 'currency': 'USD'},
+                 'itemGroupHref': str(request.url.with_path(GROUP_PATH).with_query(item_group_id='100'))},
+                {'itemId': 'v1|2|0', 'title': 'Drone 2', 'price': {'value': '20.00', 'currency': 'USD'},
+                 'itemGroupHref': str(request.url.with_path(GROUP_PATH).with_query(item_group_id='100'))}
+            ]
+        })
+
+    async def _search_catalog(self, request, offset: int, limit: int):
+        query = request.query
+        items = self.catalog
+
+        if 'category_ids' in query:
+            categories = query['category_ids'].split(',')
+            items = [item for item in items if any(category['categoryId'] in categories
+                                                   for category in item['categories'])]
+
+        for field in filter(None, query.get('filter', '').split(',')):
+            name, _, value = field.partition(':')
+
+            if name == 'price':
+                low, high = value.strip('[]').split('..')
+                items = [item for item in items if (not low or float(item['price']['value']) >= float(low))
+                         and (not high or float(item['price']['value']) <= float(high))]
+
+            elif name == 'conditionIds':
+                items = [item for item in items if item['conditionId'] in value.strip('{}').split('|')]
+
+        body = {'href': str(request.url), 'total': len(items), 'offset': offset, 'limit': limit,
+                'itemSummaries': items[offset:offset + limit]}
+        fieldgroups = query.get('fieldgroups', '')
+
+        if 'REFINEMENTS' in fieldgroups:
+            categories, conditions = {}, {}
+
+            for item in items:
+                conditions[item['conditionId']] = conditions.get(item['conditionId'], 0) + 1
+
+                for category in item['categories']:
+                    categories[category['categoryId']] = categories.get(category['categoryId'], 0) + 1
+
+            body['refinement'] = {}
+
+            if 'CATEGORY_REFINEMENTS' in fieldgroups:
+                body['refinement']['categoryDistributions'] = [
+                    {'categoryId': category, 'matchCount': count} for category, count in categories.items()
+                ]
+
+            if 'CONDITION_REFINEMENTS' in fieldgroups:
+                body['refinement']['conditionDistributions'] = [
+                    {'conditionId': condition, 'matchCount': count} for condition, count in conditions.items()
+                ]
+
+        return await self._respond(request, body)
+
+    async def _search_by_image(self, request):
+        self.bodies.append((request.content_type, await request.json()))
+        return await self._search(request)
+
+    async def _item(self, request):
+        item_id = request.match_info.get('item_id', request.query.get('legacy_item_id'))
+
+        return await self._respond(request, {
+            'itemId': item_id,
+            'title': 'Item {}'.format(item_id),
+            'price': {'value': '10.50', 'currency': 'USD'},
+            'description': self.description if self.description is not None else '<p>Description</p>'
+        })
+
+    async def _item_group(self, request):
+        group_id = request.query['item_group_id']
+
+        items = [
+            {'itemId': 'v1|{}|1'.format(group_id), 'primaryItemGroup': {'itemGroupId': group_id}},
+            {'itemId': 'v1|{}|2'.format(group_id), 'primaryItemGroup': {'itemGroupId': group_id}}
+        ]
+
+        if self.description is not None:
+            for item in items:
+                item['description'] = self.description
+
+        return await self._respond(request, {'items': items})
+
+    async def _compatibility(self, request):
+        await request.json()
+        return await self._respond(request, {'compatibilityStatus': 'COMPATIBLE'})
+
+
+class H2Protocol(asyncio.Protocol):
+    """ HTTP/2 server connection forwarding every stream as HTTP/1.1 request to the mock server """
+
+    def __init__(self, session: ClientSession, origin: str):
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.exceptions
+
+        self._h2 = h2
+        self._session = session
+        self._origin = origin
+        self._connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding='utf8')
+        )
+
+        self._transport = None
+        self._peer = None
+        self._streams = {}
+        self._window = asyncio.Event()
+        self._tasks = set()
+
+    def connection_made(self, transport) -> None:
+        self._transport = transport
+        self._peer = '{0}:{1}'.format(*transport.get_extra_info('peername')[:2])
+        self._connection.initiate_connection()
+        self._flush()
+
+    def connection_lost(self, exc) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    def data_received(self, data: bytes) -> None:
+        events = self._h2.events
+
+        try:
+            received = self._connection.receive_data(data)
+
+        except self._h2.exceptions.ProtocolError:
+            self._flush()
+            self._transport.close()
+            return
+
+        for event in received:
+            if isinstance(event, events.RequestReceived):
+                self._streams[event.stream_id] = (event.headers, bytearray())
+
+            elif isinstance(event, events.DataReceived):
+                self._streams[event.stream_id][1].extend(event.data)
+                self._connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+
+            elif isinstance(event, events.StreamEnded):
+                headers, body = self._streams.pop(event.stream_id)
+                task = asyncio.ensure_future(self._forward(event.stream_id, headers, bytes(body)))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            elif isinstance(event, events.WindowUpdated):
+                self._window.set()
+                self._window = asyncio.Event()
+
+            elif isinstance(event, events.ConnectionTerminated):
+                self._transport.close()
+
+        self._flush()
+
+    async def _forward(self, stream_id: int, headers: list, body: bytes) -> None:
+        pseudo = {name: value for name, value in headers if name.startswith(':')}
+        forwarded = [(name, value) for name, value in headers
+                     if not name.startswith(':') and name not in ('content-length', 'host')]
+        forwarded.append(('X-Peer', self._peer))
+
+        async with self._session.request(pseudo[':method'], self._origin + pseudo[':path'], headers=forwarded,
+                                         data=body or None) as response:
+            data = await response.read()
+            status = response.status
+            content_type = response.headers.get('Content-Type', 'application/octet-stream')
+
+        try:
+            self._connection.send_headers(stream_id, [
+                (':status', str(status)), ('content-type', content_type), ('content-length', str(len(data)))
+            ], end_stream=not data)
+
+            self._flush()
+            await self._send_data(stream_id, data)
+
+        except self._h2.exceptions.StreamClosedError:
+            pass
+
+    async def _send_data(self, stream_id: int, data: bytes) -> None:
+        """ Send the body in frames within the flow control window """
+
+        while len(data):
+            window = min(self._connection.local_flow_control_window(stream_id),
+                         self._connection.max_outbound_frame_size)
+
+            if window <= 0:
+                await self._window.wait()
+                continue
+
+            self._connection.send_data(stream_id, data[:window], end_stream=window >= len(data))
+            data = data[window:]
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._transport.is_closing():
+            self._transport.write(self._connection.data_to_send())
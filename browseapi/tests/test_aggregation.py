@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from ..aggregation import RefinementAggregator
+from ..containers import BrowseAPIResponse
+from ..exceptions import BrowseAPIError, BrowseAPIParamError
+
+
+def search_response(drone_count: int, used_count: int) -> BrowseAPIResponse:
+    return BrowseAPIResponse({
+        'href': '', 'limit': 0, 'offset': 0, 'total': drone_count,
+        'refinement': {
+            'aspectDistributions': [{
+                'localizedAspectName': 'Brand',
+                'aspectValueDistributions': [
+                    {'localizedAspectValue': 'DJI', 'matchCount': drone_count},
+                    {'localizedAspectValue': 'Parrot', 'matchCount': 5}
+                ]
+            }],
+            'buyingOptionDistributions': [{'buyingOption': 'FIXED_PRICE', 'matchCount': drone_count}],
+            'categoryDistributions': [{'categoryId': '179697', 'categoryName': 'Drones', 'matchCount': drone_count}],
+            'conditionDistributions': [
+                {'conditionId': '1000', 'condition': 'New', 'matchCount': drone_count - used_count},
+                {'conditionId': '3000', 'condition': 'Used', 'matchCount': used_count}
+            ]
+        }
+    }, 'search', False)
+
+
+class AggregatorTest(TestCase):
+    """ Test merging refinements across responses """
+
+    def test_aggregation(self):
+        aggregator = RefinementAggregator().consume([
+            search_response(100, 30), search_response(50, 40), BrowseAPIError('passed error')
+        ])
+
+        self.assertEqual(aggregator.responses, 2)
+        self.assertEqual(aggregator.count('aspect', ('Brand', 'DJI')), 150)
+        self.assertEqual(aggregator.count('category', '179697'), 150)
+        self.assertEqual(aggregator.category_names['179697'], 'Drones')
+        self.assertEqual(aggregator.top('condition', 1), [('1000', 80)])
+        self.assertEqual(aggregator.top('aspect', 2, aspect='Brand'),
+                         [(('Brand', 'DJI'), 150), (('Brand', 'Parrot'), 10)])
+        self.assertEqual(aggregator.counts('buying_option'), {'FIXED_PRICE': 150})
+        self.assertRaises(BrowseAPIParamError, aggregator.top, 'seller')
+
+    def test_merge(self):
+        first = RefinementAggregator().consume([search_response(100, 30)])
+        second = RefinementAggregator().consume([search_response(50, 40)])
+        first.merge(second)
+
+        self.assertEqual(first.responses, 2)
+        self.assertEqual(first.count('condition', '1000'), 80)
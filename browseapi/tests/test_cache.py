@@ -0,0 +1,58 @@
+import os
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ..cache import CompatibilityCache, SQLiteBackend, compatibility_params, properties_key
+from .server import MockServer
+
+VEHICLE = [
+    {'name': 'Year', 'value': '2016'},
+    {'name': 'Make', 'value': 'Honda'},
+    {'name': 'Model', 'value': 'Fit'}
+]
+
+OTHER_VEHICLE = [
+    {'name': 'Year', 'value': '2017'},
+    {'name': 'Make', 'value': 'Honda'},
+    {'name': 'Model', 'value': 'Fit'}
+]
+
+
+class CompatibilityCacheTest(TestCase):
+    """ Test memoized and deduplicated compatibility checks """
+
+    def test_properties_key(self):
+        self.assertEqual(properties_key(VEHICLE), properties_key(list(reversed(VEHICLE))))
+        self.assertNotEqual(properties_key(VEHICLE), properties_key(OTHER_VEHICLE))
+
+    def test_cached_checks(self):
+        cache = CompatibilityCache()
+        params = compatibility_params(['v1|1|0', 'v1|2|0', 'v1|1|0'], [VEHICLE, OTHER_VEHICLE])
+
+        with MockServer() as server:
+            api = server.client(compatibility_cache=cache)
+            first = api.execute('check_compatibility', params)
+            requests = server.requests
+            second = api.execute('check_compatibility', [{'item_id': 'v1|2|0', 'compatibility_properties': VEHICLE}])
+
+        self.assertEqual(len(first), 6)
+        self.assertTrue(all(response.compatibilityStatus == 'COMPATIBLE' for response in first + second))
+        self.assertEqual(requests, 4)
+        self.assertEqual(server.requests, 4)
+        self.assertEqual(cache.hits, 1)
+
+    def test_sqlite_backend(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite')
+            backend = SQLiteBackend(path)
+            CompatibilityCache(backend=backend).set_many({CompatibilityCache.key('v1|1|0', VEHICLE): 'NOT_COMPATIBLE'})
+            backend.close()
+
+            backend = SQLiteBackend(path)
+            self.assertEqual(CompatibilityCache(backend=backend).get('v1|1|0', VEHICLE), 'NOT_COMPATIBLE')
+            self.assertIsNone(CompatibilityCache(backend=backend).get('v1|1|0', OTHER_VEHICLE))
+
+            backend.delete_expired(float('inf'))
+            self.assertIsNone(CompatibilityCache(backend=backend).get('v1|1|0', VEHICLE))
+            backend.close()
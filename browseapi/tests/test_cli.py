@@ -0,0 +1,123 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+
+from unittest import TestCase
+
+from ..cli import Checkpoint, Runner, build_client, main, parse_args
+from .server import MockServer
+
+CREDENTIALS = ['--app-id', 'app_id', '--cert-id', 'cert_id']
+LINES = [json.dumps({'item_id': 'v1|{}|0'.format(i)}) for i in range(6)]
+
+
+class CLITest(TestCase):
+    """ Test command line bulk runner """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = self.path('params.jsonl')
+        self.output = self.path('items.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def write_input(self, lines: list) -> None:
+        with open(self.input, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+    def read_output(self) -> list:
+        with open(self.output) as file:
+            return [json.loads(line) for line in file]
+
+    def run_main(self, server, *arguments) -> int:
+        argv = ['run', 'get_item', '-i', self.input, '-o', self.output] + CREDENTIALS + list(arguments)
+        return main(argv, server.point(build_client(parse_args(argv))))
+
+    def test_run(self):
+        self.write_input(LINES + ['', 'not json'])
+
+        with MockServer(latency=0.01) as server:
+            code = self.run_main(server, '-c', '2')
+
+        records = self.read_output()
+
+        self.assertEqual(code, 1)
+        self.assertEqual(len(records), 7)
+        self.assertLessEqual(server.max_concurrency, 2)
+
+        responses = sorted((record for record in records if 'response' in record), key=lambda record: record['line'])
+
+        self.assertEqual([record['line'] for record in responses], list(range(1, 7)))
+        self.assertEqual(responses[0]['response']['itemId'], 'v1|0|0')
+        self.assertEqual(responses[0]['params'], {'item_id': 'v1|0|0'})
+        self.assertEqual([record['line'] for record in records if 'error' in record], [8])
+
+    def test_retry(self):
+        async def run():
+            return await runner.run(io.StringIO('\n'.join(LINES[:3])), output)
+
+        output = io.StringIO()
+
+        with MockServer(fail=lambda number: number == 1) as server:
+            args = parse_args(['run', 'get_item'] + CREDENTIALS)
+            runner = Runner(server.point(build_client(args)), 'get_item', retries=2, backoff=0.01)
+            summary = asyncio.run(run())
+
+        self.assertEqual(summary['succeeded'], 3)
+        self.assertEqual(summary['retried'], 1)
+        self.assertEqual(summary['requests'], 4)
+        self.assertIsNotNone(summary['latency']['p99'])
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+
+    def test_retry_exceptions(self):
+        async def run():
+            return await runner.run(io.StringIO(LINES[0]), io.StringIO())
+
+        # passed errors are exceptions without error_records
+
+        with MockServer(fail=lambda number: number == 1) as server:
+            runner = Runner(server.client(), 'get_item', retries=1, backoff=0.01)
+            summary = asyncio.run(run())
+
+        self.assertEqual(summary['succeeded'], 1)
+        self.assertEqual(summary['retried'], 1)
+
+    def test_cache(self):
+        self.write_input(LINES)
+
+        with MockServer() as server:
+            self.run_main(server, '--cache', self.path('cache.sqlite'))
+            first = server.requests
+            self.run_main(server, '--cache', self.path('cache.sqlite'))
+            second = server.requests
+
+            # projected responses are cached separately from the full ones
+
+            self.run_main(server, '--cache', self.path('cache.sqlite'), '--fields', 'itemId')
+
+        self.assertEqual(first, 6)
+        self.assertEqual(second, 6)
+        self.assertEqual(server.requests, 12)
+        self.assertTrue(all(list(record['response']) == ['itemId'] for record in self.read_output()))
+
+    def test_checkpoint(self):
+        self.write_input(LINES)
+        checkpoint = Checkpoint(self.path('checkpoint.json'))
+
+        for line in (1, 2, 3, 5):
+            checkpoint.complete(line)
+
+        checkpoint.save()
+
+        with MockServer() as server:
+            code = self.run_main(server, '--checkpoint', checkpoint.path)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(record['line'] for record in self.read_output()), [4, 6])
+        self.assertEqual(Checkpoint(checkpoint.path).watermark, 6)
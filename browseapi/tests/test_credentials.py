@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+from unittest import TestCase
+
+from .. import exceptions
+from ..client import BrowseAPI
+from ..credentials import Credential, CredentialPool
+from ..limiter import RateLimiter
+from .server import MockServer
+
+
+def pool(**kwargs) -> CredentialPool:
+    return CredentialPool([Credential('app_a', 'cert_a', name='a'), Credential('app_b', 'cert_b', name='b')],
+                          **kwargs)
+
+
+class CredentialPoolTest(TestCase):
+    """ Test credential pool routing and suspension """
+
+    def test_params(self):
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            BrowseAPI('app_id')
+
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            BrowseAPI('app_id', 'cert_id', credentials=pool())
+
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            CredentialPool([Credential('app_a', 'cert_a'), Credential('app_a', 'cert_b')])
+
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            CredentialPool([])
+
+    def test_routing(self):
+        credentials = CredentialPool([Credential('app_a', 'cert_a', daily_quota=100, name='a'),
+                                      Credential('app_b', 'cert_b', daily_quota=10, name='b')])
+
+        with MockServer() as server:
+            api = server.client(credentials=credentials)
+            api.execute('get_item', [{'item_id': str(i)} for i in range(100)])
+
+        # the keyset with more remaining quota is used until the remaining quotas are equal
+
+        self.assertEqual(server.token_requests, 2)
+        self.assertEqual(api.metrics.counters['credentials.a'], 90 + 5)
+        self.assertEqual(api.metrics.counters['credentials.b'], 5)
+        self.assertEqual(credentials.stats()['a']['remaining'], 5)
+
+    def test_suspension(self):
+        credentials = pool(suspend_time=60.)
+
+        with MockServer(fail=lambda number: number == 1) as server:
+            api = server.client(credentials=credentials)
+
+            responses = [api.execute('get_item', [{'item_id': str(i)}], pass_errors=True)[0] for i in range(5)]
+
+        self.assertIsInstance(responses[0].errors[0], exceptions.BrowseAPIAccessError)
+        self.assertEqual(api.metrics.counters['credentials.a'], 1)
+        self.assertEqual(api.metrics.counters['credentials.b'], 4)
+
+        stats = credentials.stats()
+        self.assertTrue(stats['a']['suspended'])
+        self.assertEqual(stats['a']['failures'], 1)
+        self.assertFalse(stats['b']['suspended'])
+
+    def test_denied_token(self):
+        credentials = pool()
+
+        with MockServer(denied=('app_a',)) as server:
+            api = server.client(credentials=credentials)
+            responses = api.execute('get_item', [{'item_id': str(i)} for i in range(4)])
+
+            with self.assertRaises(exceptions.BrowseAPIOAuthError):
+                server.client(credentials=CredentialPool([Credential('app_a', 'cert_a')])).execute(
+                    'get_item', [{'item_id': '1'}]
+                )
+
+        self.assertEqual(len(responses), 4)
+        self.assertEqual(api.metrics.counters['oauth_errors'], 1)
+        self.assertEqual(api.metrics.counters['credentials.b'], 4)
+        self.assertTrue(credentials.stats()['a']['suspended'])
+
+    def test_single_keyset(self):
+        # the only keyset is never suspended
+
+        with MockServer(fail=lambda number: number == 1) as server:
+            api = server.client()
+            responses = [api.execute('get_item', [{'item_id': str(i)}], pass_errors=True)[0] for i in range(2)]
+
+        self.assertTrue(hasattr(responses[0], 'errors'))
+        self.assertEqual(responses[1].itemId, '1')
+
+    def test_rate(self):
+        async def acquire():
+            for _ in range(5):
+                await limiter.acquire()
+
+        limiter = RateLimiter(50, burst=1)
+        started = time.monotonic()
+        asyncio.run(acquire())
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.07)
+        self.assertLess(limiter.tokens, 1)
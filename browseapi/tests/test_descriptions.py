@@ -0,0 +1,94 @@
+import pickle
+
+from unittest import TestCase
+
+from .. import exceptions
+from ..containers import Item
+from ..descriptions import DescriptionStore, StoredText
+from .server import MockServer
+
+DESCRIPTION = '<div><p>Brand new drone with camera and spare batteries.</p></div>' * 200
+
+
+class DescriptionStoreTest(TestCase):
+    """ Test out of line item descriptions """
+
+    def test_params(self):
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            DescriptionStore('gzip')
+
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            DescriptionStore(truncate=-1)
+
+    def test_compress(self):
+        descriptions = DescriptionStore()
+
+        with MockServer(description=DESCRIPTION) as server:
+            api = server.client(descriptions=descriptions)
+            response = api.execute('get_item', [{'item_id': 'v1|1|0'}])[0]
+            group = api.execute('get_items_by_item_group', [{'item_group_id': '100'}])[0]
+
+        self.assertNotIn('description', response.__dict__)
+        self.assertIsInstance(response.__dict__['_description'], StoredText)
+        self.assertEqual(response.description, DESCRIPTION)
+        self.assertEqual(group.items[0].description, DESCRIPTION)
+
+        # decompressed text is not cached in the item
+
+        self.assertNotIn('description', group.items[0].__dict__)
+
+        self.assertEqual(response.to_dict()['description'], DESCRIPTION)
+        self.assertNotIn('_description', response.to_dict())
+
+        # pickled items keep descriptions compressed
+
+        for container in pickle.loads(pickle.dumps(group.items[1])), pickle.loads(pickle.dumps(group)).items[1]:
+            self.assertIsInstance(container.__dict__['_description'], StoredText)
+            self.assertNotIn('description', container.__dict__)
+            self.assertEqual(container.description, DESCRIPTION)
+
+        self.assertLess(len(pickle.dumps(response)), len(DESCRIPTION) / 10)
+        self.assertEqual(pickle.loads(pickle.dumps(response)).description, DESCRIPTION)
+
+        stats = descriptions.stats()
+
+        self.assertEqual(stats['descriptions'], 3)
+        self.assertEqual(stats['compressed'], 3)
+        self.assertEqual(stats['raw_size'], 3 * len(DESCRIPTION))
+        self.assertLess(stats['ratio'], 0.1)
+
+    def test_skip_truncate(self):
+        skipped = DescriptionStore('skip')
+        truncated = DescriptionStore('inline', truncate=100)
+
+        with MockServer(description=DESCRIPTION) as server:
+            skip_response = server.client(descriptions=skipped).execute('get_item', [{'item_id': 'v1|1|0'}])[0]
+            response = server.client(descriptions=truncated).execute('get_item', [{'item_id': 'v1|1|0'}])[0]
+
+        self.assertIsNone(skip_response.description)
+        self.assertNotIn('description', skip_response.to_dict())
+        self.assertEqual(skip_response.title, 'Item v1|1|0')
+        self.assertEqual(response.description, DESCRIPTION[:100])
+        self.assertEqual(skipped.stats()['skipped'], 1)
+        self.assertEqual(truncated.stats()['truncated'], 1)
+
+    def test_small(self):
+        descriptions = DescriptionStore(min_size=1024)
+        item = Item({'itemId': '1', 'description': '<p>Description</p>'})
+        descriptions.store(item)
+
+        self.assertEqual(item.__dict__['description'], '<p>Description</p>')
+        self.assertEqual(descriptions.stats()['compressed'], 0)
+
+        # containers without descriptions keep the usual attributes
+
+        self.assertFalse(hasattr(Item.__new__(Item), 'description'))
+        self.assertIsNone(Item({'itemId': '1'}).description)
+
+    def test_projection(self):
+        with MockServer(description=DESCRIPTION) as server:
+            api = server.client(descriptions=DescriptionStore(truncate=1000, min_size=0))
+            response = api.execute('get_item', [{'item_id': 'v1|1|0'}], fields=['itemId', 'description'])[0]
+
+        self.assertEqual(response.description, DESCRIPTION[:1000])
+        self.assertIn('_description', response.__dict__)
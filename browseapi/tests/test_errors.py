@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from .. import exceptions
+from ..containers import BrowseAPIResponse, ErrorRecord
+from .server import MockServer
+
+
+class ErrorsTest(TestCase):
+    """ Test error classification and lightweight error records """
+
+    def test_classify(self):
+        cases = {
+            1001: exceptions.BrowseAPIRequestOAuthError,
+            1005: None,
+            1100: exceptions.BrowseAPIRequestOAuthError,
+            2004: exceptions.BrowseAPIAccessError,
+            3005: exceptions.BrowseAPIRoutingError,
+            11000: exceptions.BrowseAPIInternalError,
+            11507: exceptions.BrowseAPIRequestParamError,
+            11508: None,
+            12000: exceptions.BrowseAPIInternalError,
+            12013: exceptions.BrowseAPIBusinessError,
+            12022: None,
+            12506: exceptions.BrowseAPIRequestParamError,
+            0: None
+        }
+
+        for error_id, exception_class in cases.items():
+            self.assertIs(exceptions.classify_error(error_id)[0], exception_class)
+
+        response = {'errors': [{'errorId': 12019, 'message': 'Business'}, {'errorId': 99, 'message': 'Other'}]}
+        records = BrowseAPIResponse(response, 'get_item', True, error_records=True).errors
+
+        self.assertEqual(records, [ErrorRecord(12019, 'business', 'Business'), ErrorRecord(99, 'unhandled', 'Other')])
+        self.assertIsInstance(BrowseAPIResponse(response, 'get_item', True).errors[0],
+                              exceptions.BrowseAPIBusinessError)
+
+        with self.assertRaises(exceptions.BrowseAPIBusinessError):
+            BrowseAPIResponse(response, 'get_item', False, error_records=True)
+
+    def test_counters(self):
+        with MockServer(fail=lambda number: number % 2) as server:
+            api = server.client(error_records=True)
+            responses = api.execute('get_item', [{'item_id': 'v1|{}|0'.format(i)} for i in range(4)], pass_errors=True)
+
+        errors = [response.errors[0] for response in responses if hasattr(response, 'errors')]
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0].category, 'access')
+        self.assertEqual(api.metrics.group('errors'), {'2001': 2})
@@ -0,0 +1,47 @@
+import pickle
+
+from unittest import TestCase
+
+from ..containers import BrowseAPIResponse
+from ..expansion import GroupExpander
+from ..serialization import dumps, loads
+from .server import MockServer
+
+
+class GroupExpanderTest(TestCase):
+    """ Test item group expansion """
+
+    def test_expand(self):
+        expander = GroupExpander(concurrency=2)
+
+        with MockServer() as server:
+            api = server.client()
+            responses = api.execute('search', [{'q': 'drone'}, {'q': 'quadcopter'}], expander=expander)
+
+        summaries = [summary for response in responses for summary in response.itemSummaries]
+        group_paths = [path for path in server.paths if 'item_group_id' in path]
+
+        self.assertEqual(len(group_paths), 1)
+        self.assertEqual(expander.requested, 1)
+        self.assertEqual(expander.reused, 3)
+        self.assertEqual(len(expander), 1)
+
+        for summary in summaries:
+            self.assertEqual([item.itemId for item in summary.groupItems], ['v1|100|1', 'v1|100|2'])
+
+        # group items are kept by pickle and raw json round trips
+
+        for response in (pickle.loads(pickle.dumps(responses[0])),
+                         BrowseAPIResponse.from_dict(responses[0].to_dict(), 'search'),
+                         loads(dumps(responses[0]))):
+            self.assertEqual([item.itemId for item in response.itemSummaries[0].groupItems], ['v1|100|1', 'v1|100|2'])
+
+    def test_errors(self):
+        expander = GroupExpander()
+
+        with MockServer(fail=lambda number: number > 1) as server:
+            api = server.client()
+            responses = api.execute('search', [{'q': 'drone'}], pass_errors=True, expander=expander)
+
+        self.assertFalse(hasattr(responses[0].itemSummaries[0], 'groupItems'))
+        self.assertIn('100', expander.errors)
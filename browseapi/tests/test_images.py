@@ -0,0 +1,49 @@
+import json
+import os
+
+from base64 import b64encode, encodebytes
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ..exceptions import BrowseAPIParamError
+from ..images import image_body
+from .server import MockServer
+
+IMAGE = bytes(range(256)) * 64
+
+
+class ImageTest(TestCase):
+    """ Test image arguments of search_by_image """
+
+    def test_image_body(self):
+        expected = b'{"image":"' + b64encode(IMAGE) + b'"}'
+
+        self.assertEqual(image_body(IMAGE), expected)
+        self.assertEqual(image_body(memoryview(IMAGE)), expected)
+        self.assertEqual(image_body(b64encode(IMAGE).decode()), expected)
+        self.assertRaises(BrowseAPIParamError, image_body, 42)
+
+        # wrapped base64 lines are joined, other strings are rejected
+
+        self.assertEqual(image_body(encodebytes(IMAGE).decode()), expected)
+        self.assertEqual(json.loads(image_body(encodebytes(IMAGE).decode()))['image'], b64encode(IMAGE).decode())
+        self.assertRaises(BrowseAPIParamError, image_body, 'missing/image.jpg')
+        self.assertRaises(BrowseAPIParamError, image_body, 'изображение')
+
+    def test_search_by_image(self):
+        encoded = b64encode(IMAGE).decode()
+
+        with TemporaryDirectory() as directory, MockServer() as server:
+            path = os.path.join(directory, 'image.jpg')
+
+            with open(path, 'wb') as file:
+                file.write(IMAGE)
+
+            api = server.client()
+            params = [{'image': image, 'limit': 10} for image in (IMAGE, bytearray(IMAGE), path, Path(path), encoded)]
+            responses = api.execute('search_by_image', params)
+
+        self.assertEqual(len(responses), 5)
+        self.assertEqual(server.bodies, [('application/json', {'image': encoded})] * 5)
+        self.assertTrue(all('limit=10' in path for path in server.paths))
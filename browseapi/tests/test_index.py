@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from ..containers import BrowseAPIResponse, ItemSummary
+from ..exceptions import BrowseAPIParamError
+from ..index import ItemIndex
+
+
+def summary(number: int, price: str, seller: str, category: str, country: str = 'US') -> ItemSummary:
+    return ItemSummary({
+        'itemId': 'v1|{}|0'.format(number),
+        'price': {'value': price, 'currency': 'USD'},
+        'seller': {'username': seller},
+        'categories': [{'categoryId': category}, {'categoryId': '1'}],
+        'conditionId': '1000' if number % 2 else '3000',
+        'itemLocation': {'country': country}
+    })
+
+
+class ItemIndexTest(TestCase):
+    """ Test local queries over fetched items """
+
+    def setUp(self) -> None:
+        self.index = ItemIndex()
+
+        for number in range(100):
+            self.index.add(summary(number, '{}.99'.format(number), 'seller{}'.format(number % 5),
+                                   str(100 + number % 3), 'DE' if number % 10 == 0 else 'US'))
+
+    def ids(self, items: list) -> list:
+        return [int(item.itemId.split('|')[1]) for item in items]
+
+    def test_filter(self):
+        items = self.index.filter(seller='seller1', category_id=101, min_price=10, max_price=40)
+        self.assertEqual(self.ids(items), [16, 31])
+
+        items = self.index.filter(country='DE', sort='-price', limit=3)
+        self.assertEqual(self.ids(items), [90, 80, 70])
+
+        items = self.index.filter(condition_id='3000', min_price=95)
+        self.assertEqual(self.ids(items), [96, 98])
+
+        self.assertEqual(len(self.index.filter(category_id='1')), 100)
+        self.assertEqual(self.index.filter(seller='nobody'), [])
+        self.assertRaises(BrowseAPIParamError, self.index.filter, sort='title')
+
+    def test_top(self):
+        self.assertEqual(self.ids(self.index.cheapest(2)), [0, 1])
+        self.assertEqual(self.ids(self.index.most_expensive(2)), [99, 98])
+
+    def test_update(self):
+        self.index.add(summary(99, '0.01', 'seller0', '100'))
+        self.assertEqual(len(self.index), 100)
+        self.assertEqual(self.ids(self.index.cheapest(1)), [99])
+        self.assertEqual(self.ids(self.index.filter(seller='seller4', min_price=90)), [94])
+
+        self.index.add_response(BrowseAPIResponse({
+            'itemId': 'v1|1000|0', 'categoryId': '100', 'price': {'value': '5.00', 'currency': 'USD'}
+        }, 'get_item', False))
+
+        self.assertIn('v1|1000|0', self.index)
+        self.assertEqual(self.ids(self.index.filter(category_id='100', max_price=5)), [0, 3, 99, 1000])
+
+    def test_buffered_prices(self):
+        # replacements and additions between queries are merged into the sorted prices
+
+        for number in range(0, 200, 3):
+            self.index.add(summary(number, '{}.50'.format(200 - number), 'seller0', '100'))
+
+        self.index.add(summary(3, '7.25', 'seller0', '100'))
+        self.index.add(summary(3, '1000.00', 'seller0', '100'))
+
+        prices = sorted(item.price.float_value for item in self.index.filter())
+
+        self.assertEqual([item.price.float_value for item in self.index.filter(sort='price')], prices)
+        self.assertEqual(self.ids(self.index.most_expensive(1)), [3])
+        self.assertEqual(len(self.index.filter(min_price=0, max_price=2000)), len(self.index))
+
+        self.index.add(summary(3, '0.10', 'seller0', '100'))
+        self.assertEqual(self.ids(self.index.cheapest(1)), [3])
+        self.assertEqual(len(self.index.filter(min_price=999)), 0)
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from ..containers import BrowseAPIResponse
+from ..exceptions import BrowseAPIParamError
+from ..limiter import AdaptiveLimiter
+from .server import MockServer
+
+
+class LimiterTest(TestCase):
+    """ Test AIMD limit adjustment """
+
+    def test_init_params(self):
+        self.assertRaises(BrowseAPIParamError, AdaptiveLimiter, initial_limit=0)
+        self.assertRaises(BrowseAPIParamError, AdaptiveLimiter, initial_limit=10, max_limit=5)
+        self.assertRaises(BrowseAPIParamError, AdaptiveLimiter, backoff=1)
+
+    def test_increase(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=4, latency_target=1)
+
+        for _ in range(20):
+            while limiter.try_acquire():
+                pass
+
+            for _ in range(limiter.in_flight):
+                limiter.release(0.1)
+
+        self.assertEqual(limiter.limit, 4)
+
+    def test_no_increase_on_slow_responses(self):
+        limiter = AdaptiveLimiter(initial_limit=2, latency_target=1)
+
+        for _ in range(10):
+            while limiter.try_acquire():
+                pass
+
+            for _ in range(limiter.in_flight):
+                limiter.release(5)
+
+        self.assertEqual(limiter.limit, 2)
+
+    def test_decrease(self):
+        limiter = AdaptiveLimiter(initial_limit=8)
+
+        for _ in range(8):
+            limiter.try_acquire()
+
+        limiter.release(0.1, failed=True)
+        self.assertEqual(limiter.limit, 4)
+
+        # requests sent under the previous limit do not decrease it again
+
+        limiter.release(0.1, failed=True)
+        self.assertEqual(limiter.limit, 4)
+
+
+class LimiterServerTest(TestCase):
+    """ Test limiter against the local server with injected latency and throttling """
+
+    def test_healthy_server(self):
+        with MockServer(latency=0.01) as server:
+            api = server.client(limiter=AdaptiveLimiter(initial_limit=2, max_limit=8))
+            responses = api.execute('search', [{'q': 'drone'}] * 200)
+
+        self.assertEqual(len(responses), 200)
+        self.assertIsInstance(responses[0], BrowseAPIResponse)
+        self.assertEqual(api.metrics.read_gauge('concurrency_limit'), 8)
+        self.assertLessEqual(server.max_concurrency, 8)
+
+    def test_throttling_server(self):
+        with MockServer(latency=0.01, fail=lambda number: number > 20) as server:
+            api = server.client(limiter=AdaptiveLimiter(initial_limit=16))
+            api.execute('search', [{'q': 'drone'}] * 60, pass_errors=True)
+
+        self.assertLess(api.metrics.read_gauge('concurrency_limit'), 16)
+        self.assertGreater(api.metrics.counters['backoffs'], 0)
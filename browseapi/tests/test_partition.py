@@ -0,0 +1,90 @@
+import asyncio
+
+from unittest import TestCase
+
+from .. import exceptions
+from ..partition import SearchPartitioner, join_filter, split_filter
+from ..sweep import Sweep
+from .server import MockServer
+
+# 200 items in two categories, every tenth item is listed in both
+CATALOG = [{
+    'itemId': 'v1|{}|0'.format(i),
+    'price': {'value': '{:.2f}'.format(1 + i), 'currency': 'USD'},
+    'conditionId': '1000' if i % 2 else '3000',
+    'categories': [{'categoryId': 'A' if i < 150 else 'B'}] + ([{'categoryId': 'B'}] if i < 150 and not i % 10 else [])
+} for i in range(200)]
+
+
+class SearchPartitionerTest(TestCase):
+    """ Test search partition planner """
+
+    def run_partitioner(self, partitioner, method: str, params: dict, **kwargs):
+        async def run():
+            async with api:
+                return await getattr(partitioner, method)(api, params, **kwargs)
+
+        with MockServer(catalog=CATALOG) as server:
+            api = server.client()
+            return asyncio.run(run()), server
+
+    def test_filter(self):
+        fields = split_filter('price:[10..50],priceCurrency:USD,conditionIds:{1000|3000},sellers:{a,b}')
+
+        self.assertEqual(fields, {
+            'price': '[10..50]', 'priceCurrency': 'USD', 'conditionIds': '{1000|3000}', 'sellers': '{a,b}'
+        })
+
+        self.assertEqual(split_filter(join_filter(fields)), fields)
+        self.assertEqual(split_filter(None), {})
+
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            SearchPartitioner(strategies=('seller',))
+
+    def test_small_query(self):
+        partitioner = SearchPartitioner(cap=1000)
+        partitions, server = self.run_partitioner(partitioner, 'plan', {'q': 'drone'})
+
+        self.assertEqual(partitions, [({'q': 'drone'}, 200)])
+        self.assertEqual(partitioner.probes, 1)
+
+    def test_harvest(self):
+        sweep = Sweep()
+        partitioner = SearchPartitioner(cap=40, page_size=20)
+        items, server = self.run_partitioner(partitioner, 'harvest', {'q': 'drone'}, sweep=sweep)
+
+        self.assertEqual(sorted(item.itemId for item in items), sorted(item['itemId'] for item in CATALOG))
+        self.assertGreater(sweep.duplicates, 0)
+        self.assertFalse(partitioner.truncated)
+
+        for partition in partitioner.partitions:
+            self.assertLessEqual(partition.total, 40)
+
+        filters = [split_filter(partition.params.get('filter')) for partition in partitioner.partitions]
+
+        self.assertTrue(all(partition.params['category_ids'] in ('A', 'B') for partition in partitioner.partitions))
+        self.assertTrue(any('conditionIds' in fields for fields in filters))
+        self.assertTrue(any('price' in fields for fields in filters))
+
+        page_paths = [path for path in server.paths if 'limit=20' in path]
+        self.assertEqual(len(page_paths), sum((partition.total + 19) // 20 for partition in partitioner.partitions))
+
+    def test_price_only(self):
+        partitioner = SearchPartitioner(cap=30, strategies=('price',))
+        partitions, server = self.run_partitioner(partitioner, 'plan', {'q': 'drone', 'filter': 'priceCurrency:EUR'})
+        ranges = []
+
+        for partition in partitions:
+            fields = split_filter(partition.params['filter'])
+            self.assertEqual(fields['priceCurrency'], 'EUR')
+            ranges.append(fields['price'])
+
+        self.assertEqual(sum(partition.total for partition in partitions), len(CATALOG))
+        self.assertEqual(len(set(ranges)), len(ranges))
+
+    def test_truncated(self):
+        partitioner = SearchPartitioner(cap=30, strategies=('category',))
+        partitions, server = self.run_partitioner(partitioner, 'plan', {'q': 'drone'})
+
+        self.assertEqual(partitioner.stats()['truncated'], 2)
+        self.assertEqual(partitioner.stats()['planned'], 60)
@@ -0,0 +1,90 @@
+import asyncio
+
+from unittest import TestCase
+
+from .. import exceptions
+from ..pipeline import Pipeline
+from ..sinks import Sink
+from .server import MockServer
+
+PROPERTIES = [{'name': 'Year', 'value': '2016'}]
+
+
+def build(api, **kwargs) -> Pipeline:
+    return (Pipeline(api)
+            .stage('search', concurrency=2)
+            .stage('get_item', lambda response: [{'item_id': item.itemId} for item in response.itemSummaries],
+                   concurrency=4, queue_size=2, **kwargs)
+            .stage('check_compatibility',
+                   lambda item: [{'item_id': item.itemId, 'compatibility_properties': PROPERTIES}], concurrency=4))
+
+
+class ListSink(Sink):
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    def write_batch(self, rows: list) -> None:
+        self.written.extend(rows)
+
+
+class PipelineTest(TestCase):
+    """ Test multi-stage streaming pipeline """
+
+    def run_pipeline(self, server, **kwargs):
+        async def run():
+            async with api:
+                return await pipeline.collect([{'q': 'drone', 'offset': offset} for offset in range(5)])
+
+        api = server.client()
+        pipeline = build(api, **kwargs)
+        return pipeline, asyncio.run(run())
+
+    def test_pipeline(self):
+        with MockServer(latency=0.01) as server:
+            pipeline, results = self.run_pipeline(server)
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual({params['item_id'] for params, _ in results}, {'v1|1|0', 'v1|2|0'})
+        self.assertTrue(all(response.compatibilityStatus == 'COMPATIBLE' for _, response in results))
+
+        stats = pipeline.stats()
+        self.assertEqual([stats[name]['processed'] for name in ('search', 'get_item', 'check_compatibility')],
+                         [5, 10, 10])
+        self.assertEqual(stats['get_item']['depth'], 0)
+        self.assertGreater(stats['search']['throughput'], 0)
+        self.assertEqual(pipeline.metrics.counters['processed.get_item'], 10)
+
+    def test_sink(self):
+        sink = ListSink()
+
+        # written responses of the middle stage are not turned into params
+
+        with MockServer() as server:
+            with sink:
+                pipeline, results = self.run_pipeline(server, sink=sink)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(sink.written), 10)
+        self.assertEqual(pipeline.stats()['get_item']['processed'], 10)
+        self.assertEqual(pipeline.stats()['check_compatibility']['processed'], 0)
+
+    def test_errors(self):
+        with MockServer(fail=lambda number: number == 7) as server:
+            pipeline, results = self.run_pipeline(server, pass_errors=True)
+
+        self.assertEqual(pipeline.stats()['get_item']['errors'] + len(results), 10)
+
+        with MockServer(fail=lambda number: number == 7) as server:
+            with self.assertRaises(exceptions.BrowseAPIAccessError):
+                self.run_pipeline(server)
+
+    def test_params(self):
+        with MockServer() as server:
+            pipeline = Pipeline(server.client()).stage('search')
+
+            with self.assertRaises(exceptions.BrowseAPIParamError):
+                pipeline.stage('get_item')
+
+            with self.assertRaises(exceptions.BrowseAPIMethodError):
+                pipeline.stage('get_items', lambda response: [])
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from .. import exceptions
+from ..limiter import AdaptiveLimiter
+from ..policy import FailurePolicy
+from .server import MockServer
+
+
+def item_params(count: int) -> list:
+    return [{'item_id': 'v1|{}|0'.format(number)} for number in range(count)]
+
+
+class FailurePolicyTest(TestCase):
+    """ Test early abort of the batches """
+
+    def client(self, server):
+        return server.client(limiter=AdaptiveLimiter(initial_limit=2, max_limit=2))
+
+    def test_fatal(self):
+        with MockServer(latency=0.01, fail=lambda number: number == 3, error_id=2002) as server:
+            api = self.client(server)
+
+            with self.assertRaises(exceptions.BrowseAPIAbortError) as context:
+                api.execute('get_item', item_params(50), pass_errors=True, policy=FailurePolicy())
+
+        self.assertEqual(context.exception.reason, 'fatal error')
+        self.assertIsInstance(context.exception.error.errors[0], exceptions.BrowseAPIAccessError)
+        self.assertEqual(len(context.exception.results), 50)
+        self.assertLess(server.requests, 10)
+        self.assertGreater(api.metrics.counters['cancelled'], 0)
+
+    def test_throttled(self):
+        # throttling is transient, the batch is not stopped by it
+
+        with MockServer(latency=0.01, fail=lambda number: number == 3) as server:
+            responses = self.client(server).execute('get_item', item_params(10), pass_errors=True,
+                                                    policy=FailurePolicy())
+
+        self.assertEqual(len([response for response in responses if hasattr(response, 'errors')]), 1)
+        self.assertEqual(server.requests, 10)
+        self.assertIsNone(FailurePolicy().abort_reason(exceptions.BrowseAPIAccessError, 1, 1, 2001))
+
+    def test_limits(self):
+        policies = {
+            'error limit': FailurePolicy(fatal=(), max_errors=3),
+            'error rate': FailurePolicy(fatal=(), max_error_rate=0.2, min_requests=10)
+        }
+
+        for reason, policy in policies.items():
+            with MockServer(latency=0.01, fail=lambda number: number % 2) as server:
+                with self.assertRaises(exceptions.BrowseAPIAbortError) as context:
+                    self.client(server).execute('get_item', item_params(50), pass_errors=True, policy=policy)
+
+            self.assertEqual(context.exception.reason, reason)
+            self.assertLess(server.requests, 20)
+
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            FailurePolicy(max_error_rate=2)
+
+    def test_fail_fast(self):
+        with MockServer(latency=0.01, fail=lambda number: number == 1) as server:
+            with self.assertRaises(exceptions.BrowseAPIAccessError):
+                self.client(server).execute('get_item', item_params(50))
+
+        self.assertLess(server.requests, 10)
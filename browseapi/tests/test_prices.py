@@ -0,0 +1,39 @@
+from decimal import Decimal
+from math import isnan
+from unittest import TestCase
+
+from ..containers import BrowseAPIResponse, ConvertedAmount, MarketingPrice
+
+
+class PricesTest(TestCase):
+    """ Test typed amounts and bulk price conversion """
+
+    def test_typed(self):
+        amount = ConvertedAmount({'value': '10.005', 'currency': 'USD'})
+
+        self.assertNotIn('decimal_value', amount.__dict__)
+        self.assertEqual(amount.decimal_value, Decimal('10.005'))
+        self.assertEqual(amount.float_value, 10.005)
+        self.assertEqual(amount.cents, 1001)
+        self.assertIn('cents', amount.__dict__)
+        self.assertEqual(amount.value, '10.005')
+
+        self.assertIsNone(ConvertedAmount({}).cents)
+        self.assertEqual(MarketingPrice({'discountPercentage': '15'}).discount_percentage_value, Decimal(15))
+
+    def test_prices(self):
+        response = BrowseAPIResponse({
+            'href': '', 'limit': 3, 'offset': 0, 'total': 3,
+            'itemSummaries': [
+                {'itemId': 'v1|1|0', 'price': {'value': '10.50', 'currency': 'USD'}},
+                {'itemId': 'v1|2|0'},
+                {'itemId': 'v1|3|0', 'price': {'value': '7', 'currency': 'USD'}}
+            ]
+        }, 'search', False)
+
+        prices = response.prices()
+
+        self.assertEqual(prices.typecode, 'd')
+        self.assertEqual((prices[0], prices[2]), (10.5, 7.))
+        self.assertTrue(isnan(prices[1]))
+        self.assertEqual(len(response.prices('currentBidPrice')), 3)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+from unittest import TestCase
+
+from ..profiling import Profiler, ProfiledResponses
+from ..sinks import JSONLSink
+from .server import MockServer
+
+
+class ProfilerTest(TestCase):
+    """ Test execute profiling mode """
+
+    def test_report(self):
+        with MockServer(latency=0.02) as server:
+            api = server.client()
+            responses = api.execute('search', [{'q': 'drone'}] * 5, profile=Profiler(sample_interval=0.001))
+            plain = api.execute('search', [{'q': 'drone'}])
+
+        self.assertIsInstance(responses, ProfiledResponses)
+        self.assertNotIsInstance(plain, ProfiledResponses)
+        self.assertEqual(len(responses), 5)
+        self.assertEqual(responses[0].total, 2)
+
+        report = responses.profile.report()
+
+        self.assertEqual(report['phases']['queue']['count'], 5)
+        self.assertEqual(report['phases']['network']['count'], 5)
+        self.assertEqual(report['phases']['parse']['count'], 5)
+        self.assertEqual(report['phases']['callbacks']['count'], 0)
+        self.assertGreaterEqual(report['phases']['network']['mean'], 0.02)
+        self.assertGreater(report['phases']['parse']['cpu'], 0)
+        self.assertGreaterEqual(report['elapsed'], 0.02)
+        self.assertGreater(report['loop_lag']['samples'], 0)
+        self.assertIsNone(report['memory'])
+
+        folded = responses.profile.folded()
+
+        self.assertGreater(report['stack_samples'], 0)
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in folded))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stacks.folded')
+            responses.profile.dump(path)
+
+            with open(path) as file:
+                self.assertEqual(file.read().splitlines(), folded)
+
+    def test_memory(self):
+        with MockServer() as server, tempfile.TemporaryDirectory() as directory:
+            api = server.client()
+            responses = api.execute('search', [{'q': 'drone'}] * 3, profile=Profiler(memory=True))
+
+            with JSONLSink(os.path.join(directory, 'items.jsonl.gz')) as sink:
+                written = api.execute('search', [{'q': 'drone'}] * 3, sink=sink, profile=True)
+
+        memory = responses.profile.report()['memory']
+
+        self.assertGreater(memory['peak'], 0)
+        self.assertIn('ItemSummary', memory['containers'])
+        self.assertGreater(memory['containers']['ItemSummary']['size'], 0)
+        self.assertEqual(written.profile.report()['phases']['callbacks']['count'], 3)
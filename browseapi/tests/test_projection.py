@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from .. import exceptions
+from ..containers import ConvertedAmount, Item, Seller, ShippingOption
+from ..projection import Projection
+from .server import MockServer
+
+ITEM = {
+    'itemId': 'v1|1|0',
+    'title': 'Drone',
+    'price': {'value': '10.50', 'currency': 'USD', 'convertedFromValue': '9.80'},
+    'seller': {'username': 'seller', 'feedbackScore': 100},
+    'shippingOptions': [{'shippingCost': {'value': '1.00', 'currency': 'USD'}, 'type': 'Standard'},
+                        {'shippingCost': {'value': '5.00', 'currency': 'USD'}, 'type': 'Expedited'}],
+    'product': {'title': 'Drone product'}
+}
+
+
+class ProjectionTest(TestCase):
+    """ Test field projection """
+
+    def test_item(self):
+        projection = Projection(['itemId', 'price.value', 'seller', 'shippingOptions.shippingCost.value'])
+        item = projection.item(ITEM)
+
+        self.assertIsInstance(item, Item)
+        self.assertEqual(item.itemId, 'v1|1|0')
+        self.assertFalse(hasattr(item, 'title'))
+        self.assertFalse(hasattr(item, 'product'))
+
+        self.assertIsInstance(item.price, ConvertedAmount)
+        self.assertEqual(item.price.float_value, 10.5)
+        self.assertIsNone(item.price.currency)
+
+        self.assertEqual(item.seller.feedbackScore, 100)
+        self.assertIsInstance(item.shippingOptions[1], ShippingOption)
+        self.assertEqual([option.shippingCost.value for option in item.shippingOptions], ['1.00', '5.00'])
+        self.assertIsNone(item.shippingOptions[0].type)
+
+        summary = projection.summary(ITEM)
+        self.assertIsInstance(summary.seller, Seller)
+        self.assertEqual(summary.to_dict()['price'], {'value': '10.50'})
+
+    def test_paths(self):
+        self.assertEqual(Projection(['price.value', 'price']).item(ITEM).price.currency, 'USD')
+        self.assertEqual(Projection(['price', 'price.value']).item(ITEM).price.currency, 'USD')
+
+        for fields in ([], ['price..value'], [None]):
+            with self.assertRaises(exceptions.BrowseAPIParamError):
+                Projection(fields)
+
+    def test_fieldgroups(self):
+        compact = Projection(['itemId', 'price.value'])
+        detailed = Projection(['itemId', 'title'])
+
+        self.assertEqual(compact.prepare('get_item', {'item_id': '1'}), {'item_id': '1', 'fieldgroups': 'COMPACT'})
+        self.assertEqual(detailed.prepare('get_item', {'item_id': '1', 'fieldgroups': 'PRODUCT'}),
+                         {'item_id': '1', 'fieldgroups': None})
+
+        self.assertEqual(Projection(['product.title']).prepare('get_item', {'item_id': '1', 'fieldgroups': 'PRODUCT'}),
+                         {'item_id': '1', 'fieldgroups': 'PRODUCT'})
+
+        self.assertEqual(detailed.prepare('search', {'q': 'drone', 'fieldgroups': 'EXTENDED,CATEGORY_REFINEMENTS'}),
+                         {'q': 'drone', 'fieldgroups': 'CATEGORY_REFINEMENTS'})
+
+        self.assertEqual(detailed.prepare('search', {'q': 'drone', 'fieldgroups': 'EXTENDED'}),
+                         {'q': 'drone', 'fieldgroups': 'MATCHING_ITEMS'})
+
+    def test_execute(self):
+        with MockServer() as server:
+            api = server.client()
+            searches = api.execute('search', [{'q': 'drone'}], fields=['itemId', 'price.value'])
+            items = api.execute('get_item', [{'item_id': 'v1|1|0'}], fields=['itemId', 'price'])
+            groups = api.execute('get_items_by_item_group', [{'item_group_id': '100'}], fields=['itemId'])
+
+            with self.assertRaises(exceptions.BrowseAPIParamError):
+                api.execute('check_compatibility', [{'item_id': '1', 'compatibility_properties': []}],
+                            fields=['itemId'])
+
+        summary = searches[0].itemSummaries[0]
+
+        self.assertEqual(searches[0].total, 2)
+        self.assertEqual(summary.price.value, '10.50')
+        self.assertFalse(hasattr(summary, 'title'))
+        self.assertFalse(hasattr(summary, 'itemGroupHref'))
+
+        self.assertEqual(items[0].price.currency, 'USD')
+        self.assertFalse(hasattr(items[0], 'description'))
+        self.assertIn('fieldgroups=COMPACT', [path for path in server.paths if '/item/v1' in path][0])
+
+        self.assertEqual([item.itemId for item in groups[0].items], ['v1|100|1', 'v1|100|2'])
+        self.assertFalse(hasattr(groups[0].items[0], 'primaryItemGroup'))
@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+from unittest import TestCase
+
+from .. import exceptions
+from ..client import BrowseAPI
+from ..replay import RecordingTransport, ReplayTransport
+from ..transport import AiohttpTransport
+from .server import MockServer
+
+PARAMS = {
+    'search': [{'q': 'drone', 'limit': 2}],
+    'get_item': [{'item_id': 'v1|1|0'}, {'item_id': 'v1|2|0'}],
+    'check_compatibility': [{'item_id': 'v1|1|0', 'compatibility_properties': [{'name': 'Year', 'value': '2016'}]}]
+}
+
+
+def fields(response) -> tuple:
+    summaries = getattr(response, 'itemSummaries', ())
+    item = getattr(response, 'itemId', None), getattr(response, 'title', None)
+    return item, getattr(response, 'compatibilityStatus', None), [summary.itemId for summary in summaries]
+
+
+class ReplayTest(TestCase):
+    """ Test recording and network-free replay of responses """
+
+    def setUp(self) -> None:
+        file, self.path = tempfile.mkstemp()
+        os.close(file)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def test_replay(self):
+        recorder = RecordingTransport(AiohttpTransport(), self.path)
+
+        with MockServer() as server:
+            api = server.client(transport=recorder)
+            recorded = {method: api.execute(method, params) for method, params in PARAMS.items()}
+
+        # token request and four distinct API requests
+
+        self.assertEqual(len(recorder), 5)
+
+        replay = ReplayTransport(self.path, latency=0.001)
+        api = BrowseAPI('app_id', 'cert_id', transport=replay)
+
+        for method, params in PARAMS.items():
+            # params order and the host do not change the key
+
+            replayed = api.execute(method, [dict(reversed(list(param.items()))) for param in params])
+            self.assertEqual([fields(response) for response in replayed],
+                             [fields(response) for response in recorded[method]])
+
+        # three token requests and four API requests
+
+        self.assertEqual(replay.requests, 7)
+
+        with self.assertRaises(exceptions.BrowseAPIRequestError):
+            api.execute('get_item', [{'item_id': 'v1|3|0'}])
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from unittest import TestCase
+
+from ..exceptions import BrowseAPIDeadlineError, BrowseAPIParamError
+from ..limiter import AdaptiveLimiter
+from ..scheduler import Scheduler
+from .server import MockServer
+
+
+class SchedulerTest(TestCase):
+    """ Test priority admission and deadlines """
+
+    def test_priority_order(self):
+        async def run():
+            scheduler = Scheduler(AdaptiveLimiter(initial_limit=1, max_limit=1))
+            order = []
+
+            async def request(priority, name):
+                await scheduler.acquire(priority)
+                order.append(name)
+                await asyncio.sleep(0)
+                scheduler.release(0.01)
+
+            await asyncio.gather(
+                request('bulk', 'bulk1'),
+                request('bulk', 'bulk2'),
+                request('bulk', 'bulk3'),
+                request('interactive', 'interactive')
+            )
+
+            return order, scheduler.stats()
+
+        order, stats = asyncio.run(run())
+        self.assertEqual(order, ['bulk1', 'interactive', 'bulk2', 'bulk3'])
+        self.assertEqual(stats['bulk']['admitted'], 3)
+        self.assertEqual(stats['interactive']['depth'], 0)
+
+    def test_deadline(self):
+        async def run():
+            scheduler = Scheduler(AdaptiveLimiter(initial_limit=1, max_limit=1))
+            await scheduler.acquire('bulk')
+
+            with self.assertRaises(BrowseAPIDeadlineError):
+                await scheduler.acquire('interactive', time.monotonic() + 0.01)
+
+            with self.assertRaises(BrowseAPIDeadlineError):
+                await scheduler.acquire('interactive', time.monotonic() - 1)
+
+            scheduler.release(0.01)
+            await scheduler.acquire('bulk')
+            return scheduler.stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(stats['interactive']['dropped'], 2)
+        self.assertEqual(stats['interactive']['depth'], 0)
+
+    def test_unknown_priority(self):
+        self.assertRaises(BrowseAPIParamError, asyncio.run, Scheduler().acquire('realtime'))
+
+
+class SchedulerServerTest(TestCase):
+    """ Test interactive requests overtaking a bulk batch on the shared client """
+
+    def test_interactive_overtakes_bulk(self):
+        async def run(api):
+            async with api:
+                bulk = asyncio.ensure_future(api.execute_async('search', [{'q': 'drone'}] * 100))
+                await asyncio.sleep(0.05)
+                item = await api.execute_async('get_item', [{'item_id': 'v1|1|0'}], priority='interactive')
+                return item, bulk.done(), await bulk
+
+        with MockServer(latency=0.01) as server:
+            limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+            item, bulk_done, bulk = asyncio.run(run(server.client(scheduler=Scheduler(limiter))))
+
+        self.assertEqual(item[0].itemId, 'v1|1|0')
+        self.assertFalse(bulk_done)
+        self.assertEqual(len(bulk), 100)
+
+    def test_expired_requests_are_not_sent(self):
+        with MockServer(latency=0.05) as server:
+            api = server.client(limiter=AdaptiveLimiter(initial_limit=1, max_limit=1))
+            responses = api.execute('search', [{'q': 'drone'}] * 10, pass_errors=True, timeout=0.12)
+
+        self.assertIsInstance(responses[-1], BrowseAPIDeadlineError)
+        self.assertLess(server.requests, 10)
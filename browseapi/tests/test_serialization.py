@@ -0,0 +1,73 @@
+import pickle
+
+from unittest import TestCase
+
+from .. import exceptions
+from ..containers import BrowseAPIResponse, ErrorRecord, Item
+from ..serialization import dumps, get_serializer, loads
+
+SEARCH = {
+    'href': 'https://api.ebay.com/buy/browse/v1/item_summary/search?q=drone',
+    'limit': 2,
+    'offset': 0,
+    'total': 2,
+    'refinement': {
+        'dominantCategoryId': '179697',
+        'conditionDistributions': [{'condition': 'New', 'conditionId': '1000', 'matchCount': 2}]
+    },
+    'itemSummaries': [
+        {
+            'itemId': 'v1|1|0',
+            'title': 'Drone',
+            'price': {'value': '10.50', 'currency': 'USD'},
+            'seller': {'username': 'seller', 'feedbackScore': 10},
+            'categories': [{'categoryId': '179697'}],
+            'buyingOptions': ['FIXED_PRICE']
+        },
+        {'itemId': 'v1|2|0', 'title': 'Drone 2'}
+    ]
+}
+
+
+class SerializationTest(TestCase):
+    """ Test round-trip serialization of containers """
+
+    def test_to_dict(self):
+        response = BrowseAPIResponse(SEARCH, 'search', False)
+        response.itemSummaries[0].price.cents
+
+        self.assertEqual(response.to_dict(), SEARCH)
+        self.assertEqual(BrowseAPIResponse.from_dict(SEARCH).to_dict(), SEARCH)
+        self.assertEqual(loads(dumps(response)).to_dict(), SEARCH)
+
+        item = Item({'itemId': 'v1|1|0', 'price': {'value': '1.00', 'currency': 'USD'}})
+        self.assertEqual(loads(dumps(item), Item).price.value, '1.00')
+
+        with self.assertRaises(exceptions.BrowseAPIParamError):
+            get_serializer('xml')
+
+    def test_pickle(self):
+        response = pickle.loads(pickle.dumps(BrowseAPIResponse(SEARCH, 'search', False)))
+
+        self.assertEqual(response.itemSummaries[1].itemId, 'v1|2|0')
+        self.assertEqual(response.to_dict(), SEARCH)
+
+        errors = {'errors': [{'errorId': 11001, 'message': 'Bad param'}, {'errorId': 5, 'message': 'Other'}]}
+
+        response = pickle.loads(pickle.dumps(BrowseAPIResponse(errors, 'get_item', True)))
+        self.assertIsInstance(response.errors[0], exceptions.BrowseAPIRequestParamError)
+        self.assertEqual(response.errors[1].error.errorId, 5)
+
+        response = pickle.loads(pickle.dumps(BrowseAPIResponse(errors, 'get_item', True, error_records=True)))
+        self.assertEqual(response.errors[0], ErrorRecord(11001, 'request_param', 'Bad param'))
+
+    def test_serializers(self):
+        for name in 'orjson', 'msgpack':
+            try:
+                serializer = get_serializer(name)
+
+            except exceptions.BrowseAPIParamError:
+                continue
+
+            data = dumps(BrowseAPIResponse(SEARCH, 'search', False), serializer)
+            self.assertEqual(loads(data, serializer=serializer).to_dict(), SEARCH)
@@ -0,0 +1,142 @@
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, skipIf
+
+from .. import exceptions
+from ..containers import BrowseAPIResponse
+from ..sinks import ArrowSink, JSONLSink, Sink, SQLiteSink, read_arrow
+from .server import MockServer
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class SlowSink(Sink):
+    def __init__(self):
+        super().__init__(batch_size=1, queue_size=1)
+        self.batches = []
+
+    def write_batch(self, rows: list) -> None:
+        time.sleep(0.05)
+        self.batches.append(rows)
+
+
+class FailingSink(Sink):
+    def write_batch(self, rows: list) -> None:
+        raise ValueError('Disk is full')
+
+
+class SinksTest(TestCase):
+    """ Test streaming output sinks """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_jsonl(self):
+        sink = JSONLSink(self.path('items.jsonl.gz'), batch_size=3, queue_size=1)
+
+        with MockServer() as server:
+            api = server.client()
+
+            with sink:
+                responses = api.execute('search', [{'q': 'drone', 'offset': offset} for offset in range(5)], sink=sink)
+                responses += api.execute('get_item', [{'item_id': 'v1|1|0'}], sink=sink)
+
+        with gzip.open(sink.path, 'rt') as file:
+            rows = [json.loads(line) for line in file]
+
+        self.assertEqual(responses, [None] * 6)
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(rows[-1]['title'], 'Item v1|1|0')
+        self.assertEqual(sink.rows, 11)
+
+        with self.assertRaises(exceptions.BrowseAPIError):
+            sink.put(None)
+
+    def test_sqlite(self):
+        sink = SQLiteSink(self.path('items.sqlite'))
+
+        with MockServer(fail=lambda number: number == 2) as server:
+            api = server.client()
+
+            with sink:
+                responses = api.execute('get_item', [{'item_id': 'v1|{}|0'.format(i)} for i in range(3)],
+                                        pass_errors=True, sink=sink)
+
+        connection = sqlite3.connect(sink.path)
+        rows = connection.execute('SELECT item_id FROM items ORDER BY item_id').fetchall()
+        connection.close()
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(sum(response is None for response in responses), 2)
+        self.assertEqual(len([response for response in responses if response is not None][0].errors), 1)
+
+    @skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow(self):
+        sink = ArrowSink(self.path('items.arrow'), file_format='ipc', batch_size=2)
+
+        with MockServer() as server:
+            with sink:
+                server.client().execute('search', [{'q': 'drone'}, {'q': 'quadcopter'}], sink=sink)
+
+        table = read_arrow(sink.path)
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(sorted(table.column('price').to_pylist()), [10.5, 10.5, 20., 20.])
+
+    @skipIf(pyarrow is not None, 'pyarrow is installed')
+    def test_arrow_missing(self):
+        self.assertRaises(exceptions.BrowseAPIParamError, ArrowSink, self.path('items.parquet'))
+
+    def test_backpressure(self):
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+
+            senders = [asyncio.ensure_future(sink.send(response)) for _ in range(6)]
+            await asyncio.sleep(0.01)
+            senders[-1].cancel()
+
+            # waiting senders do not hold the executor threads
+
+            started = time.monotonic()
+            await loop.run_in_executor(None, time.sleep, 0)
+            executor_wait = time.monotonic() - started
+
+            await asyncio.gather(*senders, return_exceptions=True)
+            return executor_wait
+
+        sink = SlowSink()
+        response = BrowseAPIResponse({'itemId': 'v1|1|0'}, 'get_item', False)
+
+        with sink:
+            executor_wait = asyncio.run(run())
+
+        self.assertLess(executor_wait, 0.04)
+        self.assertEqual(sink.rows, 5)
+
+    def test_errors(self):
+        self.assertRaises(TypeError, Sink)
+
+        # the error of the last batch written on close is raised by it
+
+        sink = FailingSink()
+        sink.put(BrowseAPIResponse({'itemId': 'v1|1|0'}, 'get_item', False))
+
+        with self.assertRaises(ValueError):
+            sink.close()
+
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from ..sweep import ItemIdSet, Sweep
+from .server import MockServer
+
+
+class ItemIdSetTest(TestCase):
+    """ Test compact item id set """
+
+    def test_add(self):
+        ids = ItemIdSet(capacity=4)
+
+        for number in range(1000):
+            self.assertTrue(ids.add('v1|{}|0'.format(number)))
+
+        self.assertFalse(ids.add('v1|10|0'))
+        self.assertIn('v1|999|0', ids)
+        self.assertNotIn('v1|1000|0', ids)
+        self.assertEqual(len(ids), 1000)
+
+
+class SweepTest(TestCase):
+    """ Test deduplication of overlapping searches and detail requests """
+
+    def test_sweep(self):
+        sweep = Sweep()
+
+        with MockServer() as server:
+            api = server.client()
+            searches = api.execute('search', [{'q': 'drone'}, {'q': 'quadcopter'}], sweep=sweep)
+
+            item_ids = [summary.itemId for response in searches for summary in response.itemSummaries]
+            items = api.execute('get_item', [{'item_id': item_id} for item_id in item_ids + ['v1|1|0']], sweep=sweep)
+            items += api.execute('get_item_by_legacy_id', [{'legacy_item_id': '1'}], sweep=sweep)
+
+        self.assertEqual(item_ids, ['v1|1|0', 'v1|2|0'])
+        self.assertEqual(len(searches[1].itemSummaries), 0)
+        self.assertEqual([item.itemId if item is not None else None for item in items],
+                         ['v1|1|0', 'v1|2|0', None, None])
+        self.assertEqual(server.requests, 4)
+
+        stats = sweep.stats()
+        self.assertEqual(stats['duplicates'], 2)
+        self.assertEqual(stats['duplicate_rate'], 0.5)
+        self.assertEqual(stats['details_skipped'], 2)
+
+    def test_failed_detail(self):
+        sweep = Sweep()
+
+        with MockServer(fail=lambda number: number == 1) as server:
+            api = server.client()
+            failed = api.execute('get_item', [{'item_id': 'v1|1|0'}, {'item_id': 'v1|1|0'}], pass_errors=True,
+                                 sweep=sweep)
+            items = api.execute('get_item', [{'item_id': 'v1|1|0'}], sweep=sweep)
+            repeated = api.execute('get_item', [{'item_id': 'v1|1|0'}], sweep=sweep)
+
+        # the failed item is requested again, the duplicate in the same call is not sent
+
+        self.assertTrue(hasattr(failed[0], 'errors'))
+        self.assertIsNone(failed[1])
+        self.assertEqual(items[0].itemId, 'v1|1|0')
+        self.assertEqual(repeated, [None])
+        self.assertEqual(server.requests, 2)
@@ -0,0 +1,36 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from ..exceptions import BrowseAPIError
+from ..sync import SyncBrowseAPI
+from .server import MockServer
+
+
+class SyncClientTest(TestCase):
+    """ Test synchronous client shared by many threads """
+
+    def test_many_threads(self):
+        with MockServer(latency=0.01) as server:
+            with server.point(SyncBrowseAPI('app_id', 'cert_id')) as api:
+                def call(number):
+                    return api.execute('get_item', [{'item_id': 'v1|{}|0'.format(number)}])[0].itemId
+
+                with ThreadPoolExecutor(8) as executor:
+                    item_ids = list(executor.map(call, range(40)))
+
+        self.assertEqual(item_ids, ['v1|{}|0'.format(number) for number in range(40)])
+        self.assertEqual(server.token_requests, 1)
+        self.assertEqual(server.requests, 40)
+
+    def test_call_from_running_loop(self):
+        async def run(api):
+            return api.execute('search', [{'q': 'drone'}])
+
+        with MockServer() as server:
+            with server.point(SyncBrowseAPI('app_id', 'cert_id')) as api:
+                responses = asyncio.run(run(api))
+
+        self.assertEqual(responses[0].total, 2)
+        self.assertRaises(BrowseAPIError, api.execute, 'search', [{'q': 'drone'}])
@@ -0,0 +1,142 @@
+import asyncio
+
+from unittest import TestCase
+
+from aiohttp import ClientTimeout
+
+from ..client import BrowseAPI, HEDGE_MIN_SAMPLES
+from ..credentials import Credential, CredentialPool
+from ..exceptions import BrowseAPIParamError, BrowseAPITimeoutError
+from ..limiter import AdaptiveLimiter
+from .server import MockServer
+
+
+def hedged_call(api: BrowseAPI, fail_primary: bool = True) -> tuple:
+    """ Hedged get_item call where the primary and the duplicate complete together, and the number of calls """
+
+    async def run():
+        release = asyncio.Event()
+        calls = []
+
+        async def get_item(**params):
+            calls.append(params)
+            number = len(calls)
+
+            if number == 2:
+                release.set()
+
+            await release.wait()
+
+            if number == 1 and fail_primary:
+                raise BrowseAPITimeoutError('Timeout occurred', 'uri')
+
+            return {'itemId': params['item_id'], 'call': number}
+
+        api._get_item = get_item
+
+        for _ in range(HEDGE_MIN_SAMPLES):
+            api.metrics.observe('latency.get_item', 0.001)
+
+        # the primary call is released by the duplicate, without it the release is set after a while
+
+        asyncio.get_running_loop().call_later(0.1, release.set)
+        response = await api._hedged_call('get_item', {'item_id': 'v1|1|0'}, api._credentials.credentials[0])
+        return response, len(calls)
+
+    return asyncio.run(run())
+
+
+class TimeoutTest(TestCase):
+    """ Test per-method timeouts and hedged requests """
+
+    def test_init_params(self):
+        with MockServer() as server:
+            self.assertRaises(BrowseAPIParamError, server.client, method_timeouts={'get': ClientTimeout(total=1)})
+            self.assertRaises(BrowseAPIParamError, server.client, hedge_percentile=100)
+
+    def test_method_timeout(self):
+        with MockServer(latency=0.3) as server:
+            api = server.client(method_timeouts={'get_item': ClientTimeout(total=1, sock_read=0.05)})
+            items = api.execute('get_item', [{'item_id': 'v1|1|0'}], pass_errors=True)
+            searches = api.execute('search', [{'q': 'drone'}])
+
+        self.assertIsInstance(items[0], BrowseAPITimeoutError)
+        self.assertEqual(searches[0].total, 2)
+
+    def test_hedged_requests(self):
+        with MockServer(latency=lambda number: 1 if number % 10 == 0 else 0.01) as server:
+            limiter = AdaptiveLimiter(initial_limit=5, max_limit=5)
+            api = server.client(limiter=limiter, hedge_percentile=80)
+            responses = api.execute('get_item', [{'item_id': 'v1|{}|0'.format(i)} for i in range(100)])
+
+        self.assertEqual([response.itemId for response in responses], ['v1|{}|0'.format(i) for i in range(100)])
+        self.assertGreater(api.metrics.counters['hedged'], 0)
+        self.assertGreater(api.metrics.counters['hedge_wins'], 0)
+
+        # only slow requests sent before enough latency samples were collected are not hedged
+
+        self.assertLessEqual(len([latency for latency in api.metrics.samples('latency.get_item') if latency >= 1]), 3)
+
+    def test_hedge_completion(self):
+        api = BrowseAPI('app_id', 'cert_id', hedge_percentile=50)
+        response, calls = hedged_call(api)
+
+        # the failed primary completed together with the successful duplicate
+
+        self.assertEqual((response['call'], calls), (2, 2))
+        self.assertEqual(api.metrics.counters['hedge_wins'], 1)
+        self.assertEqual(api._credentials.credentials[0].used, 1)
+
+    def test_hedge_limits(self):
+        limiter = AdaptiveLimiter()
+        limiter.try_acquire()
+        limiter.release(1, failed=True)
+
+        # no duplicates while the limiter is backing off
+
+        api = BrowseAPI('app_id', 'cert_id', limiter=limiter, hedge_percentile=50)
+        self.assertEqual(hedged_call(api, fail_primary=False), ({'itemId': 'v1|1|0', 'call': 1}, 1))
+        self.assertEqual(api.metrics.counters['hedges_skipped'], 1)
+
+        # nor above the keyset rate
+
+        credential = Credential('app_id', 'cert_id', rate=1, burst=1)
+        api = BrowseAPI(credentials=CredentialPool([credential]), hedge_percentile=50)
+        asyncio.run(credential.limiter.acquire())
+
+        self.assertEqual(hedged_call(api, fail_primary=False)[1], 1)
+        self.assertEqual(credential.used, 0)
+
+    def test_hedge_cancel(self):
+        async def run():
+            async def get_item(**params):
+                try:
+                    await asyncio.sleep(10)
+
+                except asyncio.CancelledError:
+                    cancelled.append(params)
+                    raise
+
+            api._get_item = get_item
+
+            for _ in range(HEDGE_MIN_SAMPLES):
+                api.metrics.observe('latency.get_item', 1)
+
+            # the call is cancelled while it waits for the hedge delay
+
+            call = asyncio.ensure_future(api._hedged_call('get_item', {'item_id': 'v1|1|0'}, credential))
+            await asyncio.sleep(0.05)
+            call.cancel()
+            await asyncio.gather(call, return_exceptions=True)
+            await asyncio.sleep(0.01)
+
+            # pending tasks are cancelled by asyncio.run anyway, so they are checked before it returns
+
+            return list(cancelled)
+
+        cancelled = []
+        api = BrowseAPI('app_id', 'cert_id', hedge_percentile=50)
+        credential = api._credentials.credentials[0]
+
+        self.assertEqual(asyncio.run(run()), [{'item_id': 'v1|1|0'}])
+
@@ -0,0 +1,70 @@
+from unittest import TestCase, skipIf
+
+from .. import exceptions
+from ..transport import AiohttpTransport, HttpxTransport
+from .server import MockServer
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+
+class CountingTransport(AiohttpTransport):
+    def __init__(self):
+        super().__init__()
+        self.uris = []
+
+    async def request(self, request_type: str, uri: str, headers: dict, **kwargs) -> dict:
+        self.uris.append(uri)
+        return await super().request(request_type, uri, headers, **kwargs)
+
+
+class TransportTest(TestCase):
+    """ Test pluggable transports """
+
+    def test_custom(self):
+        transport = CountingTransport()
+
+        with MockServer() as server:
+            api = server.client(transport=transport)
+            responses = api.execute('get_item', [{'item_id': 'v1|1|0'}, {'item_id': 'v1|2|0'}])
+
+        self.assertEqual([response.itemId for response in responses], ['v1|1|0', 'v1|2|0'])
+        self.assertEqual(len(transport.uris), 3)
+        self.assertTrue(transport.uris[0].endswith('/oauth2/token'))
+        self.assertFalse(transport.opened)
+
+    @skipIf(httpx is not None, 'httpx is installed')
+    def test_httpx_missing(self):
+        self.assertRaises(exceptions.BrowseAPIParamError, HttpxTransport)
+
+    @skipIf(httpx is None, 'httpx is not installed')
+    def test_httpx_params(self):
+        self.assertRaises(exceptions.BrowseAPIParamError, HttpxTransport, http2=False, http1=False)
+
+    @skipIf(httpx is None, 'httpx is not installed')
+    def test_httpx(self):
+        with MockServer() as server:
+            api = server.client(transport=HttpxTransport(http2=False), warm_up_connections=2)
+            responses = api.execute('search', [{'q': 'drone'}])
+
+        self.assertEqual(len(responses[0].itemSummaries), 2)
+        self.assertEqual(server.head_requests, 2)
+
+    @skipIf(httpx is None or h2 is None, 'httpx or h2 is not installed')
+    def test_http2(self):
+        with MockServer(latency=0.05, http2=True) as server:
+            api = server.client(transport=HttpxTransport(http1=False))
+            responses = api.execute('get_item', [{'item_id': 'v1|{}|0'.format(i)} for i in range(20)])
+
+        # concurrent requests are multiplexed over one connection
+
+        self.assertEqual([response.itemId for response in responses], ['v1|{}|0'.format(i) for i in range(20)])
+        self.assertEqual(len(server.connections), 1)
+        self.assertGreater(server.max_concurrency, 1)
@@ -0,0 +1,38 @@
+import asyncio
+
+from unittest import TestCase
+
+from ..limiter import AdaptiveLimiter
+from .server import MockServer
+
+
+class WarmUpTest(TestCase):
+    """ Test connection warm-up """
+
+    def test_warm_up(self):
+        async def run(api):
+            await api.warm_up(4)
+            warmed = set(server.connections)
+
+            async with api:
+                await api.execute_async('get_item', [{'item_id': 'v1|{}|0'.format(i)} for i in range(4)])
+
+            return warmed
+
+        with MockServer(latency=0.05) as server:
+            api = server.client(limiter=AdaptiveLimiter(initial_limit=4, max_limit=4))
+            warmed = asyncio.run(run(api))
+
+        self.assertEqual(server.head_requests, 4)
+        self.assertEqual(server.token_requests, 1)
+        self.assertGreaterEqual(len(warmed), 4)
+        self.assertEqual(server.connections, warmed)
+        self.assertEqual(len(api.metrics.samples('startup')), 1)
+
+    def test_option(self):
+        with MockServer() as server:
+            api = server.client(warm_up_connections=2)
+            api.execute('get_item', [{'item_id': 'v1|1|0'}])
+
+        self.assertEqual(server.head_requests, 2)
+        self.assertNotIn('warm_up_errors', api.metrics.counters)
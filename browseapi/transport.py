@@ -0,0 +1,235 @@
+import asyncio
+
+from aiohttp import client_exceptions, ClientSession, ClientTimeout, TCPConnector
+
+from . import exceptions
+
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+
+
+class AiohttpTransport(object):
+    """ Default transport, HTTP/1.1 with a pool of keep-alive connections and a DNS cache """
+
+    def __init__(self, limit: int = 100):
+        """
+        Transport initialization
+
+        :param limit: maximal number of open connections
+        """
+
+        self.limit = limit
+        self._session = None
+
+    @property
+    def opened(self) -> bool:
+        return self._session is not None
+
+    async def open(self) -> None:
+        if self._session is not None:
+            return
+
+        connector = TCPConnector(limit=self.limit, ttl_dns_cache=DNS_CACHE_TTL, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        self._session = ClientSession(connector=connector)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+        self._session = None
+
+    async def request(self,
+                      request_type: str,
+                      uri: str,
+                      headers: dict,
+                      params: dict = None,
+                      data=None,
+                      json_data: dict = None,
+                      timeout: ClientTimeout = None) -> dict:
+        """
+        Make async request
+
+        :param request_type: GET or POST
+        :param uri: request uri
+        :param headers: request headers
+        :param params: request parameters dictionary
+        :param data: str or bytes with request payload
+        :param json_data: dictionary with request payload
+        :param timeout: request timeout
+        :return: json response
+        """
+
+        try:
+            async with self._session.request(request_type,
+                                             uri,
+                                             params=params,
+                                             data=data,
+                                             json=json_data,
+                                             headers=headers,
+                                             timeout=timeout) as response:
+                return await response.json()
+
+        except client_exceptions.InvalidURL:
+            raise exceptions.BrowseAPIInvalidUri('Invalid uri', uri)
+
+        except (client_exceptions.ServerTimeoutError, asyncio.TimeoutError):
+            raise exceptions.BrowseAPITimeoutError('Timeout occurred', uri)
+
+        except client_exceptions.ClientConnectorError:
+            raise exceptions.BrowseAPIConnectionError('Connection error', uri)
+
+        except client_exceptions.ClientOSError:
+            raise exceptions.BrowseAPIConnectionError('Connection reset', uri)
+
+        except client_exceptions.ServerDisconnectedError:
+            raise exceptions.BrowseAPIConnectionError('Server refused the request', uri)
+
+        except client_exceptions.ClientResponseError:
+            raise exceptions.BrowseAPIMimeTypeError('Response has unexpected mime type', uri)
+
+    async def warm_up(self, uri: str, connections: int) -> int:
+        """
+        Open keep-alive connections with concurrent HEAD requests
+
+        :param uri: any uri of the API host
+        :param connections: number of connections
+        :return: number of failed requests
+        """
+
+        async def warm_connection():
+            try:
+                async with self._session.head(uri, allow_redirects=False) as response:
+                    await response.read()
+
+            except (client_exceptions.ClientError, asyncio.TimeoutError):
+                return 1
+
+            return 0
+
+        return sum(await asyncio.gather(*[warm_connection() for _ in range(connections)]))
+
+
+class HttpxTransport(object):
+    """
+    HTTP/2 transport based on httpx, many concurrent requests are multiplexed over a few connections.
+    httpx with h2 is required: pip install httpx[http2]
+    """
+
+    def __init__(self, http2: bool = True, max_connections: int = 10, http1: bool = True):
+        """
+        Transport initialization
+
+        :param http2: negotiate HTTP/2 with the server, HTTP/1.1 is used otherwise
+        :param max_connections: maximal number of open connections
+        :param http1: allow HTTP/1.1, with http1=False HTTP/2 is used with prior knowledge,
+            also over plain http (h2c)
+        """
+
+        if not http1 and not http2:
+            raise exceptions.BrowseAPIParamError('http1. At least one of http1 and http2 must be enabled')
+
+        try:
+            import httpx
+
+        except ImportError:
+            raise exceptions.BrowseAPIParamError('transport. httpx is required for HttpxTransport')
+
+        if http2:
+            try:
+                import h2  # noqa: F401
+
+            except ImportError:
+                raise exceptions.BrowseAPIParamError('transport. h2 is required for HTTP/2, use httpx[http2]')
+
+        self.http1 = http1
+        self.http2 = http2
+        self.max_connections = max_connections
+        self._httpx = httpx
+        self._client = None
+
+    @property
+    def opened(self) -> bool:
+        return self._client is not None
+
+    async def open(self) -> None:
+        if self._client is not None:
+            return
+
+        self._client = self._httpx.AsyncClient(
+            http1=self.http1,
+            http2=self.http2,
+            limits=self._httpx.Limits(max_connections=self.max_connections,
+                                      max_keepalive_connections=self.max_connections,
+                                      keepalive_expiry=KEEPALIVE_TIMEOUT)
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+        self._client = None
+
+    async def request(self,
+                      request_type: str,
+                      uri: str,
+                      headers: dict,
+                      params: dict = None,
+                      data=None,
+                      json_data: dict = None,
+                      timeout: ClientTimeout = None) -> dict:
+        """ Make async request, arguments are the same as for AiohttpTransport.request """
+
+        httpx = self._httpx
+
+        try:
+            request = self._client.request(request_type,
+                                           uri,
+                                           params=params,
+                                           content=data,
+                                           json=json_data,
+                                           headers=headers,
+                                           timeout=self._timeout(timeout))
+
+            # httpx has no total timeout
+
+            response = await asyncio.wait_for(request, timeout.total if timeout is not None else None)
+
+        except (httpx.InvalidURL, httpx.UnsupportedProtocol):
+            raise exceptions.BrowseAPIInvalidUri('Invalid uri', uri)
+
+        except (httpx.TimeoutException, asyncio.TimeoutError):
+            raise exceptions.BrowseAPITimeoutError('Timeout occurred', uri)
+
+        except httpx.ConnectError:
+            raise exceptions.BrowseAPIConnectionError('Connection error', uri)
+
+        except httpx.RemoteProtocolError:
+            raise exceptions.BrowseAPIConnectionError('Server refused the request', uri)
+
+        except httpx.TransportError:
+            raise exceptions.BrowseAPIConnectionError('Connection reset', uri)
+
+        if 'json' not in response.headers.get('content-type', ''):
+            raise exceptions.BrowseAPIMimeTypeError('Response has unexpected mime type', uri)
+
+        return response.json()
+
+    async def warm_up(self, uri: str, connections: int) -> int:
+        """ Open connections with concurrent HEAD requests, with HTTP/2 they are multiplexed over one connection """
+
+        async def warm_connection():
+            try:
+                await self._client.head(uri)
+
+            except self._httpx.HTTPError:
+                return 1
+
+            return 0
+
+        return sum(await asyncio.gather(*[warm_connection() for _ in range(connections)]))
+
+    def _timeout(self, timeout: ClientTimeout):
+        if timeout is None:
+            return None
+
+        return self._httpx.Timeout(None, connect=timeout.connect, read=timeout.sock_read)
@@ -20,13 +20,13 @@ setup(
         'aiohttp',
     ],
 
+    python_requires='>=3.7',
+
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'Topic :: Software Development :: Libraries',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7'
     ]
 )